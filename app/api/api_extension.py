@@ -1,4 +1,12 @@
+from http import HTTPStatus
+
+from flask import current_app, make_response
 from flask_restx import Api
+from flask_restx.representations import output_json as output_stdlib_json
+
+from app import messages
+from app.utils.json_codec_utils import StdlibJsonCodec, get_json_codec
+from app.utils.password_hashing_utils import PasswordHasherBusyError
 
 # Adding namespaces
 from app.api.resources.user import users_ns as user_namespace
@@ -46,6 +54,31 @@ api = Api(
 )
 api.namespaces.clear()
 
+
+@api.representation("application/json")
+def output_json(data, code, headers=None):
+    """Makes a JSON response with the JSON codec configured for the app."""
+    codec = get_json_codec()
+    if codec is StdlibJsonCodec:
+        # keeps the RESTX_JSON settings and the indentation of debug mode
+        return output_stdlib_json(data, code, headers)
+
+    response = make_response(codec.dumps(data) + "\n", code)
+    response.headers.extend(headers or {})
+    return response
+
+
+@api.errorhandler(PasswordHasherBusyError)
+def password_hasher_is_busy(error):
+    """Asks the client to retry a request whose password could not be hashed."""
+    retry_after = current_app.config.get("PASSWORD_HASH_RETRY_AFTER", 1)
+    return (
+        messages.PASSWORD_HASHER_IS_BUSY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        {"Retry-After": str(retry_after)},
+    )
+
+
 api.add_namespace(user_namespace, path="/")
 
 api.add_namespace(admin_namespace, path="/")
@@ -3,6 +3,7 @@ from http import HTTPStatus
 from app import messages
 from app.database.models.user import UserModel
 from app.utils.decorator_utils import email_verification_required
+from app.utils.request_user_utils import find_request_user
 
 
 class AdminDAO:
@@ -27,7 +28,7 @@ class AdminDAO:
         if user_id == new_admin_user_id:
             return messages.USER_CANNOT_BE_ASSIGNED_ADMIN_BY_USER, HTTPStatus.FORBIDDEN
 
-        admin_user = UserModel.find_by_id(user_id)
+        admin_user = find_request_user(user_id)
 
         if admin_user:
             if not admin_user.is_admin:
@@ -72,7 +73,7 @@ class AdminDAO:
 
         new_admin_user = UserModel.find_by_id(admin_user_id)
 
-        admin_user = UserModel.find_by_id(user_id)
+        admin_user = find_request_user(user_id)
 
         if admin_user:
             if not admin_user.is_admin:
@@ -1,11 +1,20 @@
 from datetime import datetime, timedelta
 from typing import Dict
 from http import HTTPStatus
+
+from sqlalchemy.orm.exc import StaleDataError
+
 from app import messages
+from app.api.email_utils import (
+    send_email_mentorship_relation_accepted,
+    send_email_new_request,
+)
 from app.database.models.mentorship_relation import MentorshipRelationModel
 from app.database.models.tasks_list import TasksListModel
 from app.database.models.user import UserModel
+from app.database.sqlalchemy_extension import db
 from app.utils.decorator_utils import email_verification_required
+from app.utils.request_user_utils import find_request_user
 from app.utils.enum_utils import MentorshipRelationState
 
 
@@ -21,6 +30,8 @@ class MentorshipRelationDAO:
 
     MAXIMUM_MENTORSHIP_DURATION = timedelta(weeks=24)  # 6 months = approximately 6*4
     MINIMUM_MENTORSHIP_DURATION = timedelta(weeks=4)
+    MAX_RELATIONS_PER_PAGE = 100
+    RELATIONS_ORDERS = ("id", "creation_date_desc")
 
     def create_mentorship_relation(self, user_id: int, data: Dict[str, str]):
         """Creates a relationship between two users.
@@ -87,19 +98,11 @@ class MentorshipRelationDAO:
 
         # TODO add tests for this portion
 
-        all_mentor_relations = (
-            mentor_user.mentor_relations + mentor_user.mentee_relations
-        )
-        for relation in all_mentor_relations:
-            if relation.state == MentorshipRelationState.ACCEPTED:
-                return messages.MENTOR_ALREADY_IN_A_RELATION, HTTPStatus.BAD_REQUEST
+        if MentorshipRelationModel.find_current_relation(mentor_id):
+            return messages.MENTOR_ALREADY_IN_A_RELATION, HTTPStatus.BAD_REQUEST
 
-        all_mentee_relations = (
-            mentee_user.mentor_relations + mentee_user.mentee_relations
-        )
-        for relation in all_mentee_relations:
-            if relation.state == MentorshipRelationState.ACCEPTED:
-                return messages.MENTEE_ALREADY_IN_A_RELATION, HTTPStatus.BAD_REQUEST
+        if MentorshipRelationModel.find_current_relation(mentee_id):
+            return messages.MENTEE_ALREADY_IN_A_RELATION, HTTPStatus.BAD_REQUEST
 
         # All validations were checked
 
@@ -117,42 +120,78 @@ class MentorshipRelationDAO:
             tasks_list=tasks_list,
         )
 
+        # committed with the relation, so a sent request always gets the email
+        if action_user_id == mentee_id:
+            send_email_new_request(mentee_user, mentor_user, notes, "mentee")
+        else:
+            send_email_new_request(mentor_user, mentee_user, notes, "mentor")
         mentorship_relation.save_to_db()
 
         return messages.MENTORSHIP_RELATION_WAS_SENT_SUCCESSFULLY, HTTPStatus.CREATED
 
     @staticmethod
     @email_verification_required
-    def list_mentorship_relations(user_id=None, state=None):
+    def list_mentorship_relations(
+        user_id=None, state=None, order="id", limit=None, after_id=None
+    ):
         """Lists all relationships of a given user.
 
-        Lists all relationships of a given user. Support for filtering not yet implemented.
+        Lists the relationships of a given user, optionally filtered by state.
+        The state filter, the order and the keyset pagination are applied in SQL.
 
         Args:
             user_id: ID of the user whose relationships are to be listed.
+            state: Name of the state of the listed relationships, all if empty.
+            order: "id" (default) or "creation_date_desc".
+            limit: Maximum number of relationships listed, at least 1 and bounded by MAX_RELATIONS_PER_PAGE.
+            after_id: ID of the last relationship of the previous page, which has to be one of the user.
 
         Returns:
             message: A message corresponding to the completed action; success if all relationships of a given user are listed, failure if otherwise.
         """
-        # To check if the entered 'state' is valid.
-        valid_states = ["PENDING", "ACCEPTED", "REJECTED", "CANCELLED", "COMPLETED"]
-
-        def isValidState(rel_state):
-            if rel_state in valid_states:
-                return True
-            return False
-
-        user = UserModel.find_by_id(user_id)
-        all_relations = user.mentor_relations + user.mentee_relations
-
-        # Filtering the list of relations on the basis of 'state'.
         if state:
-            if isValidState(state):
-                all_relations = list(
-                    filter(lambda rel: (rel.state.name == state), all_relations)
-                )
-            else:
+            if state not in MentorshipRelationState.__members__:
                 return [], HTTPStatus.BAD_REQUEST
+            state = MentorshipRelationState[state]
+
+        if order not in MentorshipRelationDAO.RELATIONS_ORDERS:
+            return messages.INVALID_RELATIONS_ORDER, HTTPStatus.BAD_REQUEST
+
+        if limit is not None and limit < 1:
+            return messages.INVALID_RELATIONS_LIMIT, HTTPStatus.BAD_REQUEST
+
+        query = MentorshipRelationModel.query_by_user(user_id, state or None)
+
+        if order == "creation_date_desc":
+            if after_id:
+                last_relation = MentorshipRelationModel.find_by_id(after_id)
+                # the relations of other users are not revealed by their cursor
+                if last_relation is None or user_id not in (
+                    last_relation.mentor_id,
+                    last_relation.mentee_id,
+                ):
+                    return messages.INVALID_CURSOR, HTTPStatus.BAD_REQUEST
+                last_creation_date = last_relation.creation_date
+                query = query.filter(
+                    (MentorshipRelationModel.creation_date < last_creation_date)
+                    | (
+                        (MentorshipRelationModel.creation_date == last_creation_date)
+                        & (MentorshipRelationModel.id < after_id)
+                    )
+                )
+            query = query.order_by(
+                MentorshipRelationModel.creation_date.desc(),
+                MentorshipRelationModel.id.desc(),
+            )
+        else:
+            if after_id:
+                query = query.filter(MentorshipRelationModel.id > after_id)
+            query = query.order_by(MentorshipRelationModel.id)
+
+        if limit is not None:
+            query = query.limit(MentorshipRelationDAO.get_relations_per_page(limit))
+
+        all_relations = query.all()
 
         # add extra field for api response
         for relation in all_relations:
@@ -160,6 +199,11 @@ class MentorshipRelationDAO:
 
         return all_relations, HTTPStatus.OK
 
+    @staticmethod
+    def get_relations_per_page(limit: int) -> int:
+        """Returns the number of relationships listed per page, at most MAX_RELATIONS_PER_PAGE."""
+        return min(limit, MentorshipRelationDAO.MAX_RELATIONS_PER_PAGE)
+
     @staticmethod
     @email_verification_required
     def accept_request(user_id: int, request_id: int):
@@ -173,7 +217,6 @@ class MentorshipRelationDAO:
             message: A message corresponding to the completed action; success if mentorship relation request is accepted, failure if otherwise.
         """
 
-        user = UserModel.find_by_id(user_id)
         request = MentorshipRelationModel.find_by_id(request_id)
 
         # verify if request exists
@@ -195,39 +238,62 @@ class MentorshipRelationDAO:
         if not (request.mentee_id == user_id or request.mentor_id == user_id):
             return messages.CANT_ACCEPT_UNINVOLVED_MENTOR_RELATION, HTTPStatus.FORBIDDEN
 
-        my_requests = user.mentee_relations + user.mentor_relations
+        # accepts of relations sharing a user are serialized from here, so the
+        # checks below cannot miss a relation accepted concurrently
+        UserModel.lock_rows([request.mentor_id, request.mentee_id])
 
         # verify if I'm on a current relation
-        for my_request in my_requests:
-            if my_request.state == MentorshipRelationState.ACCEPTED:
-                return (
-                    messages.USER_IS_INVOLVED_IN_A_MENTORSHIP_RELATION,
-                    HTTPStatus.FORBIDDEN,
-                )
-
-        mentee = request.mentee
-        mentor = request.mentor
+        if MentorshipRelationModel.find_current_relation(user_id):
+            return (
+                messages.USER_IS_INVOLVED_IN_A_MENTORSHIP_RELATION,
+                HTTPStatus.FORBIDDEN,
+            )
 
         # If I am mentor : Check if the mentee isn't in any other relation already
-        if user_id == mentor.id:
-            mentee_requests = mentee.mentee_relations + mentee.mentor_relations
-
-            for mentee_request in mentee_requests:
-                if mentee_request.state == MentorshipRelationState.ACCEPTED:
-                    return messages.MENTEE_ALREADY_IN_A_RELATION, HTTPStatus.BAD_REQUEST
+        if user_id == request.mentor_id:
+            if MentorshipRelationModel.find_current_relation(request.mentee_id):
+                return messages.MENTEE_ALREADY_IN_A_RELATION, HTTPStatus.BAD_REQUEST
         # If I am mentee : Check if the mentor isn't in any other relation already
         else:
-            mentor_requests = mentor.mentee_relations + mentor.mentor_relations
+            if MentorshipRelationModel.find_current_relation(request.mentor_id):
+                return messages.MENTOR_ALREADY_IN_A_RELATION, HTTPStatus.BAD_REQUEST
 
-            for mentor_request in mentor_requests:
-                if mentor_request.state == MentorshipRelationState.ACCEPTED:
-                    return messages.MENTOR_ALREADY_IN_A_RELATION, HTTPStatus.BAD_REQUEST
+        # All was checked, the email is committed or rolled back with the state
+        send_email_mentorship_relation_accepted(request_id)
+        return MentorshipRelationDAO.change_state(
+            request,
+            MentorshipRelationState.ACCEPTED,
+            messages.MENTORSHIP_RELATION_WAS_ACCEPTED_SUCCESSFULLY,
+        )
 
-        # All was checked
-        request.state = MentorshipRelationState.ACCEPTED
-        request.save_to_db()
+    @staticmethod
+    def change_state(
+        relation: MentorshipRelationModel, state: MentorshipRelationState, message
+    ):
+        """Saves the new state of a relation, unless it changed since it was read.
+
+        The update only applies to the version of the relation that was checked,
+        so two concurrent requests cannot both change the same relation.
+
+        Args:
+            relation: The mentorship relation read and checked by the request.
+            state: The new state of the relation.
+            message: The message returned when the state is saved.
+
+        Returns:
+            message: The passed message if the state was saved, a conflict otherwise.
+        """
+        relation.state = state
+        try:
+            relation.save_to_db()
+        except StaleDataError:
+            db.session.rollback()
+            return (
+                messages.MENTORSHIP_RELATION_WAS_MODIFIED_CONCURRENTLY,
+                HTTPStatus.CONFLICT,
+            )
 
-        return messages.MENTORSHIP_RELATION_WAS_ACCEPTED_SUCCESSFULLY, HTTPStatus.OK
+        return message, HTTPStatus.OK
 
     @staticmethod
     @email_verification_required
@@ -242,7 +308,7 @@ class MentorshipRelationDAO:
             message: A message corresponding to the completed action; success if mentorship relation request is rejected, failure if otherwise.
         """
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         request = MentorshipRelationModel.find_by_id(request_id)
 
         # verify if request exists
@@ -268,10 +334,11 @@ class MentorshipRelationDAO:
             )
 
         # All was checked
-        request.state = MentorshipRelationState.REJECTED
-        request.save_to_db()
-
-        return messages.MENTORSHIP_RELATION_WAS_REJECTED_SUCCESSFULLY, HTTPStatus.OK
+        return MentorshipRelationDAO.change_state(
+            request,
+            MentorshipRelationState.REJECTED,
+            messages.MENTORSHIP_RELATION_WAS_REJECTED_SUCCESSFULLY,
+        )
 
     @staticmethod
     @email_verification_required
@@ -286,7 +353,7 @@ class MentorshipRelationDAO:
             message: A message corresponding to the completed action; success if mentorship relation is terminated, failure if otherwise.
         """
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         request = MentorshipRelationModel.find_by_id(relation_id)
 
         # verify if request exists
@@ -305,10 +372,11 @@ class MentorshipRelationDAO:
             return messages.CANT_CANCEL_UNINVOLVED_REQUEST, HTTPStatus.FORBIDDEN
 
         # All was checked
-        request.state = MentorshipRelationState.CANCELLED
-        request.save_to_db()
-
-        return messages.MENTORSHIP_RELATION_WAS_CANCELLED_SUCCESSFULLY, HTTPStatus.OK
+        return MentorshipRelationDAO.change_state(
+            request,
+            MentorshipRelationState.CANCELLED,
+            messages.MENTORSHIP_RELATION_WAS_CANCELLED_SUCCESSFULLY,
+        )
 
     @staticmethod
     @email_verification_required
@@ -325,7 +393,7 @@ class MentorshipRelationDAO:
             message: A message corresponding to the completed action; success if mentorship relation request is deleted, failure if otherwise.
         """
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         request = MentorshipRelationModel.find_by_id(request_id)
 
         # verify if request exists
@@ -360,7 +428,7 @@ class MentorshipRelationDAO:
             message: A message corresponding to the completed action; success if past mentorship relation details are listed, failure if otherwise.
         """
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         now_timestamp = datetime.utcnow().timestamp()
         past_relations = list(
             filter(
@@ -386,13 +454,10 @@ class MentorshipRelationDAO:
             message: A message corresponding to the completed action; success if current mentorship relation details are listed, failure if otherwise.
         """
 
-        user = UserModel.find_by_id(user_id)
-        all_relations = user.mentor_relations + user.mentee_relations
-
-        for relation in all_relations:
-            if relation.state == MentorshipRelationState.ACCEPTED:
-                setattr(relation, "sent_by_me", relation.action_user_id == user_id)
-                return relation
+        relation = MentorshipRelationModel.find_current_relation(user_id)
+        if relation:
+            setattr(relation, "sent_by_me", relation.action_user_id == user_id)
+            return relation
 
         return messages.NOT_IN_MENTORED_RELATION_CURRENTLY, HTTPStatus.OK
 
@@ -408,7 +473,7 @@ class MentorshipRelationDAO:
             message: A message corresponding to the completed action; success if pending mentorship relation requests are listed, failure if otherwise.
         """
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         now_timestamp = datetime.utcnow().timestamp()
         pending_requests = []
         all_relations = user.mentor_relations + user.mentee_relations
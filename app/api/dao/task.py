@@ -3,8 +3,8 @@ from typing import Dict
 from http import HTTPStatus
 from app import messages
 from app.database.models.mentorship_relation import MentorshipRelationModel
-from app.database.models.user import UserModel
 from app.utils.decorator_utils import email_verification_required
+from app.utils.request_user_utils import find_request_user
 from app.utils.enum_utils import MentorshipRelationState
 
 
@@ -31,7 +31,7 @@ class TaskDAO:
 
         description = data["description"]
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         relation = MentorshipRelationModel.find_by_id(_id=mentorship_relation_id)
         if relation is None:
             return messages.MENTORSHIP_RELATION_DOES_NOT_EXIST, HTTPStatus.NOT_FOUND
@@ -68,7 +68,7 @@ class TaskDAO:
             mentorship relation as a string. The last element is the HTTP response code
         """
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         relation = MentorshipRelationModel.find_by_id(mentorship_relation_id)
         if relation is None:
             return messages.MENTORSHIP_RELATION_DOES_NOT_EXIST, HTTPStatus.NOT_FOUND
@@ -101,7 +101,7 @@ class TaskDAO:
             task was deleted successfully or not as a string. The last element is the HTTP response code.
         """
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         relation = MentorshipRelationModel.find_by_id(mentorship_relation_id)
         if relation is None:
             return messages.MENTORSHIP_RELATION_DOES_NOT_EXIST, HTTPStatus.NOT_FOUND
@@ -138,7 +138,7 @@ class TaskDAO:
             if the task was set to complete successfully or not as a string. The last element is the HTTP response code.
         """
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         relation = MentorshipRelationModel.find_by_id(mentorship_relation_id)
         if relation is None:
             return messages.MENTORSHIP_RELATION_DOES_NOT_EXIST, HTTPStatus.NOT_FOUND
@@ -1,20 +1,30 @@
 from datetime import datetime
-from operator import itemgetter
 from http import HTTPStatus
 from typing import Dict
 from flask_restx import marshal
-from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 
 from app import messages
-from app.api.email_utils import confirm_token
+from app.api.email_utils import confirm_token, send_email_verification_message
+from app.api.jwt_cache import revoke_user_tokens
 from app.database.models.user import UserModel
+from app.database.models.user_statistics import UserStatisticsModel
+from app.database.sqlalchemy_extension import db
+from app.database.user_search import get_user_search_backend
+from app.database.user_statistics import refresh_user_statistics
 from app.utils.decorator_utils import email_verification_required
+from app.utils.request_user_utils import find_request_user
 from app.utils.enum_utils import MentorshipRelationState
 from app.database.models.mentorship_relation import MentorshipRelationModel
 from app.api.models.task import list_tasks_response_body
-from app.api.dao.mentorship_relation import MentorshipRelationDAO
+from app.api.models.user import full_user_api_model
+from app.database.models.task import TaskModel
+from app.database.models.task_comment import TaskCommentModel
 from app.utils.validation_utils import is_email_valid
 
+# dashboard buckets of each (role, direction), named after the relation states
+DASHBOARD_STATES = ("accepted", "rejected", "completed", "cancelled", "pending")
+
 
 class UserDAO:
     """Data Access Object for User functionalities"""
@@ -25,6 +35,7 @@ class UserDAO:
     DEFAULT_PAGE = 1
     DEFAULT_USERS_PER_PAGE = 10
     MAX_USERS_PER_PAGE = 50
+    EXPORT_BATCH_SIZE = 500
 
     @staticmethod
     def create_user(data: Dict[str, str]):
@@ -66,6 +77,8 @@ class UserDAO:
         if "available_to_mentor" in data:
             user.available_to_mentor = data["available_to_mentor"]
 
+        # committed with the user, so a registered user always gets the email
+        send_email_verification_message(name, email)
         user.save_to_db()
 
         return messages.USER_WAS_CREATED_SUCCESSFULLY, HTTPStatus.CREATED
@@ -84,7 +97,7 @@ class UserDAO:
             A tuple with two elements. The first element is a dictionary containing a key 'message' containing a string which indicates whether or not the user was created successfully. The second is the HTTP response code.
         """
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
 
         # check if this user is the only admin
         if user.is_admin:
@@ -94,6 +107,8 @@ class UserDAO:
                 return messages.USER_CANT_DELETE, HTTPStatus.BAD_REQUEST
 
         if user:
+            # committed with the deletion, so a deleted user always has revoked tokens
+            revoke_user_tokens(user_id)
             user.delete_from_db()
             return messages.USER_SUCCESSFULLY_DELETED, HTTPStatus.OK
 
@@ -114,7 +129,7 @@ class UserDAO:
 
         """
 
-        return UserModel.find_by_id(user_id)
+        return find_request_user(user_id)
 
     @staticmethod
     def get_user_by_email(email: str):
@@ -132,6 +147,18 @@ class UserDAO:
 
         return UserModel.find_by_email(email)
 
+    @staticmethod
+    def resend_verification_email(user: UserModel, email: str):
+        """Sends a new verification email to a user.
+
+        Arguments:
+            user: The user whose email is not verified yet.
+            email: The email address the verification email is sent to.
+        """
+
+        send_email_verification_message(user.name, email)
+        db.session.commit()
+
     @staticmethod
     def get_user_by_username(username: str):
         """Retrieves a user's profile information using a specified username.
@@ -155,6 +182,7 @@ class UserDAO:
         page: int = DEFAULT_PAGE,
         per_page: int = DEFAULT_USERS_PER_PAGE,
         is_verified=None,
+        after_id: int = None,
     ):
         """Retrieves a list of verified users with the specified ID.
 
@@ -164,36 +192,48 @@ class UserDAO:
             is_verified: Status of the user's verification; None when provided as an argument.
             page: The page of users to be returned
             per_page: The number of users to return per page
+            after_id: When provided, keyset pagination is used instead of page: returns the
+                users whose ID is greater than after_id, without counting the total of users.
 
         Returns:
             A list of users matching conditions and the HTTP response code.
 
         """
 
-        users_list = (
-            UserModel.query.filter(
-                UserModel.id != user_id,
-                not is_verified or UserModel.is_email_verified,
-                func.lower(UserModel.name).contains(search_query.lower())
-                | func.lower(UserModel.username).contains(search_query.lower()),
+        users_query = UserModel.query.filter(
+            UserModel.id != user_id,
+            not is_verified or UserModel.is_email_verified,
+        )
+        users_query = get_user_search_backend().filter(users_query, search_query)
+
+        if after_id is not None:
+            users_list = (
+                users_query.filter(UserModel.id > after_id)
+                .order_by(UserModel.id)
+                .limit(UserDAO.get_users_per_page(per_page))
+                .all()
             )
-            .order_by(UserModel.id)
-            .paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False,
-                max_per_page=UserDAO.MAX_USERS_PER_PAGE,
+        else:
+            users_list = (
+                users_query.order_by(UserModel.id)
+                .paginate(
+                    page=page,
+                    per_page=per_page,
+                    error_out=False,
+                    max_per_page=UserDAO.MAX_USERS_PER_PAGE,
+                )
+                .items
             )
-            .items
-        )
 
         list_of_users = [user.json() for user in users_list]
 
+        # resolve availability of the whole page at once instead of per user
+        busy_user_ids = MentorshipRelationModel.find_user_ids_in_accepted_relation(
+            user["id"] for user in list_of_users
+        )
+
         for user in list_of_users:
-            relation = MentorshipRelationDAO.list_current_mentorship_relation(
-                user["id"]
-            )
-            if isinstance(relation, MentorshipRelationModel):
+            if user["id"] in busy_user_ids:
                 user["is_available"] = False
             else:
                 # we don't need if statement for this case
@@ -205,6 +245,18 @@ class UserDAO:
 
         return list_of_users, HTTPStatus.OK
 
+    @staticmethod
+    def get_users_per_page(per_page: int):
+        """Returns the number of users listed per page, bounded by MAX_USERS_PER_PAGE.
+
+        Arguments:
+            per_page: The number of users per page requested by the client.
+        """
+
+        if per_page < 0:
+            return UserDAO.DEFAULT_USERS_PER_PAGE
+        return min(per_page, UserDAO.MAX_USERS_PER_PAGE)
+
     @staticmethod
     @email_verification_required
     def update_user_profile(user_id: int, data: Dict[str, str]):
@@ -221,7 +273,7 @@ class UserDAO:
 
         """
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         if not user:
             return messages.USER_DOES_NOT_EXIST, HTTPStatus.NOT_FOUND
 
@@ -330,7 +382,7 @@ class UserDAO:
         current_password = data["current_password"]
         new_password = data["new_password"]
 
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         if user.check_password(current_password):
             user.set_password(new_password)
             user.save_to_db()
@@ -388,6 +440,10 @@ class UserDAO:
             user = UserModel.find_by_username(username_or_email)
 
         if user and user.check_password(password):
+            # upgrade the hash to the current hashing policy, the password is known
+            if user.is_password_hash_outdated():
+                user.set_password(password)
+                user.save_to_db()
             return user
 
         return None
@@ -407,7 +463,7 @@ class UserDAO:
         Returns:
             achievements: A list containing the user's achievements
         """
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         all_relations = user.mentor_relations + user.mentee_relations
         tasks = []
         for relation in all_relations:
@@ -434,46 +490,25 @@ class UserDAO:
             A dict containing the stats (if the user ID is valid)
             If user ID is invalid, returns None
         """
-        user = UserModel.find_by_id(user_id)
+        # steady state is a single read of the user's name and statistics,
+        # pending changes are flushed first as populate_existing skips autoflush
+        db.session.flush()
+        user_statistics = (
+            db.session.query(UserModel.name, UserStatisticsModel)
+            .outerjoin(UserStatisticsModel, UserStatisticsModel.user_id == UserModel.id)
+            .filter(UserModel.id == user_id)
+            .populate_existing()
+            .first()
+        )
 
-        if not user:
+        if not user_statistics:
             return None
 
-        all_relations = user.mentor_relations + user.mentee_relations
-        (
-            pending_requests,
-            accepted_requests,
-            rejected_requests,
-            completed_relations,
-            cancelled_relations,
-        ) = (0, 0, 0, 0, 0)
-        for relation in all_relations:
-            if relation.state == MentorshipRelationState.PENDING:
-                pending_requests += 1
-            elif relation.state == MentorshipRelationState.ACCEPTED:
-                accepted_requests += 1
-            elif relation.state == MentorshipRelationState.REJECTED:
-                rejected_requests += 1
-            elif relation.state == MentorshipRelationState.COMPLETED:
-                completed_relations += 1
-            elif relation.state == MentorshipRelationState.CANCELLED:
-                cancelled_relations += 1
-
-        achievements = UserDAO.get_achievements(user_id)
-        if achievements:
-            # We only need the first three of these achievements
-            achievements = achievements[0:3]
-            sorted(achievements, key=itemgetter("created_at"))
+        name, statistics = user_statistics
+        statistics = refresh_user_statistics(user_id, statistics)
 
-        response = {
-            "name": user.name,
-            "pending_requests": pending_requests,
-            "accepted_requests": accepted_requests,
-            "rejected_requests": rejected_requests,
-            "completed_relations": completed_relations,
-            "cancelled_relations": cancelled_relations,
-            "achievements": achievements,
-        }
+        response = {"name": name}
+        response.update(statistics.json())
         return response
 
     @staticmethod
@@ -485,200 +520,135 @@ class UserDAO:
         Args:
             user_id: id of the user whose dashboard is to be returned
         """
-        user = UserModel.find_by_id(user_id)
+        user = find_request_user(user_id)
         if not user:
             return None
 
-        response = {}
-
-        all_user_relations = user.mentee_relations + user.mentor_relations
-        relations_in_response_form = [
-            DashboardRelationResponseModel(relation) for relation in all_user_relations
-        ]
-
-        mentor_sent_relations = [
-            relation
-            for relation in relations_in_response_form
-            if relation.action_user_id == user_id and relation.mentor_id == user_id
-        ]
-        mentor_received_relations = [
-            relation
-            for relation in relations_in_response_form
-            if relation.action_user_id != user_id and relation.mentor_id == user_id
-        ]
-        mentee_sent_relations = [
-            relation
-            for relation in relations_in_response_form
-            if relation.action_user_id == user_id and relation.mentee_id == user_id
-        ]
-        mentee_received_relations = [
-            relation
-            for relation in relations_in_response_form
-            if relation.action_user_id != user_id and relation.mentee_id == user_id
-        ]
-
-        as_mentee = {
-            "sent": {
-                "accepted": [],
-                "rejected": [],
-                "completed": [],
-                "cancelled": [],
-                "pending": [],
-            },
-            "received": {
-                "accepted": [],
-                "rejected": [],
-                "completed": [],
-                "cancelled": [],
-                "pending": [],
-            },
-        }
-        as_mentor = {
-            "sent": {
-                "accepted": [],
-                "rejected": [],
-                "completed": [],
-                "cancelled": [],
-                "pending": [],
-            },
-            "received": {
-                "accepted": [],
-                "rejected": [],
-                "completed": [],
-                "cancelled": [],
-                "pending": [],
-            },
+        response = {
+            "as_mentor": UserDAO._empty_dashboard_role(),
+            "as_mentee": UserDAO._empty_dashboard_role(),
         }
 
-        as_mentee["received"]["accepted"] = [
-            relation.response
-            for relation in mentee_received_relations
-            if relation.state == MentorshipRelationState.ACCEPTED
-        ]
-        as_mentee["received"]["rejected"] = [
-            relation.response
-            for relation in mentee_received_relations
-            if relation.state == MentorshipRelationState.REJECTED
-        ]
-        as_mentee["received"]["completed"] = [
-            relation.response
-            for relation in mentee_received_relations
-            if relation.state == MentorshipRelationState.COMPLETED
-        ]
-        as_mentee["received"]["cancelled"] = [
-            relation.response
-            for relation in mentee_received_relations
-            if relation.state == MentorshipRelationState.CANCELLED
-        ]
-        as_mentee["received"]["pending"] = [
-            relation.response
-            for relation in mentee_received_relations
-            if relation.state == MentorshipRelationState.PENDING
-        ]
-
-        as_mentor["received"]["accepted"] = [
-            relation.response
-            for relation in mentor_received_relations
-            if relation.state == MentorshipRelationState.ACCEPTED
-        ]
-        as_mentor["received"]["rejected"] = [
-            relation.response
-            for relation in mentor_received_relations
-            if relation.state == MentorshipRelationState.REJECTED
-        ]
-        as_mentor["received"]["completed"] = [
-            relation.response
-            for relation in mentor_received_relations
-            if relation.state == MentorshipRelationState.COMPLETED
-        ]
-        as_mentor["received"]["cancelled"] = [
-            relation.response
-            for relation in mentor_received_relations
-            if relation.state == MentorshipRelationState.CANCELLED
-        ]
-        as_mentor["received"]["pending"] = [
-            relation.response
-            for relation in mentor_received_relations
-            if relation.state == MentorshipRelationState.PENDING
-        ]
-
-        as_mentee["sent"]["accepted"] = [
-            relation.response
-            for relation in mentee_sent_relations
-            if relation.state == MentorshipRelationState.ACCEPTED
-        ]
-        as_mentee["sent"]["rejected"] = [
-            relation.response
-            for relation in mentee_sent_relations
-            if relation.state == MentorshipRelationState.REJECTED
-        ]
-        as_mentee["sent"]["completed"] = [
-            relation.response
-            for relation in mentee_sent_relations
-            if relation.state == MentorshipRelationState.COMPLETED
-        ]
-        as_mentee["sent"]["cancelled"] = [
-            relation.response
-            for relation in mentee_sent_relations
-            if relation.state == MentorshipRelationState.CANCELLED
-        ]
-        as_mentee["sent"]["pending"] = [
-            relation.response
-            for relation in mentee_sent_relations
-            if relation.state == MentorshipRelationState.PENDING
-        ]
-
-        as_mentor["sent"]["accepted"] = [
-            relation.response
-            for relation in mentor_sent_relations
-            if relation.state == MentorshipRelationState.ACCEPTED
-        ]
-        as_mentor["sent"]["rejected"] = [
-            relation.response
-            for relation in mentor_sent_relations
-            if relation.state == MentorshipRelationState.REJECTED
-        ]
-        as_mentor["sent"]["completed"] = [
-            relation.response
-            for relation in mentor_sent_relations
-            if relation.state == MentorshipRelationState.COMPLETED
-        ]
-        as_mentor["sent"]["cancelled"] = [
-            relation.response
-            for relation in mentor_sent_relations
-            if relation.state == MentorshipRelationState.CANCELLED
-        ]
-        as_mentor["sent"]["pending"] = [
-            relation.response
-            for relation in mentor_sent_relations
-            if relation.state == MentorshipRelationState.PENDING
-        ]
-
-        response["as_mentor"] = as_mentor
-        response["as_mentee"] = as_mentee
-
-        current_relation = MentorshipRelationDAO.list_current_mentorship_relation(
-            user_id=user_id
+        relations = UserDAO.query_dashboard_relations(user_id).all()
+
+        current_relation = None
+        for relation in relations:
+            role = "as_mentor" if relation.mentor_id == user_id else "as_mentee"
+            direction = "sent" if relation.action_user_id == user_id else "received"
+            response[role][direction][relation.state.name.lower()].append(
+                DashboardRelationResponseModel(relation).response
+            )
+
+            if relation.state == MentorshipRelationState.ACCEPTED:
+                current_relation = relation
+
+        if current_relation:
+            tasks_todo, tasks_done = [], []
+            for task in current_relation.tasks_list.tasks:
+                if task["is_done"]:
+                    tasks_done.append(task)
+                else:
+                    tasks_todo.append(task)
+
+            response["tasks_todo"] = marshal(tasks_todo, list_tasks_response_body)
+            response["tasks_done"] = marshal(tasks_done, list_tasks_response_body)
+
+        return response
+
+    @staticmethod
+    @email_verification_required
+    def export_user_data(user_id: int):
+        """Returns a generator of the user's data records, for a streamed export.
+
+        The user's profile is followed by their relations, the tasks and then the
+        comments of these relations. The rows are fetched EXPORT_BATCH_SIZE at a
+        time through server side cursors, so the memory used does not depend on
+        the size of the history.
+
+        Args:
+            user_id: The id of the user whose data is exported.
+
+        Returns:
+            A generator of dicts with the record type and its data.
+        """
+        user = find_request_user(user_id)
+        relation_ids = db.session.query(MentorshipRelationModel.id).filter(
+            (MentorshipRelationModel.mentor_id == user_id)
+            | (MentorshipRelationModel.mentee_id == user_id)
         )
 
-        if current_relation != (
-            messages.NOT_IN_MENTORED_RELATION_CURRENTLY,
-            HTTPStatus.OK,
-        ):
-            response["tasks_todo"] = marshal(
-                [
-                    task
-                    for task in current_relation.tasks_list.tasks
-                    if not task["is_done"]
-                ],
-                list_tasks_response_body,
+        def generate_records():
+            yield {"type": "user", "data": marshal(user, full_user_api_model)}
+
+            relations = (
+                MentorshipRelationModel.query.filter(
+                    MentorshipRelationModel.id.in_(relation_ids)
+                )
+                .order_by(MentorshipRelationModel.id)
+                .yield_per(UserDAO.EXPORT_BATCH_SIZE)
             )
-            response["tasks_done"] = marshal(
-                [task for task in current_relation.tasks_list.tasks if task["is_done"]],
-                list_tasks_response_body,
+            for relation in relations:
+                data = relation.json()
+                data["state"] = relation.state.value
+                yield {"type": "relation", "data": data}
+
+            tasks = (
+                db.session.query(MentorshipRelationModel.id, TaskModel)
+                .join(
+                    TaskModel,
+                    TaskModel.tasks_list_id == MentorshipRelationModel.tasks_list_id,
+                )
+                .filter(MentorshipRelationModel.id.in_(relation_ids))
+                .order_by(MentorshipRelationModel.id, TaskModel.task_id)
+                .yield_per(UserDAO.EXPORT_BATCH_SIZE)
             )
+            for relation_id, task in tasks:
+                yield {"type": "task", "relation_id": relation_id, "data": task.json()}
 
-        return response
+            comments = (
+                TaskCommentModel.query.filter(
+                    TaskCommentModel.relation_id.in_(relation_ids)
+                )
+                .order_by(TaskCommentModel.id)
+                .yield_per(UserDAO.EXPORT_BATCH_SIZE)
+            )
+            for comment in comments:
+                yield {"type": "comment", "data": comment.json()}
+
+        return generate_records()
+
+    @staticmethod
+    def query_dashboard_relations(user_id: int):
+        """Returns a query of the relations of the user dashboard.
+
+        A single query loads every relation with the public info of both users.
+
+        Args:
+            user_id: id of the user whose dashboard is returned
+        """
+        return (
+            MentorshipRelationModel.query.filter(
+                (MentorshipRelationModel.mentor_id == user_id)
+                | (MentorshipRelationModel.mentee_id == user_id)
+            )
+            .options(
+                joinedload(MentorshipRelationModel.mentor).load_only(
+                    "id", "name", "photo_url"
+                ),
+                joinedload(MentorshipRelationModel.mentee).load_only(
+                    "id", "name", "photo_url"
+                ),
+            )
+            .order_by(MentorshipRelationModel.id)
+        )
+
+    @staticmethod
+    def _empty_dashboard_role():
+        """Returns the dashboard buckets of one role, by direction and state."""
+        return {
+            direction: {state: [] for state in DASHBOARD_STATES}
+            for direction in ("sent", "received")
+        }
 
 
 class DashboardRelationResponseModel:
@@ -1,11 +1,9 @@
 import datetime
 from itsdangerous import URLSafeTimedSerializer, BadSignature
 
-from flask_mail import Message
 from flask import render_template
 
 import config
-from app.api.mail_extension import mail
 
 
 def generate_confirmation_token(email):
@@ -53,19 +51,28 @@ def mock_send_email(recipient, subject, template):
 
 
 def send_email(recipient, subject, template):
-    """Sends a html email message with a subject to the specified recipient."""
+    """Queues a html email message with a subject to the specified recipient.
+
+    The message is added to the email outbox in the current session, so it is
+    committed or rolled back with the change of the caller, and delivered by
+    the background workers so the request does not wait for the mail server.
+    """
     from run import application
 
     if application.config["MOCK_EMAIL"]:
         mock_send_email(recipient, subject, template)
     else:
-        msg = Message(
-            subject,
-            recipients=[recipient],
-            html=template,
-            sender=application.config["MAIL_DEFAULT_SENDER"],
+        from app.database.models.email_outbox import EmailOutboxModel
+        from app.database.sqlalchemy_extension import db
+
+        db.session.add(
+            EmailOutboxModel(
+                recipient,
+                subject,
+                template,
+                sender=application.config["MAIL_DEFAULT_SENDER"],
+            )
         )
-        mail.send(msg)
 
 
 def send_email_verification_message(user_name, email):
@@ -0,0 +1,258 @@
+"""
+This module caches the verified claims of the JWTs and keeps the list of the
+revoked ones.
+
+The claims of a token are cached under the hash of the token, until the token
+expires, so a token sent again by its client is neither parsed nor verified
+again. The cache is private to each process.
+
+Revoking the tokens of a user, e.g. when the user is deleted, refuses every
+token issued to them up to then. The revocations are stored in the database
+and loaded by each process every JWT_REVOCATION_REFRESH_INTERVAL seconds into
+a bloom filter backed by an exact set: most tokens belong to users who were
+never revoked, and are accepted by the bloom filter without a lookup of the
+set. A revocation is stored with the transaction revoking the tokens, e.g. the
+one deleting the user, and applies to the process committing it at once.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from flask_jwt_extended.utils import decode_token
+from sqlalchemy import event
+
+from app.database.models.revoked_user_tokens import RevokedUserTokensModel
+from app.database.sqlalchemy_extension import db
+
+# session.info key of the revocations applied to this process on commit
+PENDING_REVOCATIONS_KEY = "jwt_cache_pending_revocations"
+
+
+class ClaimsCache:
+    """Keeps the claims of up to max_entries tokens, until they expire.
+
+    The claims of the least recently used token are evicted first.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(encoded_token: str) -> str:
+        return hashlib.sha256(encoded_token.encode()).hexdigest()
+
+    def get(self, encoded_token: str):
+        """Returns the claims of a token, or None."""
+        key = self.get_key(encoded_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def set(self, encoded_token: str, claims) -> None:
+        """Caches the claims of a token until its expiration, if it has one."""
+        if "exp" not in claims:
+            return
+        with self._lock:
+            self._entries[self.get_key(encoded_token)] = (claims["exp"], claims)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class BloomFilter:
+    """Set of integers answering "maybe" or "no" in a fixed number of bits."""
+
+    def __init__(self, size: int = 2 ** 20, hashes: int = 4):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray(size // 8)
+
+    def _positions(self, value: int):
+        digest = hashlib.blake2b(str(value).encode(), digest_size=4 * self.hashes)
+        digest = digest.digest()
+        for index in range(self.hashes):
+            yield int.from_bytes(digest[4 * index : 4 * index + 4], "big") % self.size
+
+    def add(self, value: int) -> None:
+        for position in self._positions(value):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, value: int) -> bool:
+        return all(
+            self.bits[position // 8] & (1 << (position % 8))
+            for position in self._positions(value)
+        )
+
+
+class RevocationList:
+    """Revocations of the tokens of users, loaded from the database.
+
+    Each refresh reads the revocations made since the last one loaded, minus
+    REFRESH_OVERLAP seconds: a revocation committed after a more recent one,
+    by a slower transaction or a process with a late clock, is then still read.
+    The revocations read again are skipped.
+    """
+
+    REFRESH_OVERLAP = 60  # seconds
+
+    def __init__(self):
+        self.bloom_filter = BloomFilter()
+        # time of the last revocation of each user
+        self.revoked_at = {}
+        self.last_revoked_at = 0.0
+        # ids of the loaded revocations made within the overlap, by revoked_at
+        self.recent_ids = {}
+        self.last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, user_id: int, revoked_at: float) -> None:
+        with self._lock:
+            self.bloom_filter.add(user_id)
+            self.revoked_at[user_id] = max(revoked_at, self.revoked_at.get(user_id, 0))
+
+    def refresh(self, interval: float, max_token_lifetime: float) -> None:
+        """Loads the revocations made since the last refresh, once per interval.
+
+        The revocations older than the tokens which can still be valid are
+        ignored.
+        """
+        now = time.monotonic()
+        if now - self.last_refresh < interval:
+            return
+        self.last_refresh = now
+        revocations = RevokedUserTokensModel.find_revoked_after(
+            max(
+                self.last_revoked_at - self.REFRESH_OVERLAP,
+                time.time() - max_token_lifetime,
+            )
+        )
+        for revocation in revocations:
+            if revocation.id in self.recent_ids:
+                continue
+            self.add(revocation.user_id, revocation.revoked_at)
+            self.recent_ids[revocation.id] = revocation.revoked_at
+            self.last_revoked_at = max(self.last_revoked_at, revocation.revoked_at)
+
+        min_revoked_at = self.last_revoked_at - self.REFRESH_OVERLAP
+        self.recent_ids = {
+            revocation_id: revoked_at
+            for revocation_id, revoked_at in self.recent_ids.items()
+            if revoked_at > min_revoked_at
+        }
+
+    def is_revoked(self, user_id: int, issued_at: float) -> bool:
+        """Returns if a token issued to a user at issued_at was revoked."""
+        if user_id not in self.bloom_filter:
+            return False
+        with self._lock:
+            return issued_at <= self.revoked_at.get(user_id, -1)
+
+    def clear(self) -> None:
+        """Forgets every revocation, the next refresh reads them all again."""
+        with self._lock:
+            self.bloom_filter = BloomFilter()
+            self.revoked_at.clear()
+            self.last_revoked_at = 0.0
+            self.recent_ids = {}
+            self.last_refresh = time.monotonic()
+
+
+claims_caches = {}
+revocation_list = RevocationList()
+
+
+def get_claims_cache():
+    """Returns the claims cache configured for the current app, None if disabled."""
+    max_entries = current_app.config.get("JWT_CLAIMS_CACHE_MAX_ENTRIES", 0)
+    if not max_entries:
+        return None
+    if max_entries not in claims_caches:
+        claims_caches[max_entries] = ClaimsCache(max_entries)
+    return claims_caches[max_entries]
+
+
+def decode_token_with_cache(encoded_token, csrf_value=None, allow_expired=False):
+    """Returns the verified claims of a token, from the cache when possible.
+
+    Takes the arguments of flask_jwt_extended.utils.decode_token, the tokens
+    decoded with a CSRF value or while allowing expiration are not cached.
+    """
+    cache = get_claims_cache()
+    if cache is None or csrf_value is not None or allow_expired:
+        return decode_token(encoded_token, csrf_value, allow_expired)
+
+    claims = cache.get(encoded_token)
+    if claims is None:
+        claims = decode_token(encoded_token)
+        cache.set(encoded_token, claims)
+    return claims
+
+
+def is_token_revoked(decoded_token) -> bool:
+    """Returns if the tokens of the identity of a token were revoked since its issue."""
+    config = current_app.config
+    max_token_lifetime = max(
+        config["JWT_ACCESS_TOKEN_EXPIRES"], config["JWT_REFRESH_TOKEN_EXPIRES"]
+    ).total_seconds()
+    revocation_list.refresh(
+        config.get("JWT_REVOCATION_REFRESH_INTERVAL", 5), max_token_lifetime
+    )
+    return revocation_list.is_revoked(
+        decoded_token[config["JWT_IDENTITY_CLAIM"]], decoded_token["iat"]
+    )
+
+
+def revoke_user_tokens(user_id: int) -> None:
+    """Revokes every token issued to a user up to now.
+
+    The revocation is added to the session and takes effect when the
+    transaction is committed by the caller.
+    """
+    db.session.add(RevokedUserTokensModel(user_id))
+
+
+def clear_jwt_caches() -> None:
+    """Removes every cached claim and forgets the revocations of this process."""
+    for cache in claims_caches.values():
+        cache.clear()
+    revocation_list.clear()
+
+
+# apply the revocations of every committed transaction to this process, without
+# waiting for the next refresh
+
+
+@event.listens_for(db.session, "after_flush")
+def collect_revocations(session, flush_context):
+    revocations = [
+        (instance.user_id, instance.revoked_at)
+        for instance in session.new
+        if isinstance(instance, RevokedUserTokensModel)
+    ]
+    if revocations:
+        session.info.setdefault(PENDING_REVOCATIONS_KEY, []).extend(revocations)
+
+
+@event.listens_for(db.session, "after_commit")
+def apply_revocations(session):
+    for user_id, revoked_at in session.info.pop(PENDING_REVOCATIONS_KEY, []):
+        revocation_list.add(user_id, revoked_at)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def forget_revocations(session, previous_transaction):
+    session.info.pop(PENDING_REVOCATIONS_KEY, None)
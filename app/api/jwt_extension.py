@@ -1,13 +1,30 @@
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, view_decorators
 from http import HTTPStatus
 from app import messages
 from app.api.api_extension import api
+from app.api.jwt_cache import decode_token_with_cache, is_token_revoked
 
 jwt = JWTManager()
 
 # This is needed for the error handlers to work with flask-restplus
 jwt._set_error_handler_callbacks(api)
 
+# The protected endpoints decode the tokens through this module attribute,
+# flask-jwt-extended has no hook to cache the claims of a token. This relies on
+# the internals of the version pinned in requirements.txt, the tests check that
+# the protected endpoints still decode the tokens through the cache
+view_decorators.decode_token = decode_token_with_cache
+
+
+@jwt.token_in_blacklist_loader
+def check_if_token_is_revoked(decoded_token):
+    return is_token_revoked(decoded_token)
+
+
+@jwt.revoked_token_loader
+def my_revoked_token_callback():
+    return messages.TOKEN_HAS_BEEN_REVOKED, HTTPStatus.UNAUTHORIZED
+
 
 @jwt.expired_token_loader
 def my_expired_token_callback():
@@ -6,6 +6,9 @@ def add_models_to_namespace(api_namespace):
         assign_and_revoke_user_admin_request_body.name
     ] = assign_and_revoke_user_admin_request_body
     api_namespace.models[public_admin_user_api_model.name] = public_admin_user_api_model
+    api_namespace.models[
+        response_cache_stats_response_body.name
+    ] = response_cache_stats_response_body
 
 
 assign_and_revoke_user_admin_request_body = Model(
@@ -36,3 +39,19 @@ public_admin_user_api_model = Model(
         "skills": fields.String(required=True, description="User skills"),
     },
 )
+
+
+response_cache_stats_response_body = Model(
+    "Response cache stats model",
+    {
+        "hits": fields.Integer(description="Responses served from the cache"),
+        "misses": fields.Integer(description="Responses computed"),
+        "hit_ratio": fields.Float(
+            description="Share of the responses served from the cache, "
+            "null before the first lookup"
+        ),
+        "resources": fields.Raw(
+            description="Hits, misses and hit ratio of each cached resource"
+        ),
+    },
+)
@@ -0,0 +1,200 @@
+"""
+This module limits the rate of the failed logins, per username and per IP.
+
+The failed attempts are counted in fixed windows of LOGIN_RATE_LIMIT_WINDOW
+seconds. The rate of a key is estimated over a window sliding with the
+current time: the count of the current window plus the count of the
+previous one, weighted by the part of it still within the sliding window.
+A login is refused, before looking up the user or hashing the password,
+while the rate of its username or IP has reached its limit.
+
+Available backends (selected with the LOGIN_RATE_LIMIT_BACKEND setting):
+- local: counters private to each process
+- redis: counters shared by every process, needs the redis package
+- off: logins are not limited
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+
+class LocalRateLimitBackend:
+    """Keeps the counters in the memory of the process, up to max_keys.
+
+    The counters of the least recently hit key are evicted first.
+    """
+
+    name = "local"
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, window_index: int) -> None:
+        """Increments the counter of key in the window window_index."""
+        with self._lock:
+            previous, current = self._read(key, window_index)
+            self._counters[key] = (window_index, previous, current + 1)
+            self._counters.move_to_end(key)
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+
+    def get_counts(self, key: str, window_index: int):
+        """Returns the counts of key in the windows before and at window_index."""
+        with self._lock:
+            return self._read(key, window_index)
+
+    def _read(self, key, window_index):
+        last_index, previous, current = self._counters.get(key, (window_index, 0, 0))
+        if last_index == window_index:
+            return previous, current
+        if last_index == window_index - 1:
+            return current, 0
+        return 0, 0
+
+    def clear(self) -> None:
+        """Removes every counter."""
+        with self._lock:
+            self._counters.clear()
+
+
+class RedisRateLimitBackend:
+    """Keeps the counters in a Redis server shared by every process.
+
+    The counter of each window expires once it is no longer the previous one.
+    """
+
+    name = "redis"
+    PREFIX = "rate-limit:"
+
+    def __init__(self, url: str, window: int):
+        if redis is None:
+            raise ValueError(
+                "The redis package has to be installed to use the redis "
+                "LOGIN_RATE_LIMIT_BACKEND."
+            )
+        self.client = redis.Redis.from_url(url)
+        self.window = window
+
+    def hit(self, key: str, window_index: int) -> None:
+        counter_key = f"{self.PREFIX}{key}:{window_index}"
+        pipeline = self.client.pipeline()
+        pipeline.incr(counter_key)
+        pipeline.expire(counter_key, 2 * self.window)
+        pipeline.execute()
+
+    def get_counts(self, key: str, window_index: int):
+        previous, current = self.client.mget(
+            f"{self.PREFIX}{key}:{window_index - 1}",
+            f"{self.PREFIX}{key}:{window_index}",
+        )
+        return int(previous or 0), int(current or 0)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(f"{self.PREFIX}*"):
+            self.client.delete(key)
+
+
+def get_retry_after(previous: int, current: int, elapsed: float, limit: int) -> float:
+    """Returns the fraction of window to wait before the rate is under limit.
+
+    Args:
+        previous: The count of the previous window.
+        current: The count of the current window.
+        elapsed: The fraction of the current window already elapsed.
+        limit: The maximum rate, per window.
+    """
+    if previous * (1 - elapsed) + current < limit:
+        return 0
+    if current < limit:
+        # the weight of the previous window has to decrease
+        return 1 - (limit - current) / previous - elapsed
+    # the current window has to become the previous one and decrease
+    return 1 - elapsed + 1 - limit / current
+
+
+# backends already created, by settings
+_backends = {}
+
+
+def get_rate_limit_backend():
+    """Returns the rate limit backend configured for the current app.
+
+    Returns None when the logins are not limited.
+    """
+    config = current_app.config
+    backend_name = config.get("LOGIN_RATE_LIMIT_BACKEND", "local")
+    if backend_name == "off":
+        return None
+
+    if backend_name == LocalRateLimitBackend.name:
+        key = (backend_name, config.get("LOGIN_RATE_LIMIT_MAX_KEYS", 100000))
+    elif backend_name == RedisRateLimitBackend.name:
+        key = (
+            backend_name,
+            config.get("LOGIN_RATE_LIMIT_REDIS_URL"),
+            config["LOGIN_RATE_LIMIT_WINDOW"],
+        )
+    else:
+        raise ValueError(
+            "The LOGIN_RATE_LIMIT_BACKEND config value has to be within these "
+            "values: local, redis, off."
+        )
+
+    if key not in _backends:
+        if backend_name == LocalRateLimitBackend.name:
+            _backends[key] = LocalRateLimitBackend(key[1])
+        else:
+            _backends[key] = RedisRateLimitBackend(key[1], key[2])
+    return _backends[key]
+
+
+def clear_rate_limits() -> None:
+    """Removes every counter of the backends of this process."""
+    for backend in _backends.values():
+        backend.clear()
+
+
+def get_login_limits(username: str, ip: str):
+    """Returns the rate limited keys of a login, with their limits."""
+    config = current_app.config
+    return [
+        (f"login:username:{username.lower()}", config["LOGIN_RATE_LIMIT_PER_USERNAME"]),
+        (f"login:ip:{ip}", config["LOGIN_RATE_LIMIT_PER_IP"]),
+    ]
+
+
+def get_login_retry_after(username: str, ip: str) -> int:
+    """Returns the seconds to wait before trying to login, 0 if allowed now."""
+    backend = get_rate_limit_backend()
+    if backend is None:
+        return 0
+
+    window = current_app.config["LOGIN_RATE_LIMIT_WINDOW"]
+    window_index, elapsed = divmod(time.time() / window, 1)
+    retry_after = max(
+        get_retry_after(*backend.get_counts(key, int(window_index)), elapsed, limit)
+        for key, limit in get_login_limits(username, ip)
+    )
+    # rounded first, so that float errors do not add a second
+    return math.ceil(round(retry_after * window, 3))
+
+
+def record_failed_login(username: str, ip: str) -> None:
+    """Counts a failed login in the rates of its username and IP."""
+    backend = get_rate_limit_backend()
+    if backend is None:
+        return
+
+    window_index = int(time.time() // current_app.config["LOGIN_RATE_LIMIT_WINDOW"])
+    for key, _ in get_login_limits(username, ip):
+        backend.hit(key, window_index)
@@ -7,6 +7,7 @@ from app.api.dao.user import UserDAO
 from app.api.models.admin import *
 from app.api.dao.admin import AdminDAO
 from app.api.resources.common import auth_header_parser
+from app.api.response_cache import get_response_cache_stats
 
 admin_ns = Namespace("Admins", description="Operations related to Admin users")
 add_models_to_namespace(admin_ns)
@@ -117,3 +118,42 @@ class ListAdmins(Resource):
             return list_of_admins, HTTPStatus.OK
         else:
             return messages.USER_IS_NOT_AN_ADMIN, HTTPStatus.FORBIDDEN
+
+
+@admin_ns.route("admin/response_cache_stats")
+class ResponseCacheStats(Resource):
+    @classmethod
+    @jwt_required
+    @admin_ns.doc("get_response_cache_stats")
+    @admin_ns.response(
+        HTTPStatus.OK.value,
+        f"{messages.GENERAL_SUCCESS_MESSAGE}",
+        response_cache_stats_response_body,
+    )
+    @admin_ns.doc(
+        responses={
+            HTTPStatus.UNAUTHORIZED.value: f"{messages.TOKEN_HAS_EXPIRED}<br>"
+            f"{messages.TOKEN_IS_INVALID}<br>"
+            f"{messages.AUTHORISATION_TOKEN_IS_MISSING}"
+        }
+    )
+    @admin_ns.response(HTTPStatus.FORBIDDEN.value, f"{messages.USER_IS_NOT_AN_ADMIN}")
+    @admin_ns.expect(auth_header_parser)
+    def get(cls):
+        """
+        Returns the hit ratio of the response cache.
+
+        A admin user with valid access token can view the hits, misses and hit ratio
+        of the response cache, in total and for each cached resource. The counts are
+        the ones of the process serving the request, since it was started.
+        """
+        user_id = get_jwt_identity()
+        user = UserDAO.get_user(user_id)
+
+        if user.is_admin:
+            return (
+                marshal(get_response_cache_stats(), response_cache_stats_response_body),
+                HTTPStatus.OK,
+            )
+        else:
+            return messages.USER_IS_NOT_AN_ADMIN, HTTPStatus.FORBIDDEN
@@ -6,11 +6,11 @@ from http import HTTPStatus
 from app import messages
 from app.api.resources.common import auth_header_parser
 from app.api.dao.mentorship_relation import MentorshipRelationDAO
-from app.api.dao.user import UserDAO
+from app.api.response_cache import cached_response
 from app.api.models.mentorship_relation import *
 from app.database.models.mentorship_relation import MentorshipRelationModel
-from app.api.email_utils import send_email_mentorship_relation_accepted
-from app.api.email_utils import send_email_new_request
+from app.utils.etag_utils import etag_response
+from app.utils.pagination_utils import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 
 mentorship_relation_ns = Namespace(
     "Mentorship Relation",
@@ -19,7 +19,6 @@ mentorship_relation_ns = Namespace(
 add_models_to_namespace(mentorship_relation_ns)
 
 DAO = MentorshipRelationDAO()
-userDAO = UserDAO()
 
 
 @mentorship_relation_ns.route("mentorship_relation/send_request")
@@ -82,26 +81,7 @@ class SendRequest(Resource):
         if is_valid != {}:
             return is_valid, HTTPStatus.BAD_REQUEST
 
-        response = DAO.create_mentorship_relation(user_sender_id, data)
-
-        # if the mentorship relation creation failed dont send email and return
-        if response[1] != HTTPStatus.CREATED.value:
-            return response
-
-        if user_sender_id == data["mentee_id"]:
-            sender_role = "mentee"
-            user_recipient_id = data["mentor_id"]
-        else:
-            sender_role = "mentor"
-            user_recipient_id = data["mentee_id"]
-
-        user_sender = userDAO.get_user(user_sender_id)
-        user_recipient = userDAO.get_user(user_recipient_id)
-        notes = data["notes"]
-
-        send_email_new_request(user_sender, user_recipient, notes, sender_role)
-
-        return response
+        return DAO.create_mentorship_relation(user_sender_id, data)
 
     @staticmethod
     def is_valid_data(data):
@@ -130,11 +110,34 @@ class GetAllMyMentorshipRelation(Resource):
         description="Mentorship relation state filter.",
         _in="query",
     )
+    @mentorship_relation_ns.param(
+        name="order",
+        description="Order of the relations: id (default) or creation_date_desc.",
+        _in="query",
+    )
+    @mentorship_relation_ns.param(
+        name="limit",
+        description="Maximum number of relations listed "
+        f"(at most {DAO.MAX_RELATIONS_PER_PAGE}), the cursor of the next page "
+        "is returned in the X-Next-Cursor header.",
+        _in="query",
+    )
+    @mentorship_relation_ns.param(
+        name="cursor",
+        description="Lists the relations after the given cursor.",
+        _in="query",
+    )
     @mentorship_relation_ns.response(
         HTTPStatus.OK.value,
         "Return all user's mentorship relations, filtered by the relation state, was successfully.",
         model=mentorship_request_response_body,
     )
+    @mentorship_relation_ns.response(
+        HTTPStatus.BAD_REQUEST.value,
+        f"{messages.INVALID_CURSOR}\n"
+        f"{messages.INVALID_RELATIONS_ORDER}\n"
+        f"{messages.INVALID_RELATIONS_LIMIT}",
+    )
     @mentorship_relation_ns.response(
         HTTPStatus.UNAUTHORIZED,
         f"{messages.TOKEN_HAS_EXPIRED}\n"
@@ -152,23 +155,42 @@ class GetAllMyMentorshipRelation(Resource):
 
         Input:
         1. Header: valid access token
+        2. Query (optional): relation_state, order, limit and cursor
 
         Returns:
         JSON array containing user's relations as objects.
         """
 
         user_id = get_jwt_identity()
-        rel_state_param = request.args
-        rel_state_filter = None
-
-        if rel_state_param:
-            rel_state_filter = rel_state_param["relation_state"].upper()
+        rel_state_filter = request.args.get("relation_state", "").upper() or None
+        order = request.args.get("order", default="id", type=str)
+        limit = request.args.get("limit", default=None, type=int)
+        cursor = request.args.get("cursor", default="", type=str)
+
+        after_id = decode_cursor(cursor)
+        if after_id is None:
+            mentorship_relation_ns.abort(
+                HTTPStatus.BAD_REQUEST, **messages.INVALID_CURSOR
+            )
 
-        response = DAO.list_mentorship_relations(
-            user_id=user_id, state=rel_state_filter
+        relations, status = DAO.list_mentorship_relations(
+            user_id=user_id,
+            state=rel_state_filter,
+            order=order,
+            limit=limit,
+            after_id=after_id,
         )
+        # a message is returned instead of the relations when they are not listed
+        if isinstance(relations, dict):
+            mentorship_relation_ns.abort(status, **relations)
+        if status != HTTPStatus.OK:
+            return relations, status
 
-        return response
+        headers = {}
+        if limit is not None and len(relations) == DAO.get_relations_per_page(limit):
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(relations[-1].id)
+
+        return relations, status, headers
 
 
 @mentorship_relation_ns.route("mentorship_relation/<int:request_id>/accept")
@@ -212,12 +234,7 @@ class AcceptMentorshipRelation(Resource):
         # if it is an integer
 
         user_id = get_jwt_identity()
-        response = DAO.accept_request(user_id=user_id, request_id=request_id)
-
-        if response[1] == HTTPStatus.OK.value:
-            send_email_mentorship_relation_accepted(request_id)
-
-        return response
+        return DAO.accept_request(user_id=user_id, request_id=request_id)
 
 
 @mentorship_relation_ns.route("mentorship_relation/<int:request_id>/reject")
@@ -406,6 +423,8 @@ class ListCurrentMentorshipRelation(Resource):
         f"{messages.TOKEN_IS_INVALID}\n"
         f"{messages.AUTHORISATION_TOKEN_IS_MISSING}",
     )
+    @etag_response("current_mentorship_relation")
+    @cached_response("current_mentorship_relation")
     def get(cls):
         """
         Lists current mentorship relation of the current user.
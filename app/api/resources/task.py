@@ -5,6 +5,8 @@ from http import HTTPStatus
 
 from app import messages
 from app.api.dao.task import TaskDAO
+from app.api.response_cache import cached_response
+from app.utils.etag_utils import etag_response
 from app.api.resources.common import auth_header_parser
 from app.api.models.task import *
 
@@ -137,6 +139,8 @@ class ListTasks(Resource):
     @task_ns.response(
         HTTPStatus.NOT_FOUND, f"{messages.MENTORSHIP_RELATION_DOES_NOT_EXIST}"
     )
+    @etag_response("tasks")
+    @cached_response("tasks")
     def get(cls, request_id):
         """
         List all tasks from a mentorship relation.
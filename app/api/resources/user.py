@@ -1,6 +1,6 @@
 from datetime import datetime
 from http import HTTPStatus
-from flask import request
+from flask import Response, request, stream_with_context
 from flask_jwt_extended import (
     jwt_required,
     jwt_refresh_token_required,
@@ -12,16 +12,65 @@ from flask_restx import Resource, marshal, Namespace
 
 from app import messages
 from app.api.validations.user import *
-from app.api.email_utils import send_email_verification_message
 from app.api.models.user import *
 from app.api.dao.user import UserDAO
+from app.api.rate_limit import get_login_retry_after, record_failed_login
+from app.api.response_cache import cached_response
 from app.api.resources.common import auth_header_parser, refresh_auth_header_parser
+from app.utils.etag_utils import etag_response
+from app.utils.json_codec_utils import get_json_codec
+from app.utils.pagination_utils import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 
 users_ns = Namespace("Users", description="Operations related to users")
 add_models_to_namespace(users_ns)
 
 DAO = UserDAO()  # User data access object
 
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def list_users_response(user_id: int, is_verified=None):
+    """Lists users with page or cursor pagination, depending on the query string.
+
+    When a "cursor" argument is passed (empty for the first page) the users are
+    listed with keyset pagination and the cursor of the next page, if any, is
+    returned in the X-Next-Cursor header. In cursor pagination, a "per_page"
+    below 1 or an invalid cursor aborts the request with 400.
+    """
+
+    search_query = request.args.get("search", "")
+    page = request.args.get("page", default=UserDAO.DEFAULT_PAGE, type=int)
+    per_page = request.args.get(
+        "per_page", default=UserDAO.DEFAULT_USERS_PER_PAGE, type=int
+    )
+    cursor = request.args.get("cursor", default=None, type=str)
+
+    if cursor is None:
+        return DAO.list_users(
+            user_id, search_query, page, per_page, is_verified=is_verified
+        )
+
+    if per_page < 1:
+        users_ns.abort(HTTPStatus.BAD_REQUEST, **messages.INVALID_USERS_PER_PAGE)
+
+    after_id = decode_cursor(cursor)
+    if after_id is None:
+        users_ns.abort(HTTPStatus.BAD_REQUEST, **messages.INVALID_CURSOR)
+
+    users, status = DAO.list_users(
+        user_id,
+        search_query,
+        per_page=per_page,
+        is_verified=is_verified,
+        after_id=after_id,
+    )
+
+    headers = {}
+    if users and len(users) == UserDAO.get_users_per_page(per_page):
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(users[-1]["id"])
+
+    return users, status, headers
+
 
 @users_ns.route("users")
 @users_ns.response(
@@ -40,6 +89,9 @@ class UserList(Resource):
             "search": "Search query",
             "page": "specify page of users (default: 1)",
             "per_page": "specify number of users per page (default: 10)",
+            "cursor": "use cursor pagination, starting after the given cursor "
+            "(empty for the first page); the next cursor is returned in the "
+            "X-Next-Cursor header",
         },
     )
     @users_ns.response(
@@ -54,6 +106,10 @@ class UserList(Resource):
             f"{messages.AUTHORISATION_TOKEN_IS_MISSING}"
         }
     )
+    @users_ns.response(
+        HTTPStatus.BAD_REQUEST.value,
+        f"{messages.INVALID_USERS_PER_PAGE}\n{messages.INVALID_CURSOR}",
+    )
     @users_ns.marshal_list_with(
         public_user_api_model, code=HTTPStatus.OK.value, description="Success"
     )
@@ -69,13 +125,8 @@ class UserList(Resource):
         available_to_mentor, registration_date. The current user's details are not returned.
         """
 
-        page = request.args.get("page", default=UserDAO.DEFAULT_PAGE, type=int)
-        per_page = request.args.get(
-            "per_page", default=UserDAO.DEFAULT_USERS_PER_PAGE, type=int
-        )
-
         user_id = get_jwt_identity()
-        return DAO.list_users(user_id, request.args.get("search", ""), page, per_page)
+        return list_users_response(user_id)
 
 
 @users_ns.route("users/<int:user_id>")
@@ -97,6 +148,8 @@ class OtherUser(Resource):
         f"{messages.AUTHORISATION_TOKEN_IS_MISSING}",
     )
     @users_ns.response(HTTPStatus.NOT_FOUND.value, f"{messages.USER_DOES_NOT_EXIST}")
+    @etag_response("user", owner_arg="user_id")
+    @cached_response("user", owner_arg="user_id")
     def get(cls, user_id):
         """
         Returns a user.
@@ -244,6 +297,9 @@ class VerifiedUser(Resource):
             "search": "Search query",
             "page": "specify page of users",
             "per_page": "specify number of users per page",
+            "cursor": "use cursor pagination, starting after the given cursor "
+            "(empty for the first page); the next cursor is returned in the "
+            "X-Next-Cursor header",
         },
     )
     @users_ns.response(
@@ -258,9 +314,13 @@ class VerifiedUser(Resource):
             f"{messages.AUTHORISATION_TOKEN_IS_MISSING}"
         }
     )
+    @users_ns.response(
+        HTTPStatus.BAD_REQUEST.value,
+        f"{messages.INVALID_USERS_PER_PAGE}\n{messages.INVALID_CURSOR}",
+    )
     @users_ns.marshal_list_with(
         public_user_api_model, code=HTTPStatus.OK.value, description="Success"
-    )  # , skip_none=True
+    )
     @users_ns.expect(auth_header_parser)
     def get(cls):
         """
@@ -273,15 +333,8 @@ class VerifiedUser(Resource):
         available_to_mentor. The current user's details are not returned.
         """
 
-        page = request.args.get("page", default=UserDAO.DEFAULT_PAGE, type=int)
-        per_page = request.args.get(
-            "per_page", default=UserDAO.DEFAULT_USERS_PER_PAGE, type=int
-        )
-
         user_id = get_jwt_identity()
-        return DAO.list_users(
-            user_id, request.args.get("search", ""), page, per_page, is_verified=True
-        )
+        return list_users_response(user_id, is_verified=True)
 
 
 @users_ns.route("register")
@@ -330,12 +383,7 @@ class UserRegister(Resource):
         if is_valid != {}:
             return is_valid, HTTPStatus.BAD_REQUEST
 
-        result = DAO.create_user(data)
-
-        if result[1] is HTTPStatus.CREATED:
-            send_email_verification_message(data["name"], data["email"])
-
-        return result
+        return DAO.create_user(data)
 
 
 @users_ns.route("user/confirm_email/<string:token>")
@@ -396,7 +444,7 @@ class UserResendEmailConfirmation(Resource):
         if user.is_email_verified:
             return messages.USER_ALREADY_CONFIRMED_ACCOUNT, HTTPStatus.FORBIDDEN
 
-        send_email_verification_message(user.name, data["email"])
+        DAO.resend_verification_email(user, data["email"])
 
         return messages.EMAIL_VERIFICATION_MESSAGE, HTTPStatus.OK
 
@@ -452,6 +500,9 @@ class LoginUser(Resource):
     @users_ns.response(
         HTTPStatus.UNAUTHORIZED.value, f"{messages.WRONG_USERNAME_OR_PASSWORD}"
     )
+    @users_ns.response(
+        HTTPStatus.TOO_MANY_REQUESTS.value, f"{messages.TOO_MANY_FAILED_LOGINS}"
+    )
     @users_ns.expect(login_request_body_model)
     def post(cls):
         """
@@ -473,9 +524,19 @@ class LoginUser(Resource):
         if not password:
             return messages.PASSWORD_FIELD_IS_MISSING, HTTPStatus.BAD_REQUEST
 
+        # refused before any database lookup or password hashing
+        retry_after = get_login_retry_after(username, request.remote_addr)
+        if retry_after:
+            return (
+                messages.TOO_MANY_FAILED_LOGINS,
+                HTTPStatus.TOO_MANY_REQUESTS,
+                {"Retry-After": str(retry_after)},
+            )
+
         user = DAO.authenticate(username, password)
 
         if not user:
+            record_failed_login(username, request.remote_addr)
             return messages.WRONG_USERNAME_OR_PASSWORD, HTTPStatus.UNAUTHORIZED
 
         if not user.is_email_verified:
@@ -513,6 +574,8 @@ class UserHomeStatistics(Resource):
     @classmethod
     @jwt_required
     @users_ns.expect(auth_header_parser)
+    @etag_response("home")
+    @cached_response("home")
     def get(cls):
         """Get Statistics regarding the current user
 
@@ -540,6 +603,8 @@ class UserDashboard(Resource):
     @classmethod
     @jwt_required
     @users_ns.expect(auth_header_parser)
+    @etag_response("dashboard")
+    @cached_response("dashboard")
     def get(cls):
         """Get current User's dashboard
 
@@ -552,3 +617,40 @@ class UserDashboard(Resource):
             return messages.USER_NOT_FOUND, HTTPStatus.NOT_FOUND
 
         return dashboard, HTTPStatus.OK
+
+
+@users_ns.route("user/export")
+@users_ns.expect(auth_header_parser, validate=True)
+@users_ns.response(
+    HTTPStatus.OK.value,
+    "Newline delimited JSON records of the user, relations, tasks and comments",
+)
+@users_ns.response(
+    HTTPStatus.UNAUTHORIZED.value,
+    f"{messages.TOKEN_HAS_EXPIRED}\n"
+    f"{messages.TOKEN_IS_INVALID}\n"
+    f"{messages.AUTHORISATION_TOKEN_IS_MISSING}",
+)
+@users_ns.response(HTTPStatus.NOT_FOUND.value, f"{messages.USER_DOES_NOT_EXIST}")
+class ExportUserData(Resource):
+    @classmethod
+    @jwt_required
+    @users_ns.doc("export_user_data")
+    def get(cls):
+        """Exports all the data of the current user
+
+        The response is streamed as newline delimited JSON, one record per line:
+        the user's profile, then their mentorship relations, the tasks and the
+        comments of these relations. Each record has a "type" (user, relation,
+        task or comment) and its "data".
+        """
+        user_id = get_jwt_identity()
+        records = DAO.export_user_data(user_id)
+        if isinstance(records, tuple):
+            return records
+
+        codec = get_json_codec()
+        lines = (codec.dumps(record) + "\n" for record in records)
+        return Response(
+            stream_with_context(lines), mimetype=NDJSON_MIMETYPE, status=HTTPStatus.OK
+        )
@@ -0,0 +1,226 @@
+"""
+This module defines the cache of the responses of read-heavy GET endpoints.
+
+Each cached response belongs to a user, the one whose data it shows. The
+version of the data of the user, persisted in users_statistics and
+incremented by every write of their relations, tasks and profiles, is part
+of the keys of their responses. So whichever process handled a write, the
+responses cached before it are never served again and expire on their own.
+
+Available backends (selected with the RESPONSE_CACHE_BACKEND setting):
+- local: LRU cache with a TTL, private to each process
+- redis: cache shared by every process, needs the redis package
+- off: responses are not cached
+
+The hits and misses of each process are reported to the admins by
+GET /admin/response_cache_stats.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from http import HTTPStatus
+
+from flask import current_app
+from flask_jwt_extended import get_jwt_identity
+
+from app.utils.request_user_utils import find_request_version
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+# responses served from the cache (hits) or computed (misses), by resource
+response_cache_counts = {}
+_response_cache_counts_lock = threading.Lock()
+
+
+def _count_lookup(resource: str, key: str) -> None:
+    with _response_cache_counts_lock:
+        counts = response_cache_counts.setdefault(resource, {"hits": 0, "misses": 0})
+        counts[key] += 1
+
+
+def _get_lookup_stats(hits: int, misses: int):
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / lookups if lookups else None,
+    }
+
+
+def get_response_cache_stats():
+    """Returns the hits, misses and hit ratio of the response cache of this
+    process, in total and by resource."""
+    with _response_cache_counts_lock:
+        resources = {
+            resource: _get_lookup_stats(counts["hits"], counts["misses"])
+            for resource, counts in response_cache_counts.items()
+        }
+    stats = _get_lookup_stats(
+        sum(counts["hits"] for counts in resources.values()),
+        sum(counts["misses"] for counts in resources.values()),
+    )
+    stats["resources"] = resources
+    return stats
+
+
+class LocalResponseCacheBackend:
+    """Keeps the responses in the memory of the process, up to max_entries.
+
+    The least recently used response is evicted first and every response
+    expires ttl seconds after it was cached.
+    """
+
+    name = "local"
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the response cached under key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, key, response) -> None:
+        """Caches the response under key."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes every response."""
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisResponseCacheBackend:
+    """Keeps the responses in a Redis server shared by every process.
+
+    Responses are stored as JSON and expire ttl seconds after they were cached,
+    the eviction of the least recently used ones is left to the server.
+    """
+
+    name = "redis"
+    PREFIX = "response-cache:"
+
+    def __init__(self, url: str, ttl: float):
+        if redis is None:
+            raise ValueError(
+                "The redis package has to be installed to use the redis "
+                "RESPONSE_CACHE_BACKEND."
+            )
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key):
+        response = self.client.get(self.PREFIX + key)
+        if response is None:
+            return None
+        return tuple(json.loads(response))
+
+    def set(self, key, response) -> None:
+        self.client.set(self.PREFIX + key, json.dumps(response), ex=int(self.ttl))
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(f"{self.PREFIX}*"):
+            self.client.delete(key)
+
+
+# backends already created, by settings
+_backends = {}
+
+
+def get_response_cache_backend():
+    """Returns the response cache backend configured for the current app.
+
+    Returns None when the responses are not cached.
+    """
+    config = current_app.config
+    backend_name = config.get("RESPONSE_CACHE_BACKEND", "local")
+    if backend_name == "off":
+        return None
+
+    ttl = config.get("RESPONSE_CACHE_TTL", 60)
+    if backend_name == LocalResponseCacheBackend.name:
+        key = (backend_name, config.get("RESPONSE_CACHE_MAX_ENTRIES", 10000), ttl)
+    elif backend_name == RedisResponseCacheBackend.name:
+        key = (backend_name, config.get("RESPONSE_CACHE_REDIS_URL"), ttl)
+    else:
+        raise ValueError(
+            "The RESPONSE_CACHE_BACKEND config value has to be within these "
+            "values: local, redis, off."
+        )
+
+    if key not in _backends:
+        if backend_name == LocalResponseCacheBackend.name:
+            _backends[key] = LocalResponseCacheBackend(key[1], ttl)
+        else:
+            _backends[key] = RedisResponseCacheBackend(key[1], ttl)
+    return _backends[key]
+
+
+def clear_response_cache() -> None:
+    """Removes every cached response of the backends of this process."""
+    for backend in _backends.values():
+        backend.clear()
+
+
+def cached_response(resource: str, owner_arg: str = None):
+    """Caches the successful responses of a GET endpoint.
+
+    Must be applied under jwt_required, the view arguments are part of the key.
+    Args:
+        resource: The name of the cached resource.
+        owner_arg: The view argument holding the id of the user the response
+            belongs to, defaults to the user of the JWT identity.
+    """
+
+    def decorator(get_function):
+        @wraps(get_function)
+        def cached_get(*args, **kwargs):
+            backend = get_response_cache_backend()
+            if backend is None:
+                return get_function(*args, **kwargs)
+
+            owner_id = kwargs[owner_arg] if owner_arg else get_jwt_identity()
+            # read before computing the response, so a write committed meanwhile
+            # leaves the response under an outdated version. The version is the
+            # one of the ETag, so a response is never served with the ETag of
+            # another version
+            version = find_request_version(owner_id)
+            if version is None:
+                return get_function(*args, **kwargs)
+            key = json.dumps([resource, owner_id, version, sorted(kwargs.items())])
+
+            response = backend.get(key)
+            if response is not None:
+                _count_lookup(resource, "hits")
+                return response
+
+            _count_lookup(resource, "misses")
+            response = get_function(*args, **kwargs)
+            if isinstance(response, tuple) and response[1] == HTTPStatus.OK:
+                backend.set(key, response)
+            return response
+
+        return cached_get
+
+    return decorator
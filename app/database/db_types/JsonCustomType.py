@@ -1,9 +1,12 @@
-import json
 from app.database.sqlalchemy_extension import db
+from app.utils.json_codec_utils import get_json_codec
 
 
 class JsonCustomType(db.TypeDecorator):
-    """Enables JSON storage by encoding and decoding to Text field."""
+    """Enables JSON storage by encoding and decoding to Text field.
+
+    The values are encoded with the JSON codec configured for the app.
+    """
 
     impl = db.Text
 
@@ -12,7 +15,7 @@ class JsonCustomType(db.TypeDecorator):
         if value is None:
             return "{}"
         else:
-            return json.dumps(value)
+            return get_json_codec().dumps(value)
 
     @classmethod
     def process_result_value(cls, value, dialect):
@@ -20,6 +23,6 @@ class JsonCustomType(db.TypeDecorator):
             return {}
         else:
             try:
-                return json.loads(value)
+                return get_json_codec().loads(value)
             except (ValueError, TypeError):
                 return None
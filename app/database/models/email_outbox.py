@@ -0,0 +1,149 @@
+import time
+import uuid
+from typing import List
+
+from flask_mail import Message
+
+from app.database.sqlalchemy_extension import db
+from app.utils.enum_utils import EmailStatus
+
+
+class EmailOutboxModel(db.Model):
+    """Data Model representation of an email waiting to be delivered.
+
+    Emails are written to the outbox within the request and delivered later
+    by the background workers, which record the status of each delivery.
+
+    Attributes:
+        id: integer primary key that defines the email.
+        recipient: string with the email address of the recipient.
+        sender: string with the email address of the sender.
+        subject: string with the subject of the email.
+        html: string with the html body of the email.
+        status: enumeration that indicates the delivery status of the email.
+        attempts: integer number of delivery attempts.
+        next_attempt_at: float timestamp after which the email can be (re)sent.
+        claim_token: string identifying the worker batch delivering the email.
+        created_at: float that defines the date of creation of the email.
+        sent_at: float that indicates the date of delivery of the email.
+        last_error: string with the error of the last failed attempt.
+    """
+
+    # Specifying database table used for EmailOutboxModel
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        db.Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+        {"extend_existing": True},
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipient = db.Column(db.String(254), nullable=False)
+    sender = db.Column(db.String(254))
+    subject = db.Column(db.String(255), nullable=False)
+    html = db.Column(db.Text, nullable=False)
+
+    status = db.Column(db.Enum(EmailStatus), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.Float, nullable=False)
+    claim_token = db.Column(db.String(36))
+
+    created_at = db.Column(db.Float, nullable=False)
+    sent_at = db.Column(db.Float)
+    last_error = db.Column(db.String(500))
+
+    def __init__(self, recipient, subject, html, sender=None):
+        self.recipient = recipient
+        self.sender = sender
+        self.subject = subject
+        self.html = html
+        self.status = EmailStatus.PENDING
+        self.attempts = 0
+        self.created_at = time.time()
+        self.next_attempt_at = self.created_at
+
+    def __repr__(self):
+        """Returns the id, recipient and status of the email."""
+        return f"Email with id = {self.id} to {self.recipient} is {self.status.name}"
+
+    def message(self) -> Message:
+        """Returns the Flask-Mail message delivering this email."""
+        return Message(
+            self.subject,
+            recipients=[self.recipient],
+            html=self.html,
+            sender=self.sender,
+        )
+
+    def mark_sent(self) -> None:
+        """Records a successful delivery."""
+        self.attempts += 1
+        self.status = EmailStatus.SENT
+        self.sent_at = time.time()
+        self.claim_token = None
+        self.last_error = None
+
+    def mark_failed_attempt(
+        self, error: str, max_attempts: int, retry_delay: float
+    ) -> None:
+        """Records a failed delivery, retried with an exponential backoff.
+
+        Args:
+            error: Description of the delivery error.
+            max_attempts: Number of attempts after which the email is FAILED.
+            retry_delay: Seconds before the first retry, doubled on each retry.
+        """
+        self.attempts += 1
+        self.last_error = error[:500]
+        self.claim_token = None
+        if self.attempts >= max_attempts:
+            self.status = EmailStatus.FAILED
+        else:
+            self.status = EmailStatus.PENDING
+            self.next_attempt_at = time.time() + retry_delay * 2 ** (self.attempts - 1)
+
+    @classmethod
+    def claim_batch(cls, batch_size: int, timeout: float) -> List["EmailOutboxModel"]:
+        """Claims a batch of emails due for delivery.
+
+        The emails are claimed with a conditional UPDATE, so concurrent workers
+        never deliver the same email. An email whose worker did not record the
+        delivery within timeout seconds, e.g. because it died, is claimed again.
+        Args:
+            batch_size: Maximum number of emails claimed.
+            timeout: Seconds the worker has to deliver the claimed emails.
+
+        Returns:
+            The claimed emails.
+        """
+        now = time.time()
+        claim_token = str(uuid.uuid4())
+        due = db.and_(
+            cls.status.in_([EmailStatus.PENDING, EmailStatus.SENDING]),
+            cls.next_attempt_at <= now,
+        )
+        due_ids = [
+            email_id
+            for email_id, in db.session.query(cls.id)
+            .filter(due)
+            .order_by(cls.next_attempt_at)
+            .limit(batch_size)
+        ]
+        if not due_ids:
+            db.session.commit()
+            return []
+
+        cls.query.filter(cls.id.in_(due_ids), due).update(
+            {
+                cls.status: EmailStatus.SENDING,
+                cls.claim_token: claim_token,
+                cls.next_attempt_at: now + timeout,
+            },
+            synchronize_session=False,
+        )
+        db.session.commit()
+        return cls.query.filter_by(claim_token=claim_token).order_by(cls.id).all()
+
+    def save_to_db(self) -> None:
+        """Adds the email to the outbox."""
+        db.session.add(self)
+        db.session.commit()
@@ -1,4 +1,5 @@
 from datetime import date
+from typing import Iterable, Set
 
 from app.database.models.tasks_list import TasksListModel
 from app.database.models.user import UserModel
@@ -24,11 +25,19 @@ class MentorshipRelationModel(db.Model):
         notes: string that indicates any notes.
         tasks_list_id: integer indicates the id of the tasks_list
         tasks_list: relationship between TasksListModel and mentorship_relation.
+        version: integer incremented on each update, used for optimistic concurrency.
     """
 
     # Specifying database table used for MentorshipRelationModel
     __tablename__ = "mentorship_relations"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # serve the relations of a user, optionally filtered by state
+        db.Index("ix_mentorship_relations_mentor_id_state", "mentor_id", "state"),
+        db.Index("ix_mentorship_relations_mentee_id_state", "mentee_id", "state"),
+        # serves the completion of overdue accepted relations
+        db.Index("ix_mentorship_relations_state_end_date", "state", "end_date"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -38,12 +47,12 @@ class MentorshipRelationModel(db.Model):
     action_user_id = db.Column(db.Integer, nullable=False)
     mentor = db.relationship(
         UserModel,
-        backref="mentor_relations",
+        backref=db.backref("mentor_relations", order_by="MentorshipRelationModel.id"),
         primaryjoin="MentorshipRelationModel.mentor_id == UserModel.id",
     )
     mentee = db.relationship(
         UserModel,
-        backref="mentee_relations",
+        backref=db.backref("mentee_relations", order_by="MentorshipRelationModel.id"),
         primaryjoin="MentorshipRelationModel.mentee_id == UserModel.id",
     )
 
@@ -52,7 +61,11 @@ class MentorshipRelationModel(db.Model):
     start_date = db.Column(db.Float)
     end_date = db.Column(db.Float)
 
-    state = db.Column(db.Enum(MentorshipRelationState), nullable=False)
+    # the previous state is always loaded on change, to keep users_statistics in sync
+    state = db.column_property(
+        db.Column(db.Enum(MentorshipRelationState), nullable=False),
+        active_history=True,
+    )
     notes = db.Column(db.String(400))
 
     tasks_list_id = db.Column(db.Integer, db.ForeignKey("tasks_list.id"))
@@ -60,6 +73,10 @@ class MentorshipRelationModel(db.Model):
         TasksListModel, uselist=False, backref="mentorship_relation"
     )
 
+    # every UPDATE checks that the row did not change since it was read
+    version = db.Column(db.Integer, nullable=False, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+
     def __init__(
         self,
         action_user_id,
@@ -108,6 +125,70 @@ class MentorshipRelationModel(db.Model):
         """
         return cls.query.filter_by(id=_id).first()
 
+    @classmethod
+    def query_by_user(cls, user_id: int, state: MentorshipRelationState = None):
+        """Returns a query of the mentorships of the user, as mentor or mentee.
+
+        The query is a UNION of one lookup per role, so each side is served by
+        its (user, state) index. With an OR, the planner may pick the
+        (state, end_date) index instead.
+        Args:
+             user_id: The id of the user.
+             state: Optional state of the mentorships.
+        """
+        as_mentor = cls.query.filter(cls.mentor_id == user_id)
+        as_mentee = cls.query.filter(cls.mentee_id == user_id)
+        if state is not None:
+            as_mentor = as_mentor.filter(cls.state == state)
+            as_mentee = as_mentee.filter(cls.state == state)
+        return as_mentor.union(as_mentee)
+
+    @classmethod
+    def find_current_relation(cls, user_id: int) -> "MentorshipRelationModel":
+        """Returns the ACCEPTED mentorship of the user, if any.
+
+        Args:
+             user_id: The id of the user.
+        """
+        return (
+            cls.query_by_user(user_id, MentorshipRelationState.ACCEPTED)
+            .order_by(cls.id)
+            .first()
+        )
+
+    @classmethod
+    def find_user_ids_in_accepted_relation(cls, user_ids: Iterable[int]) -> Set[int]:
+        """Returns which of the passed user ids are in an accepted mentorship.
+
+        The lookup is done with a single query for the whole batch of ids.
+        Args:
+             user_ids: The ids of the users to be checked.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return set()
+
+        rows = cls.query_users_in_accepted_relation(user_ids).all()
+        busy_user_ids = {user_id for row in rows for user_id in row}
+        return busy_user_ids & user_ids
+
+    @classmethod
+    def query_users_in_accepted_relation(cls, user_ids: Iterable[int]):
+        """Returns a query of the mentor and mentee ids of the accepted
+        mentorships of the passed users.
+
+        As in query_by_user, one lookup per role is served by its (user, state)
+        index.
+        Args:
+             user_ids: The ids of the users to be checked.
+        """
+        accepted = db.session.query(cls.mentor_id, cls.mentee_id).filter(
+            cls.state == MentorshipRelationState.ACCEPTED
+        )
+        return accepted.filter(cls.mentor_id.in_(user_ids)).union(
+            accepted.filter(cls.mentee_id.in_(user_ids))
+        )
+
     @classmethod
     def is_empty(cls) -> bool:
         """Returns True if the mentorship model is empty, and False otherwise."""
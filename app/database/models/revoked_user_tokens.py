@@ -0,0 +1,49 @@
+import time
+
+from app.database.sqlalchemy_extension import db
+
+
+class RevokedUserTokensModel(db.Model):
+    """Data Model representation of the revocation of the tokens of a user.
+
+    Every token of the user issued up to the revocation is refused, e.g. once
+    the user is deleted.
+
+    Attributes:
+        id: integer primary key.
+        user_id: integer id of the user whose tokens are revoked.
+        revoked_at: float timestamp of the revocation.
+    """
+
+    # Specifying database table used for RevokedUserTokensModel
+    __tablename__ = "revoked_user_tokens"
+    __table_args__ = (
+        db.Index("ix_revoked_user_tokens_revoked_at", "revoked_at"),
+        {"extend_existing": True},
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    revoked_at = db.Column(db.Float, nullable=False)
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.revoked_at = time.time()
+
+    def __repr__(self):
+        """Returns the user and time of the revocation."""
+        return f"Tokens of user {self.user_id} revoked at {self.revoked_at}"
+
+    @classmethod
+    def find_revoked_after(cls, min_revoked_at: float):
+        """Returns the revocations made after min_revoked_at."""
+        return (
+            cls.query.filter(cls.revoked_at > min_revoked_at)
+            .order_by(cls.revoked_at)
+            .all()
+        )
+
+    def save_to_db(self) -> None:
+        """Adds the revocation to the database."""
+        db.session.add(self)
+        db.session.commit()
@@ -0,0 +1,79 @@
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from app.database.sqlalchemy_extension import db
+
+
+class SchedulerLeaseModel(db.Model):
+    """Data Model representation of the lease of a scheduled job.
+
+    The process holding the lease of a job is the only one running it, so a job
+    scheduled by every worker runs once. An expired lease can be taken over by
+    another process, e.g. when its owner died.
+
+    Attributes:
+        name: string primary key, id of the leased job.
+        owner: string identifying the process holding the lease.
+        expires_at: float timestamp after which the lease can be taken over.
+    """
+
+    # Specifying database table used for SchedulerLeaseModel
+    __tablename__ = "scheduler_leases"
+    __table_args__ = {"extend_existing": True}
+
+    name = db.Column(db.String(80), primary_key=True)
+    owner = db.Column(db.String(120), nullable=False)
+    expires_at = db.Column(db.Float, nullable=False)
+
+    def __init__(self, name, owner, expires_at):
+        self.name = name
+        self.owner = owner
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        """Returns the leased job and its owner."""
+        return f"Lease of job '{self.name}' held by {self.owner}"
+
+    @classmethod
+    def try_acquire(
+        cls, name: str, owner: str, duration: float, current_timestamp: float = None
+    ) -> bool:
+        """Acquires or renews the lease of a job for the passed owner.
+
+        The lease row is written in its own transaction, so concurrent
+        processes are serialized by the database whatever its type. The
+        scheduler_leases table is created by the d4a81f6c3e25 migration.
+        Args:
+            name: The id of the leased job.
+            owner: The id of the process asking for the lease.
+            duration: Number of seconds the lease is held.
+            current_timestamp: Reference time, defaults to now.
+
+        Returns:
+            True if the owner holds the lease, False otherwise.
+        """
+        if current_timestamp is None:
+            current_timestamp = time.time()
+        values = {"owner": owner, "expires_at": current_timestamp + duration}
+        table = cls.__table__
+
+        with db.engine.begin() as connection:
+            renewed = connection.execute(
+                table.update()
+                .where(table.c.name == name)
+                .where(
+                    (table.c.owner == owner) | (table.c.expires_at < current_timestamp)
+                )
+                .values(values)
+            )
+            if renewed.rowcount:
+                return True
+
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(table.insert().values(name=name, **values))
+        except IntegrityError:
+            # the lease is held by another process
+            return False
+        return True
@@ -0,0 +1,59 @@
+from app.database.sqlalchemy_extension import db
+
+
+class TaskModel(db.Model):
+    """Model representation of a task of a mentorship relation.
+
+    Attributes:
+        tasks_list_id: Id of the list of tasks this task belongs to.
+        task_id: Id of the task, unique within its list of tasks.
+        description: A description of the task.
+        is_done: Boolean specifying completion of the task.
+        created_at: Timestamp of the date on which the task was created.
+        completed_at: Timestamp of the date on which the task was completed.
+    """
+
+    __tablename__ = "tasks"
+    __table_args__ = {"extend_existing": True}
+
+    tasks_list_id = db.Column(
+        db.Integer, db.ForeignKey("tasks_list.id"), primary_key=True
+    )
+    task_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    description = db.Column(db.Text)
+    is_done = db.Column(db.Boolean, nullable=False, default=False, index=True)
+    created_at = db.Column(db.Float)
+    completed_at = db.Column(db.Float)
+
+    def __init__(
+        self, task_id, description, created_at, is_done=False, completed_at=None
+    ):
+        self.task_id = task_id
+        self.description = description
+        self.created_at = created_at
+        self.is_done = is_done
+        self.completed_at = completed_at
+
+    def json(self):
+        """Returns the task as a json object, using the TasksFields names."""
+        return {
+            "id": self.task_id,
+            "description": self.description,
+            "is_done": self.is_done,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+        }
+
+    def __repr__(self):
+        """Returns the ids of the task and of its list of tasks."""
+        return f"Task | id = {self.task_id}; tasks list id = {self.tasks_list_id}"
+
+    @classmethod
+    def find_by_id(cls, tasks_list_id: int, task_id: int) -> "TaskModel":
+        """Returns the task with the passed id in the passed list of tasks.
+
+        Args:
+            tasks_list_id: Id of the list of tasks.
+            task_id: Id of the task.
+        """
+        return cls.query.filter_by(tasks_list_id=tasks_list_id, task_id=task_id).first()
@@ -18,7 +18,11 @@ class TaskCommentModel(db.Model):
 
     # Specifying database table used for TaskCommentModel
     __tablename__ = "tasks_comments"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        db.Index("ix_tasks_comments_task_id_relation_id", "task_id", "relation_id"),
+        db.Index("ix_tasks_comments_user_id", "user_id"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
@@ -73,7 +77,16 @@ class TaskCommentModel(db.Model):
              task_id: The id of the task.
              relation_id: The id of the relation.
         """
-        return cls.query.filter_by(task_id=task_id, relation_id=relation_id).all()
+        return cls.query_by_task_id(task_id, relation_id).all()
+
+    @classmethod
+    def query_by_task_id(cls, task_id, relation_id):
+        """Returns a query of the task comments that have the passed task id.
+        Args:
+             task_id: The id of the task.
+             relation_id: The id of the relation.
+        """
+        return cls.query.filter_by(task_id=task_id, relation_id=relation_id)
 
     @classmethod
     def find_all_by_user_id(cls, user_id):
@@ -81,7 +94,15 @@ class TaskCommentModel(db.Model):
         Args:
              user_id: The id of the user.
         """
-        return cls.query.filter_by(user_id=user_id).all()
+        return cls.query_by_user_id(user_id).all()
+
+    @classmethod
+    def query_by_user_id(cls, user_id):
+        """Returns a query of the task comments that have the passed user id.
+        Args:
+             user_id: The id of the user.
+        """
+        return cls.query.filter_by(user_id=user_id)
 
     def modify_comment(self, comment):
         """Changes the comment and the modification date.
@@ -1,6 +1,10 @@
 from enum import unique, Enum
 
+from flask import current_app
+from sqlalchemy import event
+
 from app.database.db_types.JsonCustomType import JsonCustomType
+from app.database.models.task import TaskModel
 from app.database.sqlalchemy_extension import db
 from datetime import date
 
@@ -10,7 +14,11 @@ class TasksListModel(db.Model):
 
     Attributes:
         id: Id of the list of tasks.
+        task_rows: relationship between TaskModel and tasks_list, ordered by task id.
         tasks: A list of tasks, using JSON format.
+        legacy_tasks: copy of the tasks in the JSON column read by the instances
+            of the previous release, kept in sync while TASKS_LEGACY_COLUMN_WRITES
+            is set.
         next_task_id: Id of the next task added to the list of tasks.
     """
 
@@ -18,7 +26,13 @@ class TasksListModel(db.Model):
     __table_args__ = {"extend_existing": True}
 
     id = db.Column(db.Integer, primary_key=True)
-    tasks = db.Column(JsonCustomType)
+    task_rows = db.relationship(
+        TaskModel,
+        order_by=TaskModel.task_id,
+        cascade="all, delete-orphan",
+        backref="tasks_list",
+    )
+    legacy_tasks = db.deferred(db.Column("tasks", JsonCustomType))
     next_task_id = db.Column(db.Integer)
 
     def __init__(self, tasks: "TasksListModel" = None):
@@ -32,15 +46,22 @@ class TasksListModel(db.Model):
         """
 
         if tasks is None:
-            self.tasks = []
+            self.task_rows = []
+            self.legacy_tasks = get_new_legacy_tasks()
             self.next_task_id = 1
         else:
             if isinstance(tasks, list):
-                self.tasks = []
+                self.task_rows = []
+                self.legacy_tasks = get_new_legacy_tasks()
                 self.next_task_id = len(tasks) + 1
             else:
                 raise ValueError(TypeError)
 
+    @property
+    def tasks(self):
+        """The list of tasks, using JSON format."""
+        return [task.json() for task in self.task_rows]
+
     def add_task(
         self, description: str, created_at: date, is_done=False, completed_at=None
     ) -> None:
@@ -53,15 +74,20 @@ class TasksListModel(db.Model):
             completed_at: Date on which task is completed.
         """
 
-        task = {
-            TasksFields.ID.value: self.next_task_id,
-            TasksFields.DESCRIPTION.value: description,
-            TasksFields.IS_DONE.value: is_done,
-            TasksFields.CREATED_AT.value: created_at,
-            TasksFields.COMPLETED_AT.value: completed_at,
-        }
+        task = TaskModel(
+            task_id=self.next_task_id,
+            description=description,
+            created_at=created_at,
+            is_done=is_done,
+            completed_at=completed_at,
+        )
         self.next_task_id += 1
-        self.tasks = self.tasks + [task]
+        if self._has_task_rows_in_memory():
+            self.task_rows.append(task)
+        else:
+            # avoids loading every task of the list just to add a new one
+            task.tasks_list_id = self.id
+            db.session.add(task)
 
     def delete_task(self, task_id: int) -> None:
         """Deletes a task from the list of tasks.
@@ -70,11 +96,12 @@ class TasksListModel(db.Model):
             task_id: Id of the task to be deleted.
         """
 
-        new_list = list(
-            filter(lambda task: task[TasksFields.ID.value] != task_id, self.tasks)
-        )
-
-        self.tasks = new_list
+        task = self._find_task_row(task_id)
+        if task is not None:
+            if self._has_task_rows_in_memory():
+                self.task_rows.remove(task)
+            else:
+                db.session.delete(task)
         self.save_to_db()
 
     def update_task(
@@ -94,25 +121,17 @@ class TasksListModel(db.Model):
             completed_at: Date on which task is completed.
         """
 
-        new_list = []
-        for task in self.tasks:
-            if task[TasksFields.ID.value] == task_id:
-                new_task = task.copy()
-                if description is not None:
-                    new_task[TasksFields.DESCRIPTION.value] = description
-
-                if is_done is not None:
-                    new_task[TasksFields.IS_DONE.value] = is_done
-
-                if completed_at is not None:
-                    new_task[TasksFields.COMPLETED_AT.value] = completed_at
+        task = self._find_task_row(task_id)
+        if task is not None:
+            if description is not None:
+                task.description = description
 
-                new_list = new_list + [new_task]
-                continue
+            if is_done is not None:
+                task.is_done = is_done
 
-            new_list = new_list + [task]
+            if completed_at is not None:
+                task.completed_at = completed_at
 
-        self.tasks = new_list
         self.save_to_db()
 
     def find_task_by_id(self, task_id: int):
@@ -124,13 +143,32 @@ class TasksListModel(db.Model):
         Returns:
             The task instance.
         """
-        task = list(
-            filter(lambda task: task[TasksFields.ID.value] == task_id, self.tasks)
-        )
-        if len(task) == 0:
+        task = self._find_task_row(task_id)
+        if task is None:
             return None
         else:
-            return task[0]
+            return task.json()
+
+    def _find_task_row(self, task_id: int):
+        """Returns the TaskModel with the specified id.
+
+        Only the requested row is read, unless the tasks are already loaded
+        or the list of tasks is not saved yet.
+
+        Args:
+            task_id: Id of the task.
+        """
+        if self._has_task_rows_in_memory():
+            for task in self.task_rows:
+                if task.task_id == task_id:
+                    return task
+            return None
+
+        return TaskModel.find_by_id(self.id, task_id)
+
+    def _has_task_rows_in_memory(self) -> bool:
+        """Returns True if the list of tasks is not saved yet or its tasks are loaded."""
+        return self.id is None or "task_rows" in self.__dict__
 
     def is_empty(self) -> bool:
         """Checks if the list of tasks is empty.
@@ -139,7 +177,7 @@ class TasksListModel(db.Model):
             Boolean; True if the task is empty, False otherwise.
         """
 
-        return len(self.tasks) == 0
+        return len(self.task_rows) == 0
 
     def json(self):
         """Creates json object of the attributes of list of tasks.
@@ -206,3 +244,54 @@ class TasksFields(Enum):
     def values(self):
         """Returns a list containing a task."""
         return list(map(str, self))
+
+
+# while TASKS_LEGACY_COLUMN_WRITES is set during the upgrade, keep the legacy
+# tasks column in sync with every write of the tasks, as instances of the
+# previous release may still read and append to it
+
+
+def is_writing_legacy_tasks() -> bool:
+    return current_app.config.get("TASKS_LEGACY_COLUMN_WRITES", False)
+
+
+def get_new_legacy_tasks():
+    """Returns the legacy tasks of a new list, None when they are not written."""
+    return [] if is_writing_legacy_tasks() else None
+
+
+@event.listens_for(db.session, "after_flush")
+def write_legacy_tasks(session, flush_context):
+    if not is_writing_legacy_tasks():
+        return
+
+    tasks_list_ids = {
+        task.tasks_list_id
+        for task in set(session.new) | set(session.dirty) | set(session.deleted)
+        if isinstance(task, TaskModel) and task.tasks_list_id is not None
+    }
+    if not tasks_list_ids:
+        return
+
+    connection = session.connection()
+    tasks_by_list = {tasks_list_id: [] for tasks_list_id in tasks_list_ids}
+    for task in connection.execute(
+        TaskModel.__table__.select()
+        .where(TaskModel.tasks_list_id.in_(tasks_list_ids))
+        .order_by(TaskModel.tasks_list_id, TaskModel.task_id)
+    ):
+        tasks_by_list[task.tasks_list_id].append(
+            {
+                TasksFields.ID.value: task.task_id,
+                TasksFields.DESCRIPTION.value: task.description,
+                TasksFields.IS_DONE.value: task.is_done,
+                TasksFields.CREATED_AT.value: task.created_at,
+                TasksFields.COMPLETED_AT.value: task.completed_at,
+            }
+        )
+
+    table = TasksListModel.__table__
+    for tasks_list_id, tasks in tasks_by_list.items():
+        connection.execute(
+            table.update().where(table.c.id == tasks_list_id).values(tasks=tasks)
+        )
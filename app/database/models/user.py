@@ -1,6 +1,11 @@
-from werkzeug.security import generate_password_hash, check_password_hash
 import time
 from app.database.sqlalchemy_extension import db
+from app.utils.password_hashing_utils import (
+    MAX_PASSWORD_HASH_LENGTH,
+    get_password_hashing_policy,
+    hash_password,
+    verify_password,
+)
 
 
 class UserModel(db.Model):
@@ -16,7 +21,15 @@ class UserModel(db.Model):
 
     # Specifying database table used for UserModel
     __tablename__ = "users"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # serves the purge of unverified users
+        db.Index(
+            "ix_users_is_email_verified_registration_date",
+            "is_email_verified",
+            "registration_date",
+        ),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -26,7 +39,7 @@ class UserModel(db.Model):
     email = db.Column(db.String(254), unique=True)
 
     # security
-    password_hash = db.Column(db.String(100))
+    password_hash = db.Column(db.String(MAX_PASSWORD_HASH_LENGTH))
 
     # registration
     registration_date = db.Column(db.Float)
@@ -137,14 +150,39 @@ class UserModel(db.Model):
         """Returns a boolean if the Usermodel is empty or not."""
         return cls.query.first() is None
 
+    @classmethod
+    def lock_rows(cls, user_ids) -> None:
+        """Locks the rows of the users until the end of the current transaction.
+
+        The rows are locked in id order so concurrent callers cannot deadlock.
+        SQLite has no row locks, the write transaction started instead
+        serializes the callers.
+        Args:
+            user_ids: The ids of the users to lock.
+        """
+        user_ids = sorted(set(user_ids))
+        if db.engine.dialect.name == "sqlite":
+            table = cls.__table__
+            db.session.execute(
+                table.update().where(table.c.id.in_(user_ids)).values(id=table.c.id)
+            )
+        else:
+            db.session.query(cls.id).filter(cls.id.in_(user_ids)).order_by(
+                cls.id
+            ).with_for_update().all()
+
     def set_password(self, password_plain_text: str) -> None:
         """Sets user password when they create an account or when they are changing their password."""
-        self.password_hash = generate_password_hash(password_plain_text)
+        self.password_hash = hash_password(password_plain_text)
 
     # checks if password is the same, using its hash
     def check_password(self, password_plain_text: str) -> bool:
         """Returns a boolean if password is the same as it hash or not."""
-        return check_password_hash(self.password_hash, password_plain_text)
+        return verify_password(self.password_hash, password_plain_text)
+
+    def is_password_hash_outdated(self) -> bool:
+        """Returns if the password hash was made with another hashing policy."""
+        return get_password_hashing_policy().needs_rehash(self.password_hash)
 
     def save_to_db(self) -> None:
         """Adds a user to the database."""
@@ -0,0 +1,31 @@
+from app.database.sqlalchemy_extension import db
+
+
+class UserSearchGramModel(db.Model):
+    """Inverted index entry used to search users by name and username.
+
+    Each row maps one trigram (three consecutive lowercase characters) of a
+    user's name or username to that user.
+
+    Attributes:
+        gram: string with the trigram.
+        user_id: integer indicates the id of the indexed user.
+    """
+
+    # Specifying database table used for UserSearchGramModel
+    __tablename__ = "users_search_grams"
+    __table_args__ = (
+        db.Index("ix_users_search_grams_user_id", "user_id"),
+        {"extend_existing": True},
+    )
+
+    gram = db.Column(db.String(3), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+
+    def __init__(self, gram, user_id):
+        self.gram = gram
+        self.user_id = user_id
+
+    def __repr__(self):
+        """Returns the trigram and the id of the indexed user."""
+        return f"Gram '{self.gram}' of user with id = {self.user_id}"
@@ -0,0 +1,74 @@
+from app.database.db_types.JsonCustomType import JsonCustomType
+from app.database.sqlalchemy_extension import db
+
+
+class UserStatisticsModel(db.Model):
+    """Data Model representation of the statistics shown in a user's home.
+
+    The counters are maintained incrementally whenever a mentorship relation of
+    the user is created, changes state or is deleted.
+
+    Attributes:
+        user_id: integer primary key, id of the user these statistics belong to.
+        pending_requests: integer number of relations in PENDING state.
+        accepted_requests: integer number of relations in ACCEPTED state.
+        rejected_requests: integer number of relations in REJECTED state.
+        completed_relations: integer number of relations in COMPLETED state.
+        cancelled_relations: integer number of relations in CANCELLED state.
+        achievements: up to three completed tasks of the user, using JSON format.
+        is_achievements_outdated: boolean indicating that the achievements have to be recomputed.
+        version: integer incremented whenever the data shown to the user changes.
+    """
+
+    # Specifying database table used for UserStatisticsModel
+    __tablename__ = "users_statistics"
+    __table_args__ = {"extend_existing": True}
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+
+    pending_requests = db.Column(db.Integer, nullable=False, default=0)
+    accepted_requests = db.Column(db.Integer, nullable=False, default=0)
+    rejected_requests = db.Column(db.Integer, nullable=False, default=0)
+    completed_relations = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_relations = db.Column(db.Integer, nullable=False, default=0)
+
+    achievements = db.Column(JsonCustomType)
+    is_achievements_outdated = db.Column(db.Boolean, nullable=False, default=True)
+
+    # stamps the relations, tasks and profiles the user's responses are built from
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.pending_requests = 0
+        self.accepted_requests = 0
+        self.rejected_requests = 0
+        self.completed_relations = 0
+        self.cancelled_relations = 0
+        self.achievements = []
+        self.is_achievements_outdated = True
+
+    def json(self):
+        """Returns the statistics as a json object."""
+        return {
+            "pending_requests": self.pending_requests,
+            "accepted_requests": self.accepted_requests,
+            "rejected_requests": self.rejected_requests,
+            "completed_relations": self.completed_relations,
+            "cancelled_relations": self.cancelled_relations,
+            "achievements": self.achievements,
+        }
+
+    def __repr__(self):
+        """Returns the id of the user these statistics belong to."""
+        return f"Statistics of user with id = {self.user_id}"
+
+    @classmethod
+    def find_version(cls, user_id: int) -> int:
+        """Returns the version of the data shown to a user, or None."""
+        return db.session.query(cls.version).filter(cls.user_id == user_id).scalar()
+
+    def save_to_db(self) -> None:
+        """Saves the statistics to the database."""
+        db.session.add(self)
+        db.session.commit()
@@ -0,0 +1,188 @@
+"""
+This module defines the search backends used to find users by
+name or username.
+
+Available backends (selected with the USER_SEARCH_BACKEND setting):
+- like: case insensitive substring match, scans the users table
+- trigram: inverted index of trigrams kept in the users_search_grams table,
+  filled for the existing users by the b3d9f1e6a2c4 migration
+- pg_trgm: substring match served by Postgres pg_trgm GIN indexes
+- auto: pg_trgm on Postgres when the extension is installed, trigram otherwise
+"""
+from typing import Set
+
+from flask import current_app
+from sqlalchemy import event, func, inspect
+
+from app.database.models.user import UserModel
+from app.database.models.user_search_gram import UserSearchGramModel
+from app.database.sqlalchemy_extension import db
+
+GRAM_SIZE = 3
+SEARCHABLE_FIELDS = ("name", "username")
+
+
+def get_grams(text: str) -> Set[str]:
+    """Returns the set of lowercase trigrams contained in the given text."""
+    if not text:
+        return set()
+    text = text.lower()
+    return {text[i : i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def get_user_grams(user: UserModel) -> Set[str]:
+    """Returns the trigrams of all the searchable fields of a user."""
+    grams = set()
+    for field in SEARCHABLE_FIELDS:
+        grams |= get_grams(getattr(user, field))
+    return grams
+
+
+def contains_search_query(search_query: str):
+    """Returns the substring predicate matching a user's name or username."""
+    search_query = search_query.lower()
+    return func.lower(UserModel.name).contains(search_query) | func.lower(
+        UserModel.username
+    ).contains(search_query)
+
+
+class LikeUserSearchBackend:
+    """Searches users with a substring match over the users table."""
+
+    name = "like"
+    maintains_index = False
+
+    def filter(self, query, search_query: str):
+        """Restricts the passed UserModel query to users matching search_query."""
+        return query.filter(contains_search_query(search_query))
+
+
+class TrigramUserSearchBackend(LikeUserSearchBackend):
+    """Searches users through the users_search_grams inverted index.
+
+    Only users owning every trigram of the search query are candidates, the
+    substring predicate is then applied to this small set of users to discard
+    false positives. Queries shorter than a trigram fall back to a scan.
+    """
+
+    name = "trigram"
+    maintains_index = True
+
+    def filter(self, query, search_query: str):
+        grams = get_grams(search_query)
+        if not grams:
+            return super().filter(query, search_query)
+
+        candidates = (
+            db.session.query(UserSearchGramModel.user_id)
+            .filter(UserSearchGramModel.gram.in_(grams))
+            .group_by(UserSearchGramModel.user_id)
+            .having(func.count(UserSearchGramModel.gram) == len(grams))
+        )
+        return query.filter(
+            UserModel.id.in_(candidates.subquery()),
+            contains_search_query(search_query),
+        )
+
+    @staticmethod
+    def index_user(connection, user: UserModel) -> None:
+        """Replaces the index entries of a user using the given connection."""
+        table = UserSearchGramModel.__table__
+        connection.execute(table.delete().where(table.c.user_id == user.id))
+        grams = get_user_grams(user)
+        if grams:
+            connection.execute(
+                table.insert(), [{"gram": gram, "user_id": user.id} for gram in grams]
+            )
+
+    @staticmethod
+    def unindex_user(connection, user: UserModel) -> None:
+        """Removes the index entries of a user using the given connection."""
+        table = UserSearchGramModel.__table__
+        connection.execute(table.delete().where(table.c.user_id == user.id))
+
+    def rebuild_index(self) -> None:
+        """Rebuilds the whole index, e.g. after switching from another backend."""
+        connection = db.session.connection()
+        connection.execute(UserSearchGramModel.__table__.delete())
+        for user in UserModel.query.yield_per(1000):
+            self.index_user(connection, user)
+        db.session.commit()
+
+
+class PgTrgmUserSearchBackend(LikeUserSearchBackend):
+    """Searches users with a substring match served by pg_trgm GIN indexes.
+
+    The indexes over lower(name) and lower(username) are built by the
+    b3d9f1e6a2c4 migration.
+    """
+
+    name = "pg_trgm"
+    maintains_index = False
+
+
+BACKENDS = {
+    LikeUserSearchBackend.name: LikeUserSearchBackend,
+    TrigramUserSearchBackend.name: TrigramUserSearchBackend,
+    PgTrgmUserSearchBackend.name: PgTrgmUserSearchBackend,
+}
+
+# backends already resolved, by database url
+_backends = {}
+
+
+def is_pg_trgm_available() -> bool:
+    """Returns True if the database is Postgres with pg_trgm installed."""
+    if db.engine.dialect.name != "postgresql":
+        return False
+    with db.engine.connect() as connection:
+        installed = connection.execute(
+            "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+        ).scalar()
+    return installed is not None
+
+
+def get_user_search_backend():
+    """Returns the user search backend configured for the current app."""
+    database_uri = current_app.config["SQLALCHEMY_DATABASE_URI"]
+    backend_name = current_app.config.get("USER_SEARCH_BACKEND", "auto")
+    key = (database_uri, backend_name)
+
+    if key not in _backends:
+        if backend_name == "auto":
+            if is_pg_trgm_available():
+                backend_name = PgTrgmUserSearchBackend.name
+            else:
+                backend_name = TrigramUserSearchBackend.name
+        if backend_name not in BACKENDS:
+            raise ValueError(
+                "The USER_SEARCH_BACKEND config value has to be within these "
+                f"values: auto, {', '.join(BACKENDS)}."
+            )
+        _backends[key] = BACKENDS[backend_name]()
+
+    return _backends[key]
+
+
+# keep the trigram index in sync with every write of a user
+
+
+@event.listens_for(UserModel, "after_insert")
+def index_inserted_user(mapper, connection, target):
+    if get_user_search_backend().maintains_index:
+        TrigramUserSearchBackend.index_user(connection, target)
+
+
+@event.listens_for(UserModel, "after_update")
+def index_updated_user(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in SEARCHABLE_FIELDS):
+        return
+    if get_user_search_backend().maintains_index:
+        TrigramUserSearchBackend.index_user(connection, target)
+
+
+@event.listens_for(UserModel, "before_delete")
+def unindex_deleted_user(mapper, connection, target):
+    if get_user_search_backend().maintains_index:
+        TrigramUserSearchBackend.unindex_user(connection, target)
@@ -0,0 +1,261 @@
+"""
+This module keeps the users_statistics table in sync with the
+mentorship relations and tasks of each user.
+
+The relation counters are incremented and decremented in the same
+transaction that creates, updates or deletes a relation, so reading
+the statistics of a user is a single primary key lookup. The
+achievements are only flagged as outdated when a task changes
+and are recomputed on the next read.
+
+The version of a user's statistics is incremented by every write of
+their relations, of the tasks of these relations, of their profile and
+of the profiles of the other users of their relations. It stamps the
+data of the user's responses, see app.utils.etag_utils.
+"""
+from typing import Iterable
+
+from sqlalchemy import event, func, inspect, or_, select
+from sqlalchemy.exc import IntegrityError
+
+from app.database.models.mentorship_relation import MentorshipRelationModel
+from app.database.models.task import TaskModel
+from app.database.models.user import UserModel
+from app.database.models.user_statistics import UserStatisticsModel
+from app.database.sqlalchemy_extension import db
+from app.utils.enum_utils import MentorshipRelationState
+
+MAX_ACHIEVEMENTS = 3
+
+# counter of users_statistics matching each relation state
+STATE_COUNTERS = {
+    MentorshipRelationState.PENDING: "pending_requests",
+    MentorshipRelationState.ACCEPTED: "accepted_requests",
+    MentorshipRelationState.REJECTED: "rejected_requests",
+    MentorshipRelationState.COMPLETED: "completed_relations",
+    MentorshipRelationState.CANCELLED: "cancelled_relations",
+}
+
+
+def update_counters(connection, user_ids: Iterable[int], increments) -> None:
+    """Adds the increments, by relation state, to the counters of the users."""
+    table = UserStatisticsModel.__table__
+    values = {
+        STATE_COUNTERS[state]: table.c[STATE_COUNTERS[state]] + increment
+        for state, increment in increments.items()
+        if increment
+    }
+    if values:
+        values["version"] = table.c.version + 1
+        connection.execute(
+            table.update().where(table.c.user_id.in_(list(user_ids))).values(values)
+        )
+
+
+def mark_users_achievements_outdated(connection, user_ids: Iterable[int]) -> None:
+    """Flags the achievements of the users as outdated."""
+    table = UserStatisticsModel.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.user_id.in_(list(user_ids)))
+        .values(is_achievements_outdated=True, version=table.c.version + 1)
+    )
+
+
+def outdate_users_data(connection, condition) -> None:
+    """Increments the version of the statistics matching the condition."""
+    table = UserStatisticsModel.__table__
+    connection.execute(
+        table.update().where(condition).values(version=table.c.version + 1)
+    )
+
+
+def mark_achievements_outdated(connection, tasks_list_id: int) -> None:
+    """Flags the achievements of the users sharing a tasks list as outdated."""
+    table = UserStatisticsModel.__table__
+    relations = MentorshipRelationModel.__table__
+    connection.execute(
+        table.update()
+        .where(
+            or_(
+                table.c.user_id.in_(
+                    select([relations.c.mentor_id]).where(
+                        relations.c.tasks_list_id == tasks_list_id
+                    )
+                ),
+                table.c.user_id.in_(
+                    select([relations.c.mentee_id]).where(
+                        relations.c.tasks_list_id == tasks_list_id
+                    )
+                ),
+            )
+        )
+        .values(is_achievements_outdated=True, version=table.c.version + 1)
+    )
+
+
+def count_relations(user_id: int):
+    """Returns the number of relations of a user, by state."""
+    relations_count = (
+        db.session.query(
+            MentorshipRelationModel.state, func.count(MentorshipRelationModel.id)
+        )
+        .filter(
+            (MentorshipRelationModel.mentor_id == user_id)
+            | (MentorshipRelationModel.mentee_id == user_id)
+        )
+        .group_by(MentorshipRelationModel.state)
+        .all()
+    )
+    return dict(relations_count)
+
+
+def query_achievements(user_id: int):
+    """Returns a query of the first completed tasks of the user's relations,
+    as mentor first."""
+    return (
+        TaskModel.query.join(
+            MentorshipRelationModel,
+            MentorshipRelationModel.tasks_list_id == TaskModel.tasks_list_id,
+        )
+        .filter(
+            (MentorshipRelationModel.mentor_id == user_id)
+            | (MentorshipRelationModel.mentee_id == user_id),
+            TaskModel.is_done.is_(True),
+        )
+        .order_by(
+            MentorshipRelationModel.mentor_id != user_id,
+            MentorshipRelationModel.id,
+            TaskModel.task_id,
+        )
+        .limit(MAX_ACHIEVEMENTS)
+    )
+
+
+def find_achievements(user_id: int):
+    """Returns the first completed tasks of the user's relations, as mentor first."""
+    return [task.json() for task in query_achievements(user_id)]
+
+
+def refresh_user_statistics(user_id: int, statistics: UserStatisticsModel = None):
+    """Returns the statistics of a user, creating or completing them if needed.
+
+    The statistics of every user are created with the user, or by the
+    a4f6b8d2c9e1 migration for the users created before them, so they are
+    only missing here if their row was removed.
+
+    Args:
+        user_id: The id of the user.
+        statistics: The statistics already read for this user, if any.
+    """
+    is_modified = False
+
+    if statistics is None:
+        statistics = UserStatisticsModel(user_id)
+        for state, count in count_relations(user_id).items():
+            setattr(statistics, STATE_COUNTERS[state], count)
+        try:
+            # only the insert is rolled back, not the pending changes of the caller
+            with db.session.begin_nested():
+                db.session.add(statistics)
+        except IntegrityError:
+            # created by a concurrent request since they were read
+            statistics = UserStatisticsModel.query.get(user_id)
+        else:
+            db.session.commit()
+
+    if statistics.is_achievements_outdated:
+        statistics.achievements = find_achievements(user_id)
+        statistics.is_achievements_outdated = False
+        is_modified = True
+
+    if is_modified:
+        statistics.save_to_db()
+
+    return statistics
+
+
+# keep the statistics in sync with every write of a user, relation or tasks list
+
+
+@event.listens_for(UserModel, "after_insert")
+def create_user_statistics(mapper, connection, target):
+    connection.execute(
+        UserStatisticsModel.__table__.insert().values(
+            user_id=target.id,
+            pending_requests=0,
+            accepted_requests=0,
+            rejected_requests=0,
+            completed_relations=0,
+            cancelled_relations=0,
+            achievements=[],
+            is_achievements_outdated=False,
+        )
+    )
+
+
+@event.listens_for(UserModel, "before_delete")
+def delete_user_statistics(mapper, connection, target):
+    table = UserStatisticsModel.__table__
+    connection.execute(table.delete().where(table.c.user_id == target.id))
+
+
+@event.listens_for(MentorshipRelationModel, "after_insert")
+def count_inserted_relation(mapper, connection, target):
+    user_ids = (target.mentor_id, target.mentee_id)
+    update_counters(connection, user_ids, {target.state: 1})
+    mark_users_achievements_outdated(connection, user_ids)
+
+
+@event.listens_for(UserModel, "after_update")
+def outdate_data_of_updated_user(mapper, connection, target):
+    # the relations of the other users show the name and photo of this user
+    table = UserStatisticsModel.__table__
+    relations = MentorshipRelationModel.__table__
+    outdate_users_data(
+        connection,
+        or_(
+            table.c.user_id == target.id,
+            table.c.user_id.in_(
+                select([relations.c.mentor_id]).where(
+                    relations.c.mentee_id == target.id
+                )
+            ),
+            table.c.user_id.in_(
+                select([relations.c.mentee_id]).where(
+                    relations.c.mentor_id == target.id
+                )
+            ),
+        ),
+    )
+
+
+@event.listens_for(MentorshipRelationModel, "after_update")
+def count_updated_relation(mapper, connection, target):
+    history = inspect(target).attrs["state"].history
+    previous_state = history.deleted[0] if history.deleted else target.state
+    if previous_state == target.state:
+        table = UserStatisticsModel.__table__
+        outdate_users_data(
+            connection, table.c.user_id.in_((target.mentor_id, target.mentee_id))
+        )
+        return
+    update_counters(
+        connection,
+        (target.mentor_id, target.mentee_id),
+        {previous_state: -1, target.state: 1},
+    )
+
+
+@event.listens_for(MentorshipRelationModel, "after_delete")
+def count_deleted_relation(mapper, connection, target):
+    user_ids = (target.mentor_id, target.mentee_id)
+    update_counters(connection, user_ids, {target.state: -1})
+    mark_users_achievements_outdated(connection, user_ids)
+
+
+@event.listens_for(TaskModel, "after_insert")
+@event.listens_for(TaskModel, "after_update")
+@event.listens_for(TaskModel, "after_delete")
+def outdate_achievements_of_changed_task(mapper, connection, target):
+    mark_achievements_outdated(connection, target.tasks_list_id)
@@ -11,12 +11,24 @@ EMAIL_INPUT_BY_USER_IS_INVALID = {"message": "Your email is invalid."}
 USERNAME_INPUT_BY_USER_IS_INVALID = {"message": "Your username is invalid."}
 NEW_USERNAME_INPUT_BY_USER_IS_INVALID = {"message": "Your new username is" " invalid."}
 TOKEN_IS_INVALID = {"message": "The token is invalid!"}
+TOKEN_HAS_BEEN_REVOKED = {"message": "The token has been revoked!"}
 USER_ID_IS_NOT_VALID = {"message": "User id is not valid."}
 FIELD_NEED_MENTORING_IS_NOT_VALID = {"message": "Field need_mentoring is" " not valid."}
 FIELD_AVAILABLE_TO_MENTOR_IS_INVALID = {
     "message": "Field available_to_mentor" " is not valid."
 }
 INVALID_INPUT = {"message": "Invalid input."}
+INVALID_CURSOR = {"message": "The pagination cursor is invalid."}
+INVALID_USERS_PER_PAGE = {
+    "message": "The number of users per page has to be at least 1."
+}
+INVALID_RELATIONS_ORDER = {
+    "message": "The order of the mentorship relations has to be either "
+    "'id' or 'creation_date_desc'."
+}
+INVALID_RELATIONS_LIMIT = {
+    "message": "The limit of mentorship relations has to be at least 1."
+}
 PASSWORD_INPUT_BY_USER_HAS_INVALID_LENGTH = {
     "message": f"The password field has to be longer than {PASSWORD_MIN_LENGTH - 1} characters and shorter than {PASSWORD_MAX_LENGTH + 1} characters."
 }
@@ -147,6 +159,11 @@ NOT_IN_MENTORED_RELATION_CURRENTLY = {
 USER_IS_INVOLVED_IN_A_MENTORSHIP_RELATION = {
     "message": "You are currently" " involved in a" " mentorship relation."
 }
+MENTORSHIP_RELATION_WAS_MODIFIED_CONCURRENTLY = {
+    "message": "The mentorship relation was"
+    " modified by another request,"
+    " please try again."
+}
 USER_NOT_INVOLVED_IN_THIS_MENTOR_RELATION = {
     "message": "You are not involved" " in this mentorship relation."
 }
@@ -215,6 +232,12 @@ TOKEN_SENT_TO_EMAIL_OF_USER = {"message": "Token sent to the user's email."}
 EMAIL_VERIFICATION_MESSAGE = {
     "message": "Check your email, a new verification" " email was sent."
 }
+TOO_MANY_FAILED_LOGINS = {
+    "message": "Too many failed login attempts. Please, try again later."
+}
+PASSWORD_HASHER_IS_BUSY = {
+    "message": "Too many passwords are being checked. Please, try again later."
+}
 
 # Success messages
 TASK_WAS_ALREADY_ACHIEVED = {"message": "Task was already achieved."}
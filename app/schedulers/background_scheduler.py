@@ -1,4 +1,9 @@
+import os
+import socket
+from functools import wraps
+
 from apscheduler.schedulers.background import BackgroundScheduler
+from flask import Flask
 
 import config
 from app.schedulers.complete_mentorship_cron_job import (
@@ -8,21 +13,67 @@ from app.schedulers.delete_unverified_users_cron_job import delete_unverified_us
 
 scheduler = BackgroundScheduler()
 
+SCHEDULER_MODES = ("leader", "all", "off")
+
+# identifies this process when acquiring the lease of a job
+SCHEDULER_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
 
-def init_schedulers():
-    """Runs all schedulers"""
-    init_complete_relation_scheduler()
-    init_delete_unverified_users_scheduler()
+def init_schedulers(app: Flask):
+    """Runs all schedulers, according to the SCHEDULER_MODE of the app"""
+    mode = app.config.get("SCHEDULER_MODE", "leader")
+    if mode not in SCHEDULER_MODES:
+        raise ValueError(
+            "The SCHEDULER_MODE config value has to be within these values: "
+            f"{', '.join(SCHEDULER_MODES)}."
+        )
+    if mode == "off":
+        return
+
+    init_complete_relation_scheduler(leader_only=mode == "leader")
+    init_delete_unverified_users_scheduler(leader_only=mode == "leader")
     if not scheduler.running:
         scheduler.start()
 
 
-def init_complete_relation_scheduler():
+def run_on_leader(job_id: str, job):
+    """
+    This function wraps a job so that, when every worker schedules it,
+    only the worker acquiring the lease of the job runs it.
+    The lease is kept for SCHEDULER_LEASE_DURATION seconds, so workers
+    firing the same job a moment later skip it, and another worker takes
+    the job over once the lease expires, e.g. if the leader died.
+    :param job_id: id of the scheduled job, used as the lease name
+    :param job: function running the job
+    :return: function running the job if this process holds its lease
+    """
+
+    @wraps(job)
+    def leader_job():
+        from run import application
+
+        with application.app_context():
+            from app.database.models.scheduler_lease import SchedulerLeaseModel
+
+            is_leader = SchedulerLeaseModel.try_acquire(
+                job_id,
+                SCHEDULER_OWNER,
+                application.config["SCHEDULER_LEASE_DURATION"],
+            )
+        if is_leader:
+            job()
+
+    return leader_job
+
+
+def init_complete_relation_scheduler(leader_only: bool = True):
     # This cron job runs every day at 23:59h
     # Purpose: complete overdue accepted mentorship relations
+    job_id = "complete_mentorship_relations_cron"
+    job = complete_overdue_mentorship_relations_job
     scheduler.add_job(
-        id="complete_mentorship_relations_cron",
-        func=complete_overdue_mentorship_relations_job,
+        id=job_id,
+        func=run_on_leader(job_id, job) if leader_only else job,
         trigger="cron",
         hour=23,
         minute=59,
@@ -38,12 +89,14 @@ def init_complete_relation_scheduler():
     #                   replace_existing=True)
 
 
-def init_delete_unverified_users_scheduler():
+def init_delete_unverified_users_scheduler(leader_only: bool = True):
     threshold_days = config.BaseConfig.UNVERIFIED_USER_THRESHOLD // 86400
 
+    job_id = "delete_unverified_users_cron"
+    job = delete_unverified_users_job
     scheduler.add_job(
-        id="delete_unverified_users_cron",
-        func=delete_unverified_users_job,
+        id=job_id,
+        func=run_on_leader(job_id, job) if leader_only else job,
         trigger="cron",
         day=threshold_days,
         replace_existing=True,
@@ -1,27 +1,123 @@
+from collections import Counter
 from datetime import datetime
 
+# number of relations completed per transaction
+COMPLETE_RELATIONS_CHUNK_SIZE = 1000
 
-def complete_overdue_mentorship_relations_job():
+
+def query_overdue_mentorship_relations(
+    current_date_timestamp: float, last_id: int, chunk_size: int
+):
     """
-    This function iterates of all the mentorship requests and
-    checks if the end date of the relation has passed the current date
-    and is in the ACCEPTED state
-    if True then marks the relation as COMPLETED, if False does nothing
+    This function returns the query locking the next chunk of ACCEPTED
+    mentorship relations whose end date has passed the current date
+    :param current_date_timestamp: relations ending before it are overdue
+    :param last_id: id of the last relation of the previous chunk
+    :param chunk_size: maximum number of relations of the chunk
+    :return: query of the id, mentor id and mentee id of the relations
     """
-    from run import application
+    from app.database.models.mentorship_relation import MentorshipRelationModel
+    from app.database.sqlalchemy_extension import db
+    from app.utils.enum_utils import MentorshipRelationState
 
-    with application.app_context():
-        from app.utils.enum_utils import MentorshipRelationState
-        from app.database.models.mentorship_relation import MentorshipRelationModel
-
-        all_relations = filter(
-            lambda relation: relation.state == MentorshipRelationState.ACCEPTED
-            and relation.end_date < current_date_timestamp,
-            MentorshipRelationModel.query.all(),
+    return (
+        db.session.query(
+            MentorshipRelationModel.id,
+            MentorshipRelationModel.mentor_id,
+            MentorshipRelationModel.mentee_id,
+        )
+        .filter(
+            MentorshipRelationModel.state == MentorshipRelationState.ACCEPTED,
+            MentorshipRelationModel.end_date < current_date_timestamp,
+            MentorshipRelationModel.id > last_id,
         )
+        .order_by(MentorshipRelationModel.id)
+        .limit(chunk_size)
+        .with_for_update()
+    )
 
+
+def complete_overdue_mentorship_relations(
+    current_date_timestamp: float = None,
+    chunk_size: int = COMPLETE_RELATIONS_CHUNK_SIZE,
+) -> int:
+    """
+    This function marks as COMPLETED the ACCEPTED mentorship relations
+    whose end date has passed the current date.
+    The relations are completed in chunks of ordered ids, with a set based
+    UPDATE and one commit per chunk, so the job never loads every relation.
+    Since bulk updates skip the mapper events, the users statistics
+    counters of the mentor and mentee are adjusted in the same transaction.
+    Adjusting them also increments the version of the users' data, which is
+    part of the keys of their cached responses, so these responses are no
+    longer served once the transaction is committed.
+    :param current_date_timestamp: relations ending before it are completed,
+        defaults to now
+    :param chunk_size: maximum number of relations completed per transaction
+    :return: number of completed relations
+    """
+    from app.database.models.mentorship_relation import MentorshipRelationModel
+    from app.database.sqlalchemy_extension import db
+    from app.database.user_statistics import update_counters
+    from app.utils.enum_utils import MentorshipRelationState
+
+    if current_date_timestamp is None:
         current_date_timestamp = datetime.utcnow().timestamp()
 
-        for relation in all_relations:
-            relation.state = MentorshipRelationState.COMPLETED
-            relation.save_to_db()
+    completed_count = 0
+    last_id = 0
+    while True:
+        relations = query_overdue_mentorship_relations(
+            current_date_timestamp, last_id, chunk_size
+        ).all()
+        if not relations:
+            break
+        last_id = relations[-1].id
+
+        db.session.query(MentorshipRelationModel).filter(
+            MentorshipRelationModel.id.in_([relation.id for relation in relations])
+        ).update(
+            {
+                MentorshipRelationModel.state: MentorshipRelationState.COMPLETED,
+                # invalidates the state read by concurrent requests
+                MentorshipRelationModel.version: MentorshipRelationModel.version + 1,
+            },
+            synchronize_session=False,
+        )
+
+        # users sharing the same number of completed relations are updated together
+        completed_by_user = Counter()
+        for relation in relations:
+            completed_by_user.update({relation.mentor_id, relation.mentee_id})
+        users_by_count = {}
+        for user_id, count in completed_by_user.items():
+            users_by_count.setdefault(count, []).append(user_id)
+        connection = db.session.connection()
+        for count, user_ids in users_by_count.items():
+            update_counters(
+                connection,
+                user_ids,
+                {
+                    MentorshipRelationState.ACCEPTED: -count,
+                    MentorshipRelationState.COMPLETED: count,
+                },
+            )
+
+        db.session.commit()
+        completed_count += len(relations)
+
+    return completed_count
+
+
+def complete_overdue_mentorship_relations_job():
+    """
+    This function completes the overdue ACCEPTED mentorship relations
+    and logs how many relations were completed
+    """
+    from run import application
+
+    with application.app_context():
+        completed_count = complete_overdue_mentorship_relations()
+        application.logger.info(
+            f"Completed {completed_count} overdue mentorship relations"
+        )
@@ -2,26 +2,116 @@ import time
 
 import config
 
+# number of users deleted per transaction
+DELETE_USERS_BATCH_SIZE = 500
 
-def delete_unverified_users_job():
+
+def query_unverified_users(threshold_timestamp: float):
     """
-    This function iterates of all the users and
-    checks if the email is verified. If email is not verified
-    then we are checking whether the specified threshold has passed
-    since registration. If yes, user is deleted from the database.
+    This function returns the query of the ids of the users whose email
+    is not verified and who registered before the threshold
+    :param threshold_timestamp: users registered before it are selected
+    :return: query of the ids of the users
     """
+    from app.database.models.user import UserModel
+    from app.database.sqlalchemy_extension import db
 
-    from run import application
+    return db.session.query(UserModel.id).filter(
+        UserModel.is_email_verified.is_(False),
+        UserModel.registration_date < threshold_timestamp,
+    )
 
-    with application.app_context():
-        from app.database.models.user import UserModel
 
-        unverified_users = list(
-            UserModel.query.filter_by(is_email_verified=False).all()
+def query_unverified_users_batch(
+    threshold_timestamp: float, last_id: int, batch_size: int
+):
+    """
+    This function returns the query locking the next batch of ids of the
+    unverified users registered before the threshold
+    :param threshold_timestamp: users registered before it are selected
+    :param last_id: id of the last user of the previous batch
+    :param batch_size: maximum number of users of the batch
+    :return: query of the ids of the users
+    """
+    from app.database.models.user import UserModel
+
+    return (
+        query_unverified_users(threshold_timestamp)
+        .filter(UserModel.id > last_id)
+        .order_by(UserModel.id)
+        .limit(batch_size)
+        .with_for_update()
+    )
+
+
+def delete_unverified_users(
+    current_timestamp: float = None,
+    batch_size: int = DELETE_USERS_BATCH_SIZE,
+    dry_run: bool = False,
+) -> int:
+    """
+    This function deletes the users whose email is not verified and
+    who registered before the UNVERIFIED_USER_THRESHOLD.
+    The users are selected in SQL and deleted in batches of ordered ids,
+    with one commit per batch, so neither the memory nor the locks held
+    on the users table grow with the number of users to delete.
+    Since bulk deletes skip the mapper events, the search index entries and
+    statistics of the users are deleted in the same transaction.
+    :param current_timestamp: reference time of the threshold, defaults to now
+    :param batch_size: maximum number of users deleted per transaction
+    :param dry_run: if True only counts the users that would be deleted
+    :return: number of deleted users, or of users to delete on a dry run
+    """
+    from app.database.models.user import UserModel
+    from app.database.models.user_search_gram import UserSearchGramModel
+    from app.database.models.user_statistics import UserStatisticsModel
+    from app.database.sqlalchemy_extension import db
+
+    if current_timestamp is None:
+        current_timestamp = time.time()
+    threshold_timestamp = (
+        current_timestamp - config.BaseConfig.UNVERIFIED_USER_THRESHOLD
+    )
+
+    if dry_run:
+        return query_unverified_users(threshold_timestamp).count()
+
+    deleted_count = 0
+    last_id = 0
+    while True:
+        user_ids = [
+            user_id
+            for user_id, in query_unverified_users_batch(
+                threshold_timestamp, last_id, batch_size
+            )
+        ]
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+
+        for model in (UserSearchGramModel, UserStatisticsModel):
+            db.session.query(model).filter(model.user_id.in_(user_ids)).delete(
+                synchronize_session=False
+            )
+        deleted_count += (
+            db.session.query(UserModel)
+            .filter(UserModel.id.in_(user_ids))
+            .delete(synchronize_session=False)
         )
-        threshold = config.BaseConfig.UNVERIFIED_USER_THRESHOLD
-        for user in unverified_users:
-            delta = time.time() - user.registration_date
+        db.session.commit()
+
+    return deleted_count
+
+
+def delete_unverified_users_job():
+    """
+    This function deletes the users who did not verify their email
+    within the threshold since registration and logs how many users
+    were deleted
+    """
 
-            if delta > threshold:
-                user.delete_from_db()
+    from run import application
+
+    with application.app_context():
+        deleted_count = delete_unverified_users()
+        application.logger.info(f"Deleted {deleted_count} unverified users")
@@ -0,0 +1,88 @@
+import smtplib
+import threading
+
+from flask import Flask
+
+# workers started by this process
+workers = []
+stop_workers = threading.Event()
+
+
+def deliver_outbox_emails(app: Flask) -> int:
+    """
+    This function delivers one batch of emails due in the outbox.
+    The whole batch is sent over a single SMTP connection and the status of
+    each email is committed as soon as it is known. Failed deliveries are
+    retried with an exponential backoff until EMAIL_MAX_ATTEMPTS is reached.
+    Must be called within an app context.
+    :param app: application whose mail settings are used
+    :return: number of emails claimed, delivered or not
+    """
+    from app.api.mail_extension import mail
+    from app.database.models.email_outbox import EmailOutboxModel
+    from app.database.sqlalchemy_extension import db
+    from app.utils.enum_utils import EmailStatus
+
+    emails = EmailOutboxModel.claim_batch(
+        app.config["EMAIL_OUTBOX_BATCH_SIZE"], app.config["EMAIL_SENDING_TIMEOUT"]
+    )
+    if not emails:
+        return 0
+
+    max_attempts = app.config["EMAIL_MAX_ATTEMPTS"]
+    retry_delay = app.config["EMAIL_RETRY_DELAY"]
+    try:
+        with mail.connect() as connection:
+            for email in emails:
+                try:
+                    connection.send(email.message())
+                except (smtplib.SMTPException, OSError) as error:
+                    email.mark_failed_attempt(repr(error), max_attempts, retry_delay)
+                else:
+                    email.mark_sent()
+                db.session.commit()
+    except (smtplib.SMTPException, OSError) as error:
+        # the connection to the mail server failed
+        for email in emails:
+            if email.status == EmailStatus.SENDING:
+                email.mark_failed_attempt(repr(error), max_attempts, retry_delay)
+        db.session.commit()
+
+    return len(emails)
+
+
+def run_email_outbox_worker(app: Flask):
+    """
+    This function delivers the outbox emails until the workers are stopped,
+    waiting EMAIL_OUTBOX_POLL_INTERVAL seconds whenever the outbox is empty
+    :param app: application whose database and mail settings are used
+    """
+    from app.database.sqlalchemy_extension import db
+
+    while not stop_workers.is_set():
+        with app.app_context():
+            try:
+                delivered_count = deliver_outbox_emails(app)
+            except Exception:
+                app.logger.exception("Failed to deliver the outbox emails")
+                db.session.rollback()
+                delivered_count = 0
+        if not delivered_count:
+            stop_workers.wait(app.config["EMAIL_OUTBOX_POLL_INTERVAL"])
+
+
+def init_email_outbox_workers(app: Flask):
+    """Starts EMAIL_OUTBOX_WORKERS threads delivering the outbox emails"""
+    if workers:
+        return
+
+    stop_workers.clear()
+    for index in range(app.config["EMAIL_OUTBOX_WORKERS"]):
+        worker = threading.Thread(
+            target=run_email_outbox_worker,
+            args=(app,),
+            name=f"email-outbox-worker-{index}",
+            daemon=True,
+        )
+        worker.start()
+        workers.append(worker)
@@ -3,7 +3,7 @@ This module is used to define decorators for the app
 """
 from app import messages
 from http import HTTPStatus
-from app.database.models.user import UserModel
+from app.utils.request_user_utils import find_request_user
 
 
 def email_verification_required(user_function):
@@ -13,6 +13,8 @@ def email_verification_required(user_function):
     It will check if the user given as a
     parameter to user_function
     exists and have its email verified
+    The user is loaded once per request, so
+    user_function gets it without a new query
     """
 
     def check_verification(*args, **kwargs):
@@ -28,9 +30,9 @@ def email_verification_required(user_function):
         """
 
         if kwargs:
-            user = UserModel.find_by_id(kwargs["user_id"])
+            user = find_request_user(kwargs["user_id"])
         else:
-            user = UserModel.find_by_id(args[0])
+            user = find_request_user(args[0])
 
         # verify if user exists
         if user:
@@ -11,3 +11,14 @@ class MentorshipRelationState(IntEnum):
 
     def values(self):
         return list(map(int, self))
+
+
+@unique
+class EmailStatus(IntEnum):
+    PENDING = 1
+    SENDING = 2
+    SENT = 3
+    FAILED = 4
+
+    def values(self):
+        return list(map(int, self))
@@ -0,0 +1,60 @@
+"""
+This module is used to answer conditional GET requests.
+
+The ETag of a response is derived from the version of the statistics of the
+user it belongs to, which is incremented by every write of the relations,
+tasks and profiles the response is built from. A request whose If-None-Match
+header holds the current ETag gets a 304 Not Modified response, without
+running the DAO building the response.
+"""
+import hashlib
+import json
+from functools import wraps
+from http import HTTPStatus
+
+from flask import Response, request
+from flask_jwt_extended import get_jwt_identity
+
+from app.utils.request_user_utils import find_request_version
+
+
+def compute_etag(resource: str, owner_id: int, version: int, view_args) -> str:
+    """Returns the strong ETag of a response, unquoted."""
+    stamp = [resource, get_jwt_identity(), owner_id, version, sorted(view_args.items())]
+    return hashlib.sha1(json.dumps(stamp).encode()).hexdigest()
+
+
+def etag_response(resource: str, owner_arg: str = None):
+    """Answers the GET requests of an endpoint with an unchanged ETag with 304.
+
+    Must be applied under jwt_required. The successful responses get the ETag
+    header, the others are left unchanged.
+    Args:
+        resource: The name of the resource returned by the endpoint.
+        owner_arg: The view argument holding the id of the user the response
+            belongs to, defaults to the user of the JWT identity.
+    """
+
+    def decorator(get_function):
+        @wraps(get_function)
+        def conditional_get(*args, **kwargs):
+            owner_id = kwargs[owner_arg] if owner_arg else get_jwt_identity()
+            version = find_request_version(owner_id)
+            if version is None:
+                return get_function(*args, **kwargs)
+
+            etag = compute_etag(resource, owner_id, version, kwargs)
+            if request.if_none_match.contains(etag):
+                response = Response(status=HTTPStatus.NOT_MODIFIED)
+                response.set_etag(etag)
+                return response
+
+            response = get_function(*args, **kwargs)
+            if not isinstance(response, tuple) or response[1] != HTTPStatus.OK:
+                return response
+            data, status, headers = (response + ({},))[:3]
+            return data, status, dict(headers, ETag=f'"{etag}"')
+
+        return conditional_get
+
+    return decorator
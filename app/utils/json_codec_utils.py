@@ -0,0 +1,101 @@
+"""
+This module defines the JSON codecs used to encode the JSON columns and the
+API responses.
+
+Available codecs (selected with the JSON_CODEC setting):
+- orjson: needs the orjson package, the fastest
+- ujson: needs the ujson package
+- json: the standard library module
+- auto: the fastest installed codec
+"""
+import json
+
+from flask import current_app, has_app_context
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+class StdlibJsonCodec:
+    """Encodes and decodes JSON with the json module of the standard library."""
+
+    name = "json"
+    is_available = True
+
+    @staticmethod
+    def dumps(value) -> str:
+        return json.dumps(value)
+
+    @staticmethod
+    def loads(text):
+        return json.loads(text)
+
+
+class UjsonJsonCodec:
+    """Encodes and decodes JSON with ujson."""
+
+    name = "ujson"
+    is_available = ujson is not None
+
+    @staticmethod
+    def dumps(value) -> str:
+        return ujson.dumps(value, ensure_ascii=False)
+
+    @staticmethod
+    def loads(text):
+        return ujson.loads(text)
+
+
+class OrjsonJsonCodec:
+    """Encodes and decodes JSON with orjson, which encodes to bytes."""
+
+    name = "orjson"
+    is_available = orjson is not None
+
+    @staticmethod
+    def dumps(value) -> str:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def loads(text):
+        return orjson.loads(text)
+
+
+# by decreasing speed, the first available one is picked by auto
+CODECS = {
+    OrjsonJsonCodec.name: OrjsonJsonCodec,
+    UjsonJsonCodec.name: UjsonJsonCodec,
+    StdlibJsonCodec.name: StdlibJsonCodec,
+}
+
+
+def find_json_codec(codec_name: str):
+    """Returns the codec with the given name, or the fastest one for auto."""
+    if codec_name == "auto":
+        return next(codec for codec in CODECS.values() if codec.is_available)
+    if codec_name not in CODECS:
+        raise ValueError(
+            "The JSON_CODEC config value has to be within these "
+            f"values: auto, {', '.join(CODECS)}."
+        )
+    codec = CODECS[codec_name]
+    if not codec.is_available:
+        raise ValueError(
+            f"The {codec_name} package has to be installed to use the "
+            f"{codec_name} JSON_CODEC."
+        )
+    return codec
+
+
+def get_json_codec():
+    """Returns the JSON codec configured for the current app, auto outside of it."""
+    if has_app_context():
+        return find_json_codec(current_app.config.get("JSON_CODEC", "auto"))
+    return find_json_codec("auto")
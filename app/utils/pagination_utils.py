@@ -0,0 +1,39 @@
+"""
+This module is used to encode and decode the opaque cursors
+used by keyset (cursor) pagination
+"""
+import base64
+import binascii
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """Returns an opaque cursor pointing right after the row with last_id."""
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Returns the id encoded in a cursor.
+
+    An empty cursor starts the pagination from the first row.
+
+    Args:
+        cursor: cursor returned by a previous page, or an empty string.
+
+    Returns:
+        The last id seen by the client, 0 for an empty cursor or None if the
+        cursor is invalid.
+    """
+    if not cursor:
+        return 0
+
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        last_id = int(base64.urlsafe_b64decode(cursor + padding).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+    if last_id < 0:
+        return None
+    return last_id
@@ -0,0 +1,189 @@
+"""
+This module defines the policy used to hash the passwords of the users.
+
+The passwords are hashed with PBKDF2, using the hash function and number of
+iterations of the PASSWORD_HASH_ALGORITHM and PASSWORD_HASH_ITERATIONS
+settings. The hashes made with other settings are still verified, and are
+upgraded to the current policy on the next login of their user, see
+UserDAO.authenticate.
+
+When PASSWORD_HASH_WORKERS is set, the passwords are hashed and verified by
+a pool of worker processes instead of the request threads. At most
+PASSWORD_HASH_QUEUE_SIZE hashes are running or waiting in the pool of a
+process, the next ones raise PasswordHasherBusyError, which the API answers
+with 503 Service Unavailable. The workers are started by a fork server, or
+spawned where there is none, since forking the multi-threaded server process
+could copy locks held by its other threads. They are stopped when the
+process exits.
+"""
+import atexit
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_ALGORITHM = "sha256"
+DEFAULT_ITERATIONS = 150000
+# hash functions of PBKDF2 supported by hashlib on every platform
+ALGORITHMS = ("sha1", "sha224", "sha256", "sha384", "sha512")
+# size of the password_hash column of the users
+MAX_PASSWORD_HASH_LENGTH = 255
+SALT_LENGTH = 8
+
+
+class PasswordHashingPolicy:
+    """Hashes passwords with PBKDF2 at a given cost.
+
+    Attributes:
+        algorithm: The hash function used by PBKDF2, e.g. sha256.
+        iterations: The number of iterations of PBKDF2.
+    """
+
+    def __init__(self, algorithm=DEFAULT_ALGORITHM, iterations=DEFAULT_ITERATIONS):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(
+                "The PASSWORD_HASH_ALGORITHM config value has to be within these "
+                f"values: {', '.join(ALGORITHMS)}."
+            )
+        if iterations < 1:
+            raise ValueError(
+                "The PASSWORD_HASH_ITERATIONS config value has to be positive."
+            )
+        self.algorithm = algorithm
+        self.iterations = iterations
+        if self.hash_length > MAX_PASSWORD_HASH_LENGTH:
+            raise ValueError(
+                f"The hashes of the {self.method} method are longer than the "
+                f"{MAX_PASSWORD_HASH_LENGTH} characters of the password_hash column."
+            )
+
+    @property
+    def method(self) -> str:
+        """The method of the hashes, as stored before their salt."""
+        return f"pbkdf2:{self.algorithm}:{self.iterations}"
+
+    @property
+    def hash_length(self) -> int:
+        """The length of the hashes: method$salt$hex digest."""
+        digest_size = hashlib.new(self.algorithm).digest_size
+        return len(self.method) + 1 + SALT_LENGTH + 1 + 2 * digest_size
+
+    def hash(self, password: str) -> str:
+        """Returns the salted hash of a password."""
+        return generate_password_hash(
+            password, method=self.method, salt_length=SALT_LENGTH
+        )
+
+    @staticmethod
+    def verify(password_hash: str, password: str) -> bool:
+        """Returns whether a password matches a hash, whatever its policy."""
+        return check_password_hash(password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Returns whether a hash was made with another policy."""
+        return password_hash.split("$", 1)[0] != self.method
+
+
+def get_password_hashing_policy() -> PasswordHashingPolicy:
+    """Returns the policy configured for the current app, the default outside of it."""
+    if has_app_context():
+        return PasswordHashingPolicy(
+            current_app.config.get("PASSWORD_HASH_ALGORITHM", DEFAULT_ALGORITHM),
+            current_app.config.get("PASSWORD_HASH_ITERATIONS", DEFAULT_ITERATIONS),
+        )
+    return PasswordHashingPolicy()
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the password hasher has no room left for another hash."""
+
+
+class PasswordHasher:
+    """Runs the password hashing in a pool of worker processes.
+
+    Attributes:
+        executor: The pool of worker processes.
+        slots: The hashes which can still be running or waiting in the pool.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+        else:
+            context = multiprocessing.get_context("spawn")
+        self.executor = ProcessPoolExecutor(workers, mp_context=context)
+        self.slots = threading.BoundedSemaphore(queue_size)
+
+    def run(self, function, *args):
+        """Returns the result of function, called in a worker process.
+
+        Raises:
+            PasswordHasherBusyError: If queue_size hashes are already running
+                or waiting.
+        """
+        if not self.slots.acquire(blocking=False):
+            raise PasswordHasherBusyError()
+        try:
+            return self.executor.submit(function, *args).result()
+        finally:
+            self.slots.release()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
+
+
+# hashers of this process, created on their first hash so that each forked
+# server worker gets its own pool
+hashers = {}
+hashers_lock = threading.Lock()
+
+
+def get_password_hasher():
+    """Returns the hasher configured for the current app, or None to hash in place."""
+    if not has_app_context() or not current_app.config.get("PASSWORD_HASH_WORKERS"):
+        return None
+
+    key = (
+        os.getpid(),
+        current_app.config["PASSWORD_HASH_WORKERS"],
+        current_app.config["PASSWORD_HASH_QUEUE_SIZE"],
+    )
+    with hashers_lock:
+        if key not in hashers:
+            hashers[key] = PasswordHasher(*key[1:])
+        return hashers[key]
+
+
+@atexit.register
+def shutdown_password_hashers() -> None:
+    """Stops the worker processes of all the hashers of this process.
+
+    The hashers inherited from a parent process belong to it and are only
+    forgotten.
+    """
+    with hashers_lock:
+        for (pid, *_), hasher in hashers.items():
+            if pid == os.getpid():
+                hasher.shutdown()
+        hashers.clear()
+
+
+def run_hashing(function, *args):
+    hasher = get_password_hasher()
+    if hasher is None:
+        return function(*args)
+    return hasher.run(function, *args)
+
+
+def hash_password(password: str) -> str:
+    """Returns the hash of a password, made with the current policy."""
+    return run_hashing(get_password_hashing_policy().hash, password)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """Returns whether a password matches a hash."""
+    return run_hashing(PasswordHashingPolicy.verify, password_hash, password)
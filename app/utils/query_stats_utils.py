@@ -0,0 +1,86 @@
+"""
+This module is used to measure the SQL queries of each request.
+
+Every statement executed by the database engines is counted, with its
+duration, in the stats of the current request. When DB_QUERY_HEADERS is set
+the responses carry these stats in the X-DB-Queries and X-DB-Time (in ms)
+headers. Any statement slower than SLOW_QUERY_THRESHOLD seconds is logged
+with the endpoint that executed it, within a request or not.
+"""
+import time
+
+from flask import (
+    Flask,
+    _request_ctx_stack,
+    current_app,
+    has_app_context,
+    has_request_context,
+    request,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DB_QUERIES_HEADER = "X-DB-Queries"
+DB_TIME_HEADER = "X-DB-Time"
+
+
+class QueryStats:
+    """Number and total duration, in seconds, of the queries of a request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+def get_request_query_stats() -> QueryStats:
+    """Returns the query stats of the current request."""
+    request_context = _request_ctx_stack.top
+    if not hasattr(request_context, "query_stats"):
+        request_context.query_stats = QueryStats()
+    return request_context.query_stats
+
+
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_start_time = time.perf_counter()
+
+
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    if context is None or not hasattr(context, "query_start_time"):
+        return
+    if not has_app_context():
+        return
+    duration = time.perf_counter() - context.query_start_time
+
+    if has_request_context():
+        stats = get_request_query_stats()
+        stats.count += 1
+        stats.duration += duration
+        endpoint = request.endpoint
+    else:
+        endpoint = None
+
+    threshold = current_app.config.get("SLOW_QUERY_THRESHOLD")
+    if threshold is not None and duration > threshold:
+        current_app.logger.warning(
+            "Slow query (%.1f ms) in %s: %s",
+            duration * 1000,
+            endpoint or "no request",
+            statement,
+        )
+
+
+def add_query_stats_headers(response):
+    if current_app.config.get("DB_QUERY_HEADERS"):
+        stats = get_request_query_stats()
+        response.headers[DB_QUERIES_HEADER] = str(stats.count)
+        response.headers[DB_TIME_HEADER] = f"{stats.duration * 1000:.2f}"
+    return response
+
+
+def init_query_stats(app: Flask):
+    """Measures the queries of every engine and adds the stats headers of app."""
+    if not event.contains(Engine, "before_cursor_execute", start_query_timer):
+        event.listen(Engine, "before_cursor_execute", start_query_timer)
+        event.listen(Engine, "after_cursor_execute", record_query)
+    app.after_request(add_query_stats_headers)
@@ -0,0 +1,82 @@
+"""
+This module is used to load each user at most once per request.
+
+The email_verification_required decorator and the DAO it wraps both need
+the user of the JWT identity, the user loaded by the decorator is reused
+by the DAO instead of being queried again. The version of the data of a
+user is likewise read once per request, by the ETag and the response cache
+of an endpoint. Outside of a request every lookup goes to the database.
+"""
+import threading
+
+from flask import _request_ctx_stack, has_request_context
+from sqlalchemy import inspect
+
+from app.database.models.user import UserModel
+from app.database.models.user_statistics import UserStatisticsModel
+
+# lookups served from the request cache (hits) or the database (misses)
+user_lookup_counts = {"hits": 0, "misses": 0}
+_user_lookup_counts_lock = threading.Lock()
+
+
+def _count_lookup(key: str) -> None:
+    with _user_lookup_counts_lock:
+        user_lookup_counts[key] += 1
+
+
+def _get_request_users():
+    """Returns the users loaded by the current request, by id."""
+    request_context = _request_ctx_stack.top
+    if not hasattr(request_context, "loaded_users"):
+        request_context.loaded_users = {}
+    return request_context.loaded_users
+
+
+def find_request_user(user_id: int) -> UserModel:
+    """Returns the user with the given id, loading it once per request.
+
+    Args:
+        user_id: The id of the user.
+
+    Returns:
+        The UserModel of the user, or None if the user does not exist.
+    """
+    if not has_request_context():
+        _count_lookup("misses")
+        return UserModel.find_by_id(user_id)
+
+    users = _get_request_users()
+    user = users.get(user_id)
+    if user is not None:
+        state = inspect(user)
+        if not (state.deleted or state.detached):
+            _count_lookup("hits")
+            return user
+
+    _count_lookup("misses")
+    user = UserModel.find_by_id(user_id)
+    if user is not None:
+        users[user_id] = user
+    return user
+
+
+def find_request_version(user_id: int) -> int:
+    """Returns the version of the data shown to a user, read once per request.
+
+    Args:
+        user_id: The id of the user.
+
+    Returns:
+        The version of the statistics of the user, or None if they have none.
+    """
+    if not has_request_context():
+        return UserStatisticsModel.find_version(user_id)
+
+    request_context = _request_ctx_stack.top
+    if not hasattr(request_context, "data_versions"):
+        request_context.data_versions = {}
+    versions = request_context.data_versions
+    if user_id not in versions:
+        versions[user_id] = UserStatisticsModel.find_version(user_id)
+    return versions[user_id]
@@ -0,0 +1,6 @@
+"""
+Performance benchmarks of the Mentorship System backend.
+
+Each module can be run on its own, e.g.:
+python -m benchmarks.dashboard
+"""
@@ -0,0 +1,114 @@
+"""
+Benchmark of UserDAO.get_user_dashboard for a user with a long history
+of mentorship requests.
+
+Usage:
+python -m benchmarks.dashboard [--relations 100 1000 5000] [--repeat 20]
+"""
+import argparse
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("FLASK_ENVIRONMENT_CONFIG", "test")
+
+from run import application  # noqa: E402
+from app.api.dao.user import UserDAO  # noqa: E402
+from app.database.models.mentorship_relation import (
+    MentorshipRelationModel,
+)  # noqa: E402
+from app.database.models.tasks_list import TasksListModel  # noqa: E402
+from app.database.models.user import UserModel  # noqa: E402
+from app.database.sqlalchemy_extension import db  # noqa: E402
+from app.utils.enum_utils import MentorshipRelationState  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+
+def seed(number_of_relations):
+    """Creates two users sharing number_of_relations relations in all states."""
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+    user = UserModel("Benchmark", "benchmark", "benchmark_pwd", "b@email.com", True)
+    other_user = UserModel("Other", "other", "other_pwd", "o@email.com", True)
+    user.is_email_verified = True
+    db.session.add_all([user, other_user])
+    db.session.commit()
+
+    db.session.bulk_insert_mappings(
+        TasksListModel,
+        [{"tasks": [], "next_task_id": 1} for _ in range(number_of_relations)],
+    )
+    tasks_list_ids = [row.id for row in db.session.query(TasksListModel.id)]
+
+    now = datetime.utcnow()
+    states = list(MentorshipRelationState)
+    relations = []
+    for index, tasks_list_id in enumerate(tasks_list_ids):
+        # only the most recent relation can be the accepted one
+        state = states[index % len(states)]
+        if state == MentorshipRelationState.ACCEPTED:
+            state = MentorshipRelationState.COMPLETED
+        mentor, mentee = (user, other_user) if index % 2 else (other_user, user)
+        relations.append(
+            {
+                "action_user_id": mentor.id if index % 3 else mentee.id,
+                "mentor_id": mentor.id,
+                "mentee_id": mentee.id,
+                "creation_date": (now - timedelta(days=index)).timestamp(),
+                "end_date": (now + timedelta(weeks=5)).timestamp(),
+                "state": state,
+                "notes": "benchmark relation",
+                "tasks_list_id": tasks_list_id,
+            }
+        )
+    relations[-1]["state"] = MentorshipRelationState.ACCEPTED
+    db.session.bulk_insert_mappings(MentorshipRelationModel, relations)
+    db.session.commit()
+
+    return user.id
+
+
+def run(number_of_relations, repeat):
+    """Returns the latencies (in ms) and query count of the dashboard."""
+    user_id = seed(number_of_relations)
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    latencies = []
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        for _ in range(repeat):
+            db.session.expire_all()
+            statements.clear()
+            start = time.perf_counter()
+            UserDAO.get_user_dashboard(user_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    return latencies, len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--relations", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'relations':>10} {'queries':>8} {'p50 ms':>9} {'max ms':>9}")
+    with application.app_context():
+        for number_of_relations in args.relations:
+            latencies, queries = run(number_of_relations, args.repeat)
+            print(
+                f"{number_of_relations:>10} {queries:>8} "
+                f"{statistics.median(latencies):>9.2f} {max(latencies):>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Seeded generator of synthetic data for the benchmarks.
+
+The same seed and scale always generate the same users, relations, tasks
+and comments. Every user has the password PASSWORD. The rows are bulk
+inserted, so the statistics and search index of the users are filled in
+afterwards, as the mapper events would have done.
+
+Usage:
+python -m benchmarks.data_generator [--users 1000] [--relations 5000] [--seed 42]
+"""
+import argparse
+import os
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+os.environ.setdefault("FLASK_ENVIRONMENT_CONFIG", "test")
+
+from app.database.models.mentorship_relation import (
+    MentorshipRelationModel,
+)  # noqa: E402
+from app.database.models.task import TaskModel  # noqa: E402
+from app.database.models.task_comment import TaskCommentModel  # noqa: E402
+from app.database.models.tasks_list import TasksListModel  # noqa: E402
+from app.database.models.user import UserModel  # noqa: E402
+from app.database.models.user_statistics import UserStatisticsModel  # noqa: E402
+from app.database.sqlalchemy_extension import db  # noqa: E402
+from app.database.user_search import get_user_search_backend  # noqa: E402
+from app.database.user_statistics import STATE_COUNTERS  # noqa: E402
+from app.utils.enum_utils import MentorshipRelationState  # noqa: E402
+from app.utils.password_hashing_utils import get_password_hashing_policy  # noqa: E402
+
+PASSWORD = "benchmark_pwd"
+BATCH_SIZE = 1000
+
+FIRST_NAMES = ("Ada", "Alan", "Grace", "Linus", "Margaret", "Dennis", "Barbara")
+LAST_NAMES = ("Lovelace", "Turing", "Hopper", "Torvalds", "Hamilton", "Ritchie")
+SKILLS = ("Python", "Flask", "SQL", "Java", "Kotlin", "Design", "Testing")
+
+# the states of the relations which are not the accepted one of their users
+PAST_STATES = [
+    state
+    for state in MentorshipRelationState
+    if state != MentorshipRelationState.ACCEPTED
+]
+
+
+class GeneratedData:
+    """Ids of the generated rows used by the load test.
+
+    Attributes:
+        user_ids: Ids of all the users.
+        accepted_relations: (relation id, mentor id, mentee id) of every
+            accepted relation.
+        counts: Number of generated rows, by table.
+    """
+
+    def __init__(self):
+        self.user_ids = []
+        self.accepted_relations = []
+        self.counts = Counter()
+
+
+def insert_in_batches(model, rows) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.bulk_insert_mappings(model, rows[start : start + BATCH_SIZE])
+
+
+def generate_users(rng: random.Random, number_of_users: int, now: datetime):
+    password_hash = get_password_hashing_policy().hash(PASSWORD)
+    rows = []
+    for index in range(number_of_users):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows.append(
+            {
+                "name": f"{first_name} {last_name}",
+                "username": f"user{index}",
+                "email": f"user{index}@email.com",
+                "password_hash": password_hash,
+                "registration_date": (now - timedelta(days=index)).timestamp(),
+                "terms_and_conditions_checked": True,
+                "is_admin": index == 0,
+                "is_email_verified": True,
+                "need_mentoring": rng.random() < 0.6,
+                "available_to_mentor": rng.random() < 0.4,
+                "skills": ", ".join(rng.sample(SKILLS, 2)),
+            }
+        )
+    insert_in_batches(UserModel, rows)
+    return [row.id for row in db.session.query(UserModel.id).order_by(UserModel.id)]
+
+
+def generate(
+    number_of_users=1000,
+    number_of_relations=5000,
+    tasks_per_relation=5,
+    comments_per_task=2,
+    seed=42,
+) -> GeneratedData:
+    """Replaces the content of the database with generated data.
+
+    Args:
+        number_of_users: Number of users, at least 2.
+        number_of_relations: Number of relations, in all states. A user has at
+            most one accepted relation.
+        tasks_per_relation: Maximum number of tasks of a relation.
+        comments_per_task: Maximum number of comments of a task.
+        seed: Seed of the random generator.
+    """
+    rng = random.Random(seed)
+    now = datetime(2020, 1, 1)
+    data = GeneratedData()
+
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+    data.user_ids = generate_users(rng, number_of_users, now)
+
+    insert_in_batches(
+        TasksListModel, [{"next_task_id": 1} for _ in range(number_of_relations)]
+    )
+    tasks_list_ids = [
+        row.id
+        for row in db.session.query(TasksListModel.id).order_by(TasksListModel.id)
+    ]
+
+    busy_user_ids = set()
+    statistics = {user_id: Counter() for user_id in data.user_ids}
+    relations, tasks, next_task_ids = [], [], []
+    for index, tasks_list_id in enumerate(tasks_list_ids):
+        mentor_id, mentee_id = rng.sample(data.user_ids, 2)
+        state = rng.choice(list(MentorshipRelationState))
+        if state == MentorshipRelationState.ACCEPTED and (
+            mentor_id in busy_user_ids or mentee_id in busy_user_ids
+        ):
+            state = rng.choice(PAST_STATES)
+        if state == MentorshipRelationState.ACCEPTED:
+            busy_user_ids.update((mentor_id, mentee_id))
+
+        creation_date = now - timedelta(hours=index)
+        is_started = state in (
+            MentorshipRelationState.ACCEPTED,
+            MentorshipRelationState.CANCELLED,
+            MentorshipRelationState.COMPLETED,
+        )
+        relations.append(
+            {
+                "mentor_id": mentor_id,
+                "mentee_id": mentee_id,
+                "action_user_id": rng.choice((mentor_id, mentee_id)),
+                "creation_date": creation_date.timestamp(),
+                "accept_date": creation_date.timestamp() if is_started else None,
+                "start_date": creation_date.timestamp() if is_started else None,
+                "end_date": (creation_date + timedelta(weeks=8)).timestamp(),
+                "state": state,
+                "notes": f"Generated relation {index}",
+                "tasks_list_id": tasks_list_id,
+            }
+        )
+        statistics[mentor_id][state] += 1
+        statistics[mentee_id][state] += 1
+
+        number_of_tasks = rng.randint(0, tasks_per_relation) if is_started else 0
+        for task_id in range(1, number_of_tasks + 1):
+            is_done = rng.random() < 0.5
+            tasks.append(
+                {
+                    "tasks_list_id": tasks_list_id,
+                    "task_id": task_id,
+                    "description": f"Generated task {task_id} of relation {index}",
+                    "is_done": is_done,
+                    "created_at": creation_date.timestamp(),
+                    "completed_at": now.timestamp() if is_done else None,
+                }
+            )
+        next_task_ids.append({"id": tasks_list_id, "next_task_id": number_of_tasks + 1})
+
+    insert_in_batches(MentorshipRelationModel, relations)
+    insert_in_batches(TaskModel, tasks)
+    db.session.bulk_update_mappings(TasksListModel, next_task_ids)
+
+    relation_ids = [
+        row.id
+        for row in db.session.query(MentorshipRelationModel.id).order_by(
+            MentorshipRelationModel.id
+        )
+    ]
+    relations_by_tasks_list = {
+        relation["tasks_list_id"]: (relation_id, relation)
+        for relation_id, relation in zip(relation_ids, relations)
+    }
+    comments = []
+    for task in tasks:
+        relation_id, relation = relations_by_tasks_list[task["tasks_list_id"]]
+        for _ in range(rng.randint(0, comments_per_task)):
+            comments.append(
+                {
+                    "user_id": rng.choice(
+                        (relation["mentor_id"], relation["mentee_id"])
+                    ),
+                    "task_id": task["task_id"],
+                    "relation_id": relation_id,
+                    "creation_date": now.timestamp(),
+                    "comment": f"Comment on task {task['task_id']}",
+                }
+            )
+    insert_in_batches(TaskCommentModel, comments)
+
+    data.accepted_relations = [
+        (relation_id, relation["mentor_id"], relation["mentee_id"])
+        for relation_id, relation in zip(relation_ids, relations)
+        if relation["state"] == MentorshipRelationState.ACCEPTED
+    ]
+
+    # the rows were bulk inserted, without the statistics and search index events
+    statistics_rows = []
+    for user_id, counts in statistics.items():
+        row = {"user_id": user_id, "achievements": [], "is_achievements_outdated": True}
+        for state, counter in STATE_COUNTERS.items():
+            row[counter] = counts[state]
+        statistics_rows.append(row)
+    insert_in_batches(UserStatisticsModel, statistics_rows)
+    db.session.commit()
+
+    search_backend = get_user_search_backend()
+    if search_backend.maintains_index:
+        search_backend.rebuild_index()
+
+    data.counts.update(
+        users=len(data.user_ids),
+        relations=len(relations),
+        tasks=len(tasks),
+        comments=len(comments),
+    )
+    return data
+
+
+def main():
+    from run import application
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--relations", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=5)
+    parser.add_argument("--comments", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--database-uri", help="Database to fill, the in-memory one by default"
+    )
+    args = parser.parse_args()
+
+    if args.database_uri:
+        application.config["SQLALCHEMY_DATABASE_URI"] = args.database_uri
+    with application.app_context():
+        data = generate(
+            args.users, args.relations, args.tasks, args.comments, args.seed
+        )
+    for table, count in data.counts.items():
+        print(f"{table:>10} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark of the JSON codecs over task lists and user dashboards.
+
+Only the installed codecs are measured, see app.utils.json_codec_utils.
+
+Usage:
+python -m benchmarks.json_codec [--tasks 10 100 1000] [--relations 100 1000] [--repeat 200]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app.utils.json_codec_utils import CODECS
+
+DASHBOARD_STATES = ("accepted", "rejected", "completed", "cancelled", "pending")
+
+
+def make_tasks(number_of_tasks):
+    """Returns a list of tasks as returned by the tasks endpoints."""
+    now = datetime.utcnow()
+    return [
+        {
+            "id": task_id,
+            "description": f"Read chapter {task_id} and write a summary of it",
+            "is_done": task_id % 3 == 0,
+            "created_at": (now - timedelta(days=task_id)).timestamp(),
+            "completed_at": now.timestamp() if task_id % 3 == 0 else None,
+        }
+        for task_id in range(1, number_of_tasks + 1)
+    ]
+
+
+def make_dashboard(number_of_relations):
+    """Returns a dashboard of a user with number_of_relations relations."""
+    now = datetime.utcnow()
+    dashboard = {
+        role: {
+            direction: {state: [] for state in DASHBOARD_STATES}
+            for direction in ("sent", "received")
+        }
+        for role in ("as_mentor", "as_mentee")
+    }
+    for index in range(number_of_relations):
+        role = ("as_mentor", "as_mentee")[index % 2]
+        direction = ("sent", "received")[index % 3 % 2]
+        state = DASHBOARD_STATES[index % len(DASHBOARD_STATES)]
+        dashboard[role][direction][state].append(
+            {
+                "id": index,
+                "action_user_id": 1,
+                "mentor": {"id": 1, "user_name": "Mentor", "photo_url": None},
+                "mentee": {"id": 2, "user_name": "Mentee", "photo_url": None},
+                "creation_date": (now - timedelta(days=index)).timestamp(),
+                "accept_date": None,
+                "start_date": None,
+                "end_date": (now + timedelta(weeks=5)).timestamp(),
+                "state": index % len(DASHBOARD_STATES) + 1,
+                "notes": "Learn how to contribute to open source projects",
+            }
+        )
+    tasks = make_tasks(20)
+    dashboard["tasks_todo"] = [task for task in tasks if not task["is_done"]]
+    dashboard["tasks_done"] = [task for task in tasks if task["is_done"]]
+    return dashboard
+
+
+def measure(function, repeat):
+    """Returns the median latency of function, in microseconds."""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        latencies.append((time.perf_counter() - start) * 1000000)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--relations", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = [(f"{count} tasks", make_tasks(count)) for count in args.tasks]
+    payloads += [
+        (f"dashboard {count}", make_dashboard(count)) for count in args.relations
+    ]
+    codecs = [codec for codec in CODECS.values() if codec.is_available]
+
+    print(
+        f"{'payload':>16} {'codec':>7} {'bytes':>9} {'dumps us':>10} {'loads us':>10}"
+    )
+    for payload_name, payload in payloads:
+        for codec in codecs:
+            text = codec.dumps(payload)
+            dumps_latency = measure(lambda: codec.dumps(payload), args.repeat)
+            loads_latency = measure(lambda: codec.loads(text), args.repeat)
+            print(
+                f"{payload_name:>16} {codec.name:>7} {len(text):>9} "
+                f"{dumps_latency:>10.1f} {loads_latency:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Load test of the API over the data of benchmarks.data_generator.
+
+The scenarios are run through the Flask test client, or against a running
+server with --url, e.g. gunicorn run:application started on the database
+given to --database-uri. The p50, p95 and p99 latencies and the queries per
+request, read from the X-DB-Queries header (see DB_QUERY_HEADERS), of each
+scenario are reported. A run can be saved as a baseline and compared to it
+later: the exit status is 1 when a scenario regressed.
+
+Usage:
+python -m benchmarks.load_test [--users 1000] [--relations 5000] [--requests 200]
+    [--save-baseline baseline.json] [--baseline baseline.json] [--tolerance 0.2]
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from http import HTTPStatus
+
+from benchmarks import data_generator
+from app.utils.query_stats_utils import DB_QUERIES_HEADER
+from config import BaseConfig
+
+SCENARIOS = (
+    "login",
+    "users",
+    "dashboard",
+    "home",
+    "tasks",
+    "create_task",
+    "complete_task",
+    "task_comments",
+)
+PERCENTILES = (50, 95, 99)
+
+
+class FlaskClient:
+    """Sends the requests to the application through its test client."""
+
+    def __init__(self, application):
+        self.client = application.test_client()
+
+    def request(self, method, path, token=None, body=None):
+        """Returns the status, headers and decoded JSON body of a response."""
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        response = self.client.open(path, method=method, headers=headers, json=body)
+        return response.status_code, response.headers, response.get_json()
+
+
+class HttpClient:
+    """Sends the requests to a running server."""
+
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+
+    def request(self, method, path, token=None, body=None):
+        """Returns the status, headers and decoded JSON body of a response."""
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        data = json.dumps(body).encode() if body is not None else None
+        http_request = urllib.request.Request(
+            self.url + path, data=data, headers=headers, method=method
+        )
+        try:
+            with urllib.request.urlopen(http_request) as response:
+                return response.status, response.headers, json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            return error.code, error.headers, None
+
+
+class LoadTest:
+    """Runs the scenarios and keeps their latencies, in ms, and query counts."""
+
+    def __init__(self, client, data, seed):
+        self.client = client
+        self.data = data
+        self.rng = random.Random(seed)
+        self.usernames = {
+            user_id: f"user{index}" for index, user_id in enumerate(data.user_ids)
+        }
+        self.tokens = {}
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def send(self, scenario, method, path, expected_status, token=None, body=None):
+        start = time.perf_counter()
+        status, headers, response_body = self.client.request(method, path, token, body)
+        self.latencies[scenario].append((time.perf_counter() - start) * 1000)
+        if headers.get(DB_QUERIES_HEADER) is not None:
+            self.queries[scenario].append(int(headers[DB_QUERIES_HEADER]))
+        if status != expected_status:
+            self.errors[scenario] += 1
+        return response_body
+
+    def login(self, user_id, scenario="login"):
+        body = self.send(
+            scenario,
+            "POST",
+            "/login",
+            HTTPStatus.OK,
+            body={
+                "username": self.usernames[user_id],
+                "password": data_generator.PASSWORD,
+            },
+        )
+        self.tokens[user_id] = body["access_token"]
+
+    def token(self, user_id):
+        if user_id not in self.tokens:
+            self.login(user_id, scenario="setup")
+        return self.tokens[user_id]
+
+    def run_user_scenarios(self, user_id):
+        token = self.token(user_id)
+        self.send("users", "GET", "/users?per_page=20", HTTPStatus.OK, token)
+        self.send("dashboard", "GET", "/dashboard", HTTPStatus.OK, token)
+        self.send("home", "GET", "/home", HTTPStatus.OK, token)
+
+    def run_task_scenarios(self, relation_id, user_id):
+        token = self.token(user_id)
+        relation_path = f"/mentorship_relation/{relation_id}"
+        tasks = self.send(
+            "tasks", "GET", f"{relation_path}/tasks", HTTPStatus.OK, token
+        )
+        self.send(
+            "create_task",
+            "POST",
+            f"{relation_path}/task",
+            HTTPStatus.CREATED,
+            token,
+            body={"description": "Load test task"},
+        )
+        # no task is deleted, so the new one has the next id
+        task_id = max((task["id"] for task in tasks or []), default=0) + 1
+        self.send(
+            "complete_task",
+            "PUT",
+            f"{relation_path}/task/{task_id}/complete",
+            HTTPStatus.OK,
+            token,
+        )
+        self.send(
+            "task_comments",
+            "GET",
+            f"{relation_path}/task/{self.rng.randint(1, task_id)}/comments/",
+            HTTPStatus.OK,
+            token,
+        )
+
+    def run(self, number_of_requests):
+        for _ in range(number_of_requests):
+            self.login(self.rng.choice(self.data.user_ids))
+        for _ in range(number_of_requests):
+            self.run_user_scenarios(self.rng.choice(self.data.user_ids))
+        if self.data.accepted_relations:
+            for _ in range(number_of_requests):
+                relation_id, *user_ids = self.rng.choice(self.data.accepted_relations)
+                self.run_task_scenarios(relation_id, self.rng.choice(user_ids))
+
+    def report(self):
+        """Returns the percentiles of the latencies and queries of each scenario."""
+        results = {}
+        for scenario in SCENARIOS:
+            latencies = sorted(self.latencies[scenario])
+            if not latencies:
+                continue
+            results[scenario] = {
+                f"p{percent}": percentile(latencies, percent) for percent in PERCENTILES
+            }
+            queries = self.queries[scenario]
+            results[scenario]["queries"] = (
+                sum(queries) / len(queries) if queries else None
+            )
+            results[scenario]["errors"] = self.errors[scenario]
+        return results
+
+
+def percentile(sorted_values, percent):
+    """Returns the nearest-rank percentile of sorted values."""
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def format_queries(queries):
+    return "-" if queries is None else f"{queries:.1f}"
+
+
+def print_results(results):
+    print(
+        f"{'scenario':>14} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'queries':>8} {'errors':>7}"
+    )
+    for scenario, result in results.items():
+        print(
+            f"{scenario:>14} {result['p50']:>9.2f} {result['p95']:>9.2f} "
+            f"{result['p99']:>9.2f} {format_queries(result['queries']):>8} "
+            f"{result['errors']:>7}"
+        )
+
+
+def compare(results, baseline, tolerance):
+    """Prints the changes from the baseline, returns the regressed scenarios.
+
+    A scenario regressed when its p95 latency grew by more than tolerance
+    (a ratio) or when it runs more queries per request.
+    """
+    regressions = []
+    print(
+        f"\n{'scenario':>14} {'base p95':>9} {'p95':>9} {'change':>8} {'queries':>14}"
+    )
+    for scenario, result in results.items():
+        if scenario not in baseline:
+            continue
+        base = baseline[scenario]
+        change = result["p95"] / base["p95"] - 1 if base["p95"] else 0
+        queries = (
+            f"{format_queries(base['queries'])} -> {format_queries(result['queries'])}"
+        )
+        is_slower = change > tolerance
+        has_more_queries = (
+            result["queries"] is not None
+            and base["queries"] is not None
+            and result["queries"] > base["queries"]
+        )
+        if is_slower or has_more_queries:
+            regressions.append(scenario)
+        print(
+            f"{scenario:>14} {base['p95']:>9.2f} {result['p95']:>9.2f} "
+            f"{change:>+8.0%} {queries:>14}"
+            + ("  REGRESSION" if is_slower or has_more_queries else "")
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--relations", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=5)
+    parser.add_argument("--comments", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--url", help="Base URL of a running server")
+    parser.add_argument(
+        "--database-uri", help="Database to fill, the in-memory one by default"
+    )
+    parser.add_argument("--response-cache", help="RESPONSE_CACHE_BACKEND to use")
+    parser.add_argument(
+        "--password-iterations",
+        type=int,
+        default=BaseConfig.PASSWORD_HASH_ITERATIONS,
+        help="PASSWORD_HASH_ITERATIONS to use, the production one by default",
+    )
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    from run import application
+
+    if args.database_uri:
+        application.config["SQLALCHEMY_DATABASE_URI"] = args.database_uri
+    if not application.config["SECRET_KEY"]:
+        application.config["SECRET_KEY"] = "BENCHMARK_SECRET_KEY"
+    application.config["PASSWORD_HASH_ITERATIONS"] = args.password_iterations
+    if args.response_cache:
+        application.config["RESPONSE_CACHE_BACKEND"] = args.response_cache
+
+    with application.app_context():
+        data = data_generator.generate(
+            args.users, args.relations, args.tasks, args.comments, args.seed
+        )
+        client = HttpClient(args.url) if args.url else FlaskClient(application)
+        load_test = LoadTest(client, data, args.seed)
+        load_test.run(args.requests)
+    results = load_test.report()
+    print_results(results)
+
+    scale = {
+        "users": args.users,
+        "relations": args.relations,
+        "tasks": args.tasks,
+        "comments": args.comments,
+        "seed": args.seed,
+        "requests": args.requests,
+        "password_iterations": args.password_iterations,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump({"scale": scale, "results": results}, baseline_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline["scale"] != scale:
+            print(f"\nThe baseline was run at another scale: {baseline['scale']}")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\nRegressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark of the login throughput per core for several password hashing costs.
+
+For each number of PBKDF2 iterations, the latency of a password verification
+and of a whole POST /login through the test client are measured on a single
+thread, which gives the logins per second a core can serve.
+
+Usage:
+python -m benchmarks.password_hashing [--iterations 1000 50000 150000 260000] [--repeat 20]
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("FLASK_ENVIRONMENT_CONFIG", "test")
+
+from flask import json  # noqa: E402
+
+from run import application  # noqa: E402
+from app.database.models.user import UserModel  # noqa: E402
+from app.database.sqlalchemy_extension import db  # noqa: E402
+from app.utils.password_hashing_utils import PasswordHashingPolicy  # noqa: E402
+
+PASSWORD = "benchmark_pwd"
+
+
+def seed():
+    """Creates the user logging in."""
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+    user = UserModel("Benchmark", "benchmark", PASSWORD, "b@email.com", True)
+    user.is_email_verified = True
+    db.session.add(user)
+    db.session.commit()
+
+
+def measure(function, repeat):
+    """Returns the median latency of function, in ms."""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def login(client):
+    response = client.post(
+        "/login",
+        data=json.dumps({"username": "benchmark", "password": PASSWORD}),
+        content_type="application/json",
+    )
+    assert response.status_code == 200, response.data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--iterations", type=int, nargs="+", default=[1000, 50000, 150000, 260000]
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if not application.config["SECRET_KEY"]:
+        application.config["SECRET_KEY"] = "BENCHMARK_SECRET_KEY"
+    client = application.test_client()
+
+    print(f"{'iterations':>10} {'verify ms':>10} {'login ms':>9} {'logins/s':>9}")
+    with application.app_context():
+        seed()
+        for iterations in args.iterations:
+            application.config["PASSWORD_HASH_ITERATIONS"] = iterations
+            policy = PasswordHashingPolicy(iterations=iterations)
+            password_hash = policy.hash(PASSWORD)
+
+            # the first login upgrades the stored hash to this policy
+            login(client)
+            verify_latency = measure(
+                lambda: policy.verify(password_hash, PASSWORD), args.repeat
+            )
+            login_latency = measure(lambda: login(client), args.repeat)
+            print(
+                f"{iterations:>10} {verify_latency:>10.2f} {login_latency:>9.2f} "
+                f"{1000 / login_latency:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
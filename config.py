@@ -45,9 +45,47 @@ class BaseConfig(object):
 
     UNVERIFIED_USER_THRESHOLD = 2592000  # 30 days
 
+    # Scheduler mode:
+    # - leader: every worker schedules the jobs, only the lease holder runs them
+    # - all: every worker runs the jobs
+    # - off: no job is scheduled
+    SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "leader")
+    # seconds a worker keeps running a job after acquiring its lease
+    SCHEDULER_LEASE_DURATION = int(os.getenv("SCHEDULER_LEASE_DURATION", 3600))
+
+    # copy the tasks to the legacy tasks_list.tasks column read by the previous
+    # release, only while instances of it are running during the upgrade
+    TASKS_LEGACY_COLUMN_WRITES = (
+        os.getenv("TASKS_LEGACY_COLUMN_WRITES", "False").lower() == "true"
+    )
+
+    # User search backend: auto, like, trigram or pg_trgm
+    USER_SEARCH_BACKEND = os.getenv("USER_SEARCH_BACKEND", "auto")
+
+    # Response cache backend of read-heavy GET endpoints: local, redis or off
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "local")
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 60))  # seconds
+    RESPONSE_CACHE_MAX_ENTRIES = 10000  # per process, with the local backend
+    RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+
+    # JSON codec of the JSON columns and API responses: auto, orjson, ujson or json
+    JSON_CODEC = os.getenv("JSON_CODEC", "auto")
+
+    # SQL queries of each request, in the X-DB-Queries and X-DB-Time headers
+    DB_QUERY_HEADERS = False
+    # seconds after which a statement is logged with its endpoint
+    SLOW_QUERY_THRESHOLD = float(os.getenv("SLOW_QUERY_THRESHOLD", 0.5))
+
     # Flask JWT settings
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(weeks=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(weeks=4)
+    # the tokens issued to a user before the revocation of their tokens are refused
+    JWT_BLACKLIST_ENABLED = True
+    JWT_BLACKLIST_TOKEN_CHECKS = ["access", "refresh"]
+    # seconds between two loads of the revocations made by the other processes
+    JWT_REVOCATION_REFRESH_INTERVAL = 5
+    # verified token claims kept by each process, 0 to verify every token
+    JWT_CLAIMS_CACHE_MAX_ENTRIES = 10000
 
     # Security
     SECRET_KEY = os.getenv("SECRET_KEY", None)
@@ -56,7 +94,26 @@ class BaseConfig(object):
 
     SECURITY_PASSWORD_SALT = os.getenv("SECURITY_PASSWORD_SALT")
 
-    BCRYPT_LOG_ROUNDS = 13
+    # passwords are hashed with PBKDF2 using this hash function and number of
+    # iterations, the hashes made with other values are upgraded on login
+    PASSWORD_HASH_ALGORITHM = os.getenv("PASSWORD_HASH_ALGORITHM", "sha256")
+    PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", 150000))
+    # worker processes hashing the passwords of each server process, 0 to hash
+    # them on the request threads
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    # hashes running or waiting in the workers before answering 503
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 8))
+    PASSWORD_HASH_RETRY_AFTER = 1  # seconds, sent with the 503 responses
+
+    # failed logins limiter: local, redis or off
+    LOGIN_RATE_LIMIT_BACKEND = os.getenv("LOGIN_RATE_LIMIT_BACKEND", "local")
+    LOGIN_RATE_LIMIT_WINDOW = 300  # seconds
+    # failed logins allowed per window
+    LOGIN_RATE_LIMIT_PER_USERNAME = 5
+    LOGIN_RATE_LIMIT_PER_IP = 50
+    LOGIN_RATE_LIMIT_MAX_KEYS = 100000  # per process, with the local backend
+    LOGIN_RATE_LIMIT_REDIS_URL = os.getenv("LOGIN_RATE_LIMIT_REDIS_URL")
+
     WTF_CSRF_ENABLED = True
 
     DEBUG_TB_ENABLED = False
@@ -69,6 +126,14 @@ class BaseConfig(object):
     MAIL_USE_TLS = False
     MAIL_USE_SSL = True
 
+    # email outbox, delivered by background worker threads
+    EMAIL_OUTBOX_WORKERS = int(os.getenv("EMAIL_OUTBOX_WORKERS", 2))
+    EMAIL_OUTBOX_BATCH_SIZE = 20
+    EMAIL_OUTBOX_POLL_INTERVAL = 1  # seconds
+    EMAIL_MAX_ATTEMPTS = 5
+    EMAIL_RETRY_DELAY = 30  # seconds before the first retry, doubled on each retry
+    EMAIL_SENDING_TIMEOUT = 300  # seconds before an undelivered claim is retried
+
     # email authentication
     MAIL_USERNAME = os.getenv("APP_MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("APP_MAIL_PASSWORD")
@@ -106,6 +171,7 @@ class DevelopmentConfig(BaseConfig):
     """Development configuration."""
 
     DEBUG = True
+    DB_QUERY_HEADERS = True
     SQLALCHEMY_DATABASE_URI = BaseConfig.build_db_uri()
 
 
@@ -113,6 +179,7 @@ class StagingConfig(BaseConfig):
     """Staging configuration."""
 
     DEBUG = True
+    DB_QUERY_HEADERS = True
     SQLALCHEMY_DATABASE_URI = BaseConfig.build_db_uri()
     MOCK_EMAIL = False
 
@@ -121,6 +188,7 @@ class LocalConfig(BaseConfig):
     """Local configuration."""
 
     DEBUG = True
+    DB_QUERY_HEADERS = True
 
     # Using a local sqlite database
     SQLALCHEMY_DATABASE_URI = "sqlite:///local_data.db"
@@ -130,7 +198,12 @@ class TestingConfig(BaseConfig):
     """Testing configuration."""
 
     TESTING = True
+    DB_QUERY_HEADERS = True
     MOCK_EMAIL = True
+    EMAIL_OUTBOX_WORKERS = 0
+    # cheap password hashes keep the tests fast
+    PASSWORD_HASH_ITERATIONS = 1000
+    PASSWORD_HASH_WORKERS = 0
 
     # Use in-memory SQLite database for testing
     SQLALCHEMY_DATABASE_URI = "sqlite://"
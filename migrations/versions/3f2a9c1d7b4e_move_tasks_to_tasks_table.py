@@ -0,0 +1,176 @@
+"""Move the tasks of each tasks list from a JSON blob to the tasks table
+
+The tasks are copied in batches of tasks lists, reading tasks_list only, so
+the application keeps running while the data is converted. The tasks of each
+blob replace the rows already in the tasks table: missing tasks are inserted,
+edited tasks are updated and tasks deleted from the blob are deleted. This
+makes the upgrade safe to run again to catch up on the changes made by
+instances still running the previous release, as long as the new release
+keeps the blobs in sync with TASKS_LEGACY_COLUMN_WRITES. Lists created
+without it have an empty object instead of a list and are left as they are. The legacy tasks_list.tasks
+column is left in place and can be dropped once every instance runs on the
+tasks table.
+
+Revision ID: 3f2a9c1d7b4e
+Revises:
+Create Date: 2026-10-17 10:12:45.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3f2a9c1d7b4e"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+tasks_list_table = sa.table(
+    "tasks_list", sa.column("id", sa.Integer), sa.column("tasks", sa.Text)
+)
+tasks_table = sa.table(
+    "tasks",
+    sa.column("tasks_list_id", sa.Integer),
+    sa.column("task_id", sa.Integer),
+    sa.column("description", sa.Text),
+    sa.column("is_done", sa.Boolean),
+    sa.column("created_at", sa.Float),
+    sa.column("completed_at", sa.Float),
+)
+
+
+def get_task_values(task):
+    """Returns the values of a task of a blob or a row of the tasks table."""
+    return {
+        "description": task.get("description"),
+        "is_done": bool(task.get("is_done")),
+        "created_at": task.get("created_at"),
+        "completed_at": task.get("completed_at"),
+    }
+
+
+def upgrade():
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+
+    if "tasks" not in inspector.get_table_names():
+        op.create_table(
+            "tasks",
+            sa.Column("tasks_list_id", sa.Integer(), nullable=False),
+            sa.Column("task_id", sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("is_done", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.Float(), nullable=True),
+            sa.Column("completed_at", sa.Float(), nullable=True),
+            sa.ForeignKeyConstraint(["tasks_list_id"], ["tasks_list.id"]),
+            sa.PrimaryKeyConstraint("tasks_list_id", "task_id"),
+        )
+        op.create_index("ix_tasks_is_done", "tasks", ["is_done"], unique=False)
+
+    # databases created after this release never had the JSON column
+    if "tasks" not in {c["name"] for c in inspector.get_columns("tasks_list")}:
+        return
+
+    last_id = 0
+    while True:
+        tasks_lists = connection.execute(
+            sa.select([tasks_list_table.c.id, tasks_list_table.c.tasks])
+            .where(tasks_list_table.c.id > last_id)
+            .order_by(tasks_list_table.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not tasks_lists:
+            break
+        last_id = tasks_lists[-1].id
+
+        # (tasks list id, task id): values of the tasks already converted
+        converted_tasks = {
+            (row.tasks_list_id, row.task_id): get_task_values(dict(row))
+            for row in connection.execute(
+                sa.select([tasks_table]).where(
+                    tasks_table.c.tasks_list_id.in_([row.id for row in tasks_lists])
+                )
+            )
+        }
+
+        rows = []
+        for tasks_list in tasks_lists:
+            if not tasks_list.tasks:
+                continue
+            try:
+                tasks = json.loads(tasks_list.tasks)
+            except ValueError:
+                continue
+            # lists created without the legacy column writes have no list of tasks
+            if not isinstance(tasks, list):
+                continue
+
+            for task in tasks:
+                values = get_task_values(task)
+                key = (tasks_list.id, task["id"])
+                if key not in converted_tasks:
+                    rows.append(
+                        dict(values, tasks_list_id=tasks_list.id, task_id=task["id"])
+                    )
+                elif values != converted_tasks[key]:
+                    connection.execute(
+                        tasks_table.update()
+                        .where(tasks_table.c.tasks_list_id == tasks_list.id)
+                        .where(tasks_table.c.task_id == task["id"])
+                        .values(**values)
+                    )
+
+            deleted_task_ids = {
+                task_id
+                for tasks_list_id, task_id in converted_tasks
+                if tasks_list_id == tasks_list.id
+            } - {task["id"] for task in tasks}
+            if deleted_task_ids:
+                connection.execute(
+                    tasks_table.delete()
+                    .where(tasks_table.c.tasks_list_id == tasks_list.id)
+                    .where(tasks_table.c.task_id.in_(deleted_task_ids))
+                )
+
+        if rows:
+            connection.execute(tasks_table.insert(), rows)
+
+
+def downgrade():
+    connection = op.get_bind()
+
+    if "tasks" not in {
+        c["name"] for c in sa.inspect(connection).get_columns("tasks_list")
+    }:
+        op.add_column("tasks_list", sa.Column("tasks", sa.Text(), nullable=True))
+
+    tasks_by_list = {}
+    for task in connection.execute(
+        sa.select([tasks_table]).order_by(
+            tasks_table.c.tasks_list_id, tasks_table.c.task_id
+        )
+    ):
+        tasks_by_list.setdefault(task.tasks_list_id, []).append(
+            {
+                "id": task.task_id,
+                "description": task.description,
+                "is_done": task.is_done,
+                "created_at": task.created_at,
+                "completed_at": task.completed_at,
+            }
+        )
+
+    for tasks_list_id, tasks in tasks_by_list.items():
+        connection.execute(
+            tasks_list_table.update()
+            .where(tasks_list_table.c.id == tasks_list_id)
+            .values(tasks=json.dumps(tasks))
+        )
+
+    op.drop_index("ix_tasks_is_done", table_name="tasks")
+    op.drop_table("tasks")
@@ -0,0 +1,30 @@
+"""Add an index over the state and end date of mentorship relations
+
+Revision ID: 8c41e0b5d2a7
+Revises: 3f2a9c1d7b4e
+Create Date: 2026-10-17 11:03:27.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8c41e0b5d2a7"
+down_revision = "3f2a9c1d7b4e"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_mentorship_relations_state_end_date"
+
+
+def upgrade():
+    indexes = sa.inspect(op.get_bind()).get_indexes("mentorship_relations")
+    if INDEX_NAME not in {index["name"] for index in indexes}:
+        op.create_index(
+            INDEX_NAME, "mentorship_relations", ["state", "end_date"], unique=False
+        )
+
+
+def downgrade():
+    op.drop_index(INDEX_NAME, table_name="mentorship_relations")
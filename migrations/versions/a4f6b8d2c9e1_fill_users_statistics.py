@@ -0,0 +1,118 @@
+"""Fill the statistics of the existing users
+
+The statistics of a user are created with the user. This creates the
+statistics of the users created before, in batches, counting their relations
+by state. Their achievements are computed on their next read.
+
+The downgrade is intentionally a no-op: the filled rows cannot be told apart
+from the ones created with the users, and the previous revisions keep working
+with them.
+
+Revision ID: a4f6b8d2c9e1
+Revises: d7a3c5e9f1b2
+Create Date: 2026-10-17 22:31:17.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a4f6b8d2c9e1"
+down_revision = "d7a3c5e9f1b2"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# counter of users_statistics matching each relation state
+STATE_COUNTERS = {
+    "PENDING": "pending_requests",
+    "ACCEPTED": "accepted_requests",
+    "REJECTED": "rejected_requests",
+    "COMPLETED": "completed_relations",
+    "CANCELLED": "cancelled_relations",
+}
+
+users = sa.table("users", sa.column("id", sa.Integer))
+mentorship_relations = sa.table(
+    "mentorship_relations",
+    sa.column("mentor_id", sa.Integer),
+    sa.column("mentee_id", sa.Integer),
+    sa.column("state", sa.String),
+)
+users_statistics = sa.table(
+    "users_statistics",
+    sa.column("user_id", sa.Integer),
+    sa.column("achievements", sa.Text),
+    sa.column("is_achievements_outdated", sa.Boolean),
+    *[sa.column(counter, sa.Integer) for counter in STATE_COUNTERS.values()],
+)
+
+
+def count_relations(connection, user_ids):
+    """Returns the number of relations of each user, by counter."""
+    counts = {
+        user_id: dict.fromkeys(STATE_COUNTERS.values(), 0) for user_id in user_ids
+    }
+    for user_column in (
+        mentorship_relations.c.mentor_id,
+        mentorship_relations.c.mentee_id,
+    ):
+        for user_id, state, count in connection.execute(
+            sa.select([user_column, mentorship_relations.c.state, sa.func.count()])
+            .where(user_column.in_(user_ids))
+            .group_by(user_column, mentorship_relations.c.state)
+        ):
+            counts[user_id][STATE_COUNTERS[state]] += count
+    return counts
+
+
+def upgrade():
+    connection = op.get_bind()
+    if "users_statistics" not in sa.inspect(connection).get_table_names():
+        op.create_table(
+            "users_statistics",
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            *[
+                sa.Column(counter, sa.Integer(), nullable=False)
+                for counter in STATE_COUNTERS.values()
+            ],
+            sa.Column("achievements", sa.Text(), nullable=True),
+            sa.Column("is_achievements_outdated", sa.Boolean(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("user_id"),
+        )
+
+    last_id = 0
+    while True:
+        user_ids = [
+            user_id
+            for user_id, in connection.execute(
+                sa.select([users.c.id])
+                .where(users.c.id > last_id)
+                .where(~sa.exists().where(users_statistics.c.user_id == users.c.id))
+                .order_by(users.c.id)
+                .limit(BATCH_SIZE)
+            )
+        ]
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+
+        rows = [
+            dict(
+                counters,
+                user_id=user_id,
+                achievements="[]",
+                is_achievements_outdated=True,
+            )
+            for user_id, counters in count_relations(connection, user_ids).items()
+        ]
+        connection.execute(users_statistics.insert(), rows)
+
+
+def downgrade():
+    # intentionally a no-op, see the docstring of the revision
+    pass
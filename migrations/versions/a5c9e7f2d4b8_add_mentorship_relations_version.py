@@ -0,0 +1,33 @@
+"""Add the version of mentorship relations
+
+Revision ID: a5c9e7f2d4b8
+Revises: f3b6c8d1a9e4
+Create Date: 2026-10-17 16:20:11.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a5c9e7f2d4b8"
+down_revision = "f3b6c8d1a9e4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {
+        column["name"] for column in inspector.get_columns("mentorship_relations")
+    }
+    if "version" not in columns:
+        with op.batch_alter_table("mentorship_relations") as batch_op:
+            batch_op.add_column(
+                sa.Column("version", sa.Integer(), nullable=False, server_default="1")
+            )
+
+
+def downgrade():
+    with op.batch_alter_table("mentorship_relations") as batch_op:
+        batch_op.drop_column("version")
@@ -0,0 +1,126 @@
+"""Add the users search indexes
+
+Creates and fills the users_search_grams table of the trigram search backend
+and, on Postgres with the pg_trgm extension installed, the GIN indexes of the
+pg_trgm search backend.
+
+Revision ID: b3d9f1e6a2c4
+Revises: e5f8a2c7b1d3
+Create Date: 2026-10-17 21:18:05.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b3d9f1e6a2c4"
+down_revision = "e5f8a2c7b1d3"
+branch_labels = None
+depends_on = None
+
+GRAM_SIZE = 3
+BATCH_SIZE = 1000
+
+# index name: indexed column of users
+TRIGRAM_INDEXES = {
+    "ix_users_name_trgm": "name",
+    "ix_users_username_trgm": "username",
+}
+
+users = sa.table(
+    "users",
+    sa.column("id", sa.Integer),
+    sa.column("name", sa.String),
+    sa.column("username", sa.String),
+)
+users_search_grams = sa.table(
+    "users_search_grams",
+    sa.column("gram", sa.String),
+    sa.column("user_id", sa.Integer),
+)
+
+
+def get_grams(text):
+    """Returns the set of lowercase trigrams of text, as the app indexes them."""
+    if not text:
+        return set()
+    text = text.lower()
+    return {text[i : i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def fill_users_search_grams(connection):
+    """Indexes the users in batches, replacing their existing entries."""
+    last_id = 0
+    while True:
+        batch = connection.execute(
+            sa.select([users.c.id, users.c.name, users.c.username])
+            .where(users.c.id > last_id)
+            .order_by(users.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        connection.execute(
+            users_search_grams.delete().where(
+                users_search_grams.c.user_id.in_([user.id for user in batch])
+            )
+        )
+        rows = [
+            {"gram": gram, "user_id": user.id}
+            for user in batch
+            for gram in get_grams(user.name) | get_grams(user.username)
+        ]
+        if rows:
+            connection.execute(users_search_grams.insert(), rows)
+
+
+def is_pg_trgm_installed(connection):
+    if connection.dialect.name != "postgresql":
+        return False
+    installed = connection.execute(
+        "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+    ).scalar()
+    return installed is not None
+
+
+def upgrade():
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    if "users_search_grams" not in inspector.get_table_names():
+        op.create_table(
+            "users_search_grams",
+            sa.Column("gram", sa.String(length=3), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("gram", "user_id"),
+        )
+        op.create_index(
+            "ix_users_search_grams_user_id",
+            "users_search_grams",
+            ["user_id"],
+            unique=False,
+        )
+    fill_users_search_grams(connection)
+
+    if is_pg_trgm_installed(connection):
+        # built without locking the writes of users, which cannot be done
+        # inside the transaction of the migration
+        with op.get_context().autocommit_block():
+            for index_name, column in TRIGRAM_INDEXES.items():
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON users "
+                    f"USING gin (lower({column}) gin_trgm_ops)"
+                )
+
+
+def downgrade():
+    connection = op.get_bind()
+    if is_pg_trgm_installed(connection):
+        with op.get_context().autocommit_block():
+            for index_name in TRIGRAM_INDEXES:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+    op.drop_index("ix_users_search_grams_user_id", table_name="users_search_grams")
+    op.drop_table("users_search_grams")
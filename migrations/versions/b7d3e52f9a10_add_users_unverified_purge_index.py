@@ -0,0 +1,33 @@
+"""Add an index over the email verification and registration date of users
+
+Revision ID: b7d3e52f9a10
+Revises: 8c41e0b5d2a7
+Create Date: 2026-10-17 11:41:09.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b7d3e52f9a10"
+down_revision = "8c41e0b5d2a7"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_users_is_email_verified_registration_date"
+
+
+def upgrade():
+    indexes = sa.inspect(op.get_bind()).get_indexes("users")
+    if INDEX_NAME not in {index["name"] for index in indexes}:
+        op.create_index(
+            INDEX_NAME,
+            "users",
+            ["is_email_verified", "registration_date"],
+            unique=False,
+        )
+
+
+def downgrade():
+    op.drop_index(INDEX_NAME, table_name="users")
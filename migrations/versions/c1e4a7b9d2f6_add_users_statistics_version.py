@@ -0,0 +1,36 @@
+"""Add the version of users statistics
+
+Revision ID: c1e4a7b9d2f6
+Revises: a5c9e7f2d4b8
+Create Date: 2026-10-17 17:05:42.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c1e4a7b9d2f6"
+down_revision = "a5c9e7f2d4b8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "users_statistics" not in inspector.get_table_names():
+        # created with the version column by the app
+        return
+    columns = {column["name"] for column in inspector.get_columns("users_statistics")}
+    if "version" not in columns:
+        with op.batch_alter_table("users_statistics") as batch_op:
+            batch_op.add_column(
+                sa.Column("version", sa.Integer(), nullable=False, server_default="1")
+            )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "users_statistics" in inspector.get_table_names():
+        with op.batch_alter_table("users_statistics") as batch_op:
+            batch_op.drop_column("version")
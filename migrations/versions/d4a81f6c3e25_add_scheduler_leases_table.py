@@ -0,0 +1,31 @@
+"""Add the scheduler_leases table
+
+Revision ID: d4a81f6c3e25
+Revises: b7d3e52f9a10
+Create Date: 2026-10-17 12:20:51.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d4a81f6c3e25"
+down_revision = "b7d3e52f9a10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if "scheduler_leases" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "scheduler_leases",
+            sa.Column("name", sa.String(length=80), nullable=False),
+            sa.Column("owner", sa.String(length=120), nullable=False),
+            sa.Column("expires_at", sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint("name"),
+        )
+
+
+def downgrade():
+    op.drop_table("scheduler_leases")
@@ -0,0 +1,39 @@
+"""Widen the password hash of users
+
+The hashes of the pbkdf2:sha512 method are longer than the previous 100
+characters of the column.
+
+Revision ID: d7a3c5e9f1b2
+Revises: b3d9f1e6a2c4
+Create Date: 2026-10-17 22:04:51.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d7a3c5e9f1b2"
+down_revision = "b3d9f1e6a2c4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column(
+            "password_hash",
+            existing_type=sa.String(length=100),
+            type_=sa.String(length=255),
+            existing_nullable=True,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column(
+            "password_hash",
+            existing_type=sa.String(length=255),
+            type_=sa.String(length=100),
+            existing_nullable=True,
+        )
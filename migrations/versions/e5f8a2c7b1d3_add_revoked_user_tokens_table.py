@@ -0,0 +1,45 @@
+"""Add the revoked_user_tokens table
+
+Revision ID: e5f8a2c7b1d3
+Revises: c1e4a7b9d2f6
+Create Date: 2026-10-17 19:42:13.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e5f8a2c7b1d3"
+down_revision = "c1e4a7b9d2f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "revoked_user_tokens" not in inspector.get_table_names():
+        op.create_table(
+            "revoked_user_tokens",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("revoked_at", sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        existing_indexes = set()
+    else:
+        existing_indexes = {
+            index["name"] for index in inspector.get_indexes("revoked_user_tokens")
+        }
+    if "ix_revoked_user_tokens_revoked_at" not in existing_indexes:
+        op.create_index(
+            "ix_revoked_user_tokens_revoked_at",
+            "revoked_user_tokens",
+            ["revoked_at"],
+            unique=False,
+        )
+
+
+def downgrade():
+    op.drop_index("ix_revoked_user_tokens_revoked_at", table_name="revoked_user_tokens")
+    op.drop_table("revoked_user_tokens")
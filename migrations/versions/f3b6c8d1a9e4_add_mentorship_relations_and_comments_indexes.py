@@ -0,0 +1,51 @@
+"""Add the indexes of mentorship relations and task comments lookups
+
+Revision ID: f3b6c8d1a9e4
+Revises: e92c07a4b3f1
+Create Date: 2026-10-17 14:02:36.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f3b6c8d1a9e4"
+down_revision = "e92c07a4b3f1"
+branch_labels = None
+depends_on = None
+
+# index name: (table, columns)
+# (state, end_date) of mentorship_relations is created by revision 8c41e0b5d2a7
+INDEXES = {
+    "ix_mentorship_relations_mentor_id_state": (
+        "mentorship_relations",
+        ["mentor_id", "state"],
+    ),
+    "ix_mentorship_relations_mentee_id_state": (
+        "mentorship_relations",
+        ["mentee_id", "state"],
+    ),
+    "ix_tasks_comments_task_id_relation_id": (
+        "tasks_comments",
+        ["task_id", "relation_id"],
+    ),
+    "ix_tasks_comments_user_id": ("tasks_comments", ["user_id"]),
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing_indexes = {
+        index["name"]
+        for table in {table for table, _ in INDEXES.values()}
+        for index in inspector.get_indexes(table)
+    }
+    for index_name, (table, columns) in INDEXES.items():
+        if index_name not in existing_indexes:
+            op.create_index(index_name, table, columns, unique=False)
+
+
+def downgrade():
+    for index_name, (table, _) in INDEXES.items():
+        op.drop_index(index_name, table_name=table)
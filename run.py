@@ -28,9 +28,13 @@ def create_app(config_filename: str) -> Flask:
 
     mail.init_app(app)
 
+    from app.utils.query_stats_utils import init_query_stats
+
+    init_query_stats(app)
+
     from app.schedulers.background_scheduler import init_schedulers
 
-    init_schedulers()
+    init_schedulers(app)
 
     return app
 
@@ -45,5 +49,12 @@ def create_tables():
     db.create_all()
 
 
+@application.before_first_request
+def start_email_outbox_workers():
+    from app.schedulers.email_outbox_worker import init_email_outbox_workers
+
+    init_email_outbox_workers(application)
+
+
 if __name__ == "__main__":
     application.run(port=5000)
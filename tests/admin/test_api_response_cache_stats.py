@@ -0,0 +1,64 @@
+import unittest
+from http import HTTPStatus
+
+from flask import json
+
+from app import messages
+from app.database.models.user import UserModel
+from app.database.sqlalchemy_extension import db
+from tests.base_test_case import BaseTestCase
+from tests.test_data import user1
+from tests.test_utils import get_test_request_header
+
+
+class TestResponseCacheStatsApi(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.normal_user = UserModel(
+            name=user1["name"],
+            email=user1["email"],
+            username=user1["username"],
+            password=user1["password"],
+            terms_and_conditions_checked=user1["terms_and_conditions_checked"],
+        )
+        self.normal_user.is_email_verified = True
+        db.session.add(self.normal_user)
+        db.session.commit()
+
+    def get_stats(self):
+        response = self.client.get(
+            "/admin/response_cache_stats",
+            headers=get_test_request_header(self.admin_user.id),
+        )
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        return json.loads(response.data)
+
+    def test_admin_gets_hit_ratio(self):
+        stats = self.get_stats()
+        home_stats = stats["resources"].get("home", {"hits": 0, "misses": 0})
+
+        header = get_test_request_header(self.normal_user.id)
+        for _ in range(2):
+            self.client.get("/home", headers=header)
+
+        new_stats = self.get_stats()
+        new_home_stats = new_stats["resources"]["home"]
+        hits, misses = new_home_stats["hits"], new_home_stats["misses"]
+        self.assertEqual(home_stats["hits"] + 1, hits)
+        self.assertEqual(home_stats["misses"] + 1, misses)
+        self.assertEqual(hits / (hits + misses), new_home_stats["hit_ratio"])
+        self.assertEqual(stats["hits"] + 1, new_stats["hits"])
+
+    def test_user_cannot_get_stats(self):
+        response = self.client.get(
+            "/admin/response_cache_stats",
+            headers=get_test_request_header(self.normal_user.id),
+        )
+
+        self.assertEqual(HTTPStatus.FORBIDDEN, response.status_code)
+        self.assertEqual(messages.USER_IS_NOT_AN_ADMIN, json.loads(response.data))
+
+
+if __name__ == "__main__":
+    unittest.main()
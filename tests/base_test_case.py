@@ -1,5 +1,8 @@
 from flask_testing import TestCase
 
+from app.api.jwt_cache import clear_jwt_caches
+from app.api.rate_limit import clear_rate_limits
+from app.api.response_cache import clear_response_cache
 from app.database.models.user import UserModel
 from run import application
 from app.database.sqlalchemy_extension import db
@@ -19,6 +22,10 @@ class BaseTestCase(TestCase):
 
     def setUp(self):
         db.create_all()
+        # the ids of the users and relations are reused by every test
+        clear_response_cache()
+        clear_rate_limits()
+        clear_jwt_caches()
 
         self.admin_user = UserModel(
             name=test_admin_user["name"],
@@ -4,8 +4,13 @@ from unittest.mock import patch
 
 import config
 from app.database.models.user import UserModel
+from app.database.models.user_search_gram import UserSearchGramModel
+from app.database.models.user_statistics import UserStatisticsModel
 from app.database.sqlalchemy_extension import db
-from app.schedulers.delete_unverified_users_cron_job import delete_unverified_users_job
+from app.schedulers.delete_unverified_users_cron_job import (
+    delete_unverified_users,
+    delete_unverified_users_job,
+)
 from tests.base_test_case import BaseTestCase
 from tests.test_data import user1, user2, user3
 
@@ -61,12 +66,43 @@ class TestDeleteUnverifiedUsersCronFunction(BaseTestCase):
         self.assertEqual(self.new_unverified_user, new_unverified)
         self.assertEqual(self.old_unverified_user, old_unverified)
 
+        old_unverified_id = self.old_unverified_user.id
         delete_unverified_users_job()
 
         verified = UserModel.find_by_id(self.verified_user.id)
         new_unverified = UserModel.find_by_id(self.new_unverified_user.id)
-        old_unverified = UserModel.find_by_id(self.old_unverified_user.id)
+        old_unverified = UserModel.find_by_id(old_unverified_id)
 
         self.assertEqual(self.verified_user, verified)
         self.assertEqual(self.new_unverified_user, new_unverified)
         self.assertIsNone(old_unverified)
+
+    def test_dry_run_does_not_delete(self):
+        self.assertEqual(1, delete_unverified_users(dry_run=True))
+
+        self.assertIsNotNone(UserModel.find_by_id(self.old_unverified_user.id))
+
+    def test_delete_in_batches(self):
+        threshold = config.BaseConfig.UNVERIFIED_USER_THRESHOLD
+        for index in range(4):
+            user = UserModel(
+                name=f"Spam User {index}",
+                email=f"spam{index}@example.com",
+                username=f"spam_user_{index}",
+                password="spam password",
+                terms_and_conditions_checked=True,
+            )
+            user.registration_date = time.time() - threshold - 1
+            db.session.add(user)
+        db.session.commit()
+        old_user_id = self.old_unverified_user.id
+        users_count = UserModel.query.count()
+
+        self.assertEqual(5, delete_unverified_users(batch_size=2))
+
+        self.assertEqual(users_count - 5, UserModel.query.count())
+        self.assertIsNone(UserStatisticsModel.query.get(old_user_id))
+        self.assertEqual(
+            0, UserSearchGramModel.query.filter_by(user_id=old_user_id).count()
+        )
+        self.assertEqual(0, delete_unverified_users(dry_run=True))
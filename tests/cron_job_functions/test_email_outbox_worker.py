@@ -0,0 +1,155 @@
+import asyncore
+import smtpd
+import socket
+import threading
+import unittest
+from http import HTTPStatus
+
+from flask import json
+
+from app.api.email_utils import send_email
+from app.api.mail_extension import mail
+from app.database.models.email_outbox import EmailOutboxModel
+from app.database.models.user import UserModel
+from app.database.sqlalchemy_extension import db
+from app.schedulers.email_outbox_worker import deliver_outbox_emails
+from app.utils.enum_utils import EmailStatus
+from tests.base_test_case import BaseTestCase
+from tests.test_data import user1
+
+
+class LocalSMTPServer(smtpd.SMTPServer):
+    """SMTP server standing in for the mail server, keeping what it receives."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), None, decode_data=True)
+        self.port = self.socket.getsockname()[1]
+        self.connections_count = 0
+        self.messages = []
+
+    def handle_accepted(self, conn, addr):
+        self.connections_count += 1
+        super().handle_accepted(conn, addr)
+
+    def process_message(self, peer, mailfrom, rcpttos, data, **kwargs):
+        self.messages.append((rcpttos, data))
+
+
+def get_free_port():
+    with socket.socket() as free_socket:
+        free_socket.bind(("127.0.0.1", 0))
+        return free_socket.getsockname()[1]
+
+
+class TestEmailOutboxWorker(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.smtp_server = LocalSMTPServer()
+        self.smtp_thread = threading.Thread(
+            target=asyncore.loop, kwargs={"timeout": 0.05}, daemon=True
+        )
+        self.smtp_thread.start()
+
+        self.app_mail_state = self.app.extensions["mail"]
+        self.use_mail_server(self.smtp_server.port)
+        self.app.config["MOCK_EMAIL"] = False
+
+    def tearDown(self):
+        self.app.config["MOCK_EMAIL"] = True
+        self.app.extensions["mail"] = self.app_mail_state
+        self.smtp_server.close()
+        self.smtp_thread.join()
+        super().tearDown()
+
+    def use_mail_server(self, port):
+        self.app.extensions["mail"] = mail.init_mail(
+            {
+                "MAIL_SERVER": "127.0.0.1",
+                "MAIL_PORT": port,
+                "MAIL_DEFAULT_SENDER": "sender@example.com",
+            }
+        )
+
+    def send_email(self, recipient):
+        """Queues an email and commits it, as the change sending it does."""
+        send_email(recipient, "Subject", "<p>Body</p>")
+        db.session.commit()
+
+    def test_send_email_only_writes_to_outbox(self):
+        self.send_email("recipient@example.com")
+
+        email = EmailOutboxModel.query.one()
+        self.assertEqual(EmailStatus.PENDING, email.status)
+        self.assertEqual("recipient@example.com", email.recipient)
+        self.assertEqual([], self.smtp_server.messages)
+
+    def test_email_is_rolled_back_with_its_transaction(self):
+        send_email("recipient@example.com", "Subject", "<p>Body</p>")
+        db.session.rollback()
+
+        self.assertEqual(0, EmailOutboxModel.query.count())
+
+    def test_email_is_committed_with_the_registered_user(self):
+        response = self.client.post(
+            "/register",
+            data=json.dumps(
+                dict(
+                    name=user1["name"],
+                    username=user1["username"],
+                    password=user1["password"],
+                    email=user1["email"],
+                    terms_and_conditions_checked=True,
+                )
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(HTTPStatus.CREATED, response.status_code)
+        db.session.remove()
+
+        self.assertIsNotNone(UserModel.find_by_email(user1["email"]))
+        email = EmailOutboxModel.query.one()
+        self.assertEqual(user1["email"], email.recipient)
+
+    def test_batch_is_delivered_over_one_connection(self):
+        for index in range(3):
+            self.send_email(f"recipient{index}@example.com")
+
+        self.assertEqual(3, deliver_outbox_emails(self.app))
+
+        self.assertEqual(3, len(self.smtp_server.messages))
+        self.assertEqual(1, self.smtp_server.connections_count)
+        for email in EmailOutboxModel.query.all():
+            self.assertEqual(EmailStatus.SENT, email.status)
+            self.assertIsNotNone(email.sent_at)
+        self.assertEqual(0, deliver_outbox_emails(self.app))
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        self.use_mail_server(get_free_port())
+        self.send_email("recipient@example.com")
+
+        self.assertEqual(1, deliver_outbox_emails(self.app))
+
+        email = EmailOutboxModel.query.one()
+        self.assertEqual(EmailStatus.PENDING, email.status)
+        self.assertEqual(1, email.attempts)
+        self.assertIsNotNone(email.last_error)
+        # the email is not due again before the retry delay
+        self.assertEqual(0, deliver_outbox_emails(self.app))
+
+    def test_email_fails_after_max_attempts(self):
+        self.use_mail_server(get_free_port())
+        self.app.config["EMAIL_RETRY_DELAY"] = 0
+        self.send_email("recipient@example.com")
+
+        for _ in range(self.app.config["EMAIL_MAX_ATTEMPTS"]):
+            deliver_outbox_emails(self.app)
+        self.app.config["EMAIL_RETRY_DELAY"] = 30
+
+        email = EmailOutboxModel.query.one()
+        self.assertEqual(EmailStatus.FAILED, email.status)
+        self.assertEqual(self.app.config["EMAIL_MAX_ATTEMPTS"], email.attempts)
+
+
+if __name__ == "__main__":
+    unittest.main()
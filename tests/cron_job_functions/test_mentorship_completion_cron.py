@@ -5,7 +5,9 @@ from unittest.mock import patch
 from app.database.models.tasks_list import TasksListModel
 from app.database.sqlalchemy_extension import db
 from app.database.models.mentorship_relation import MentorshipRelationModel
+from app.api.dao.user import UserDAO
 from app.schedulers.complete_mentorship_cron_job import (
+    complete_overdue_mentorship_relations,
     complete_overdue_mentorship_relations_job,
 )
 from app.utils.enum_utils import MentorshipRelationState
@@ -128,6 +130,45 @@ class TestCompleteMentorshipRelationCronFunction(BaseTestCase):
             MentorshipRelationState.ACCEPTED, self.mentorship_relation_3.state
         )
 
+    def test_complete_mentorship_relations_in_chunks(self):
+        for _ in range(4):
+            db.session.add(
+                MentorshipRelationModel(
+                    action_user_id=self.first_user.id,
+                    mentor_user=self.first_user,
+                    mentee_user=self.second_user,
+                    creation_date=self.now_datetime.timestamp(),
+                    end_date=self.past_end_date_example.timestamp(),
+                    state=MentorshipRelationState.ACCEPTED,
+                    notes=self.notes_example,
+                    tasks_list=TasksListModel(),
+                )
+            )
+        db.session.commit()
+
+        completed_count = complete_overdue_mentorship_relations(chunk_size=2)
+
+        self.assertEqual(5, completed_count)
+        self.assertEqual(
+            5,
+            MentorshipRelationModel.query.filter_by(
+                state=MentorshipRelationState.COMPLETED
+            ).count(),
+        )
+        self.assertEqual(
+            MentorshipRelationState.ACCEPTED, self.mentorship_relation_3.state
+        )
+        self.assertEqual(0, complete_overdue_mentorship_relations())
+
+    def test_complete_mentorship_relations_updates_statistics(self):
+        complete_overdue_mentorship_relations()
+
+        for user_id in (self.first_user.id, self.second_user.id):
+            statistics = UserDAO.get_user_statistics(user_id)
+            self.assertEqual(1, statistics["accepted_requests"])
+            self.assertEqual(1, statistics["completed_relations"])
+            self.assertEqual(1, statistics["pending_requests"])
+
 
 if __name__ == "__main__":
     unittest.main()
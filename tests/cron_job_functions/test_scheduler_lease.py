@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.database.models.scheduler_lease import SchedulerLeaseModel
+from app.schedulers.background_scheduler import run_on_leader
+from tests.base_test_case import BaseTestCase
+
+
+class TestSchedulerLease(BaseTestCase):
+    def get_test_app(self):
+        return self.app
+
+    def test_lease_is_held_by_one_owner(self):
+        self.assertTrue(SchedulerLeaseModel.try_acquire("job", "worker-1", 60, 1000))
+        self.assertFalse(SchedulerLeaseModel.try_acquire("job", "worker-2", 60, 1010))
+        self.assertTrue(SchedulerLeaseModel.try_acquire("job", "worker-1", 60, 1020))
+        self.assertTrue(SchedulerLeaseModel.try_acquire("other", "worker-2", 60, 1020))
+
+    def test_expired_lease_is_taken_over(self):
+        self.assertTrue(SchedulerLeaseModel.try_acquire("job", "worker-1", 60, 1000))
+
+        self.assertTrue(SchedulerLeaseModel.try_acquire("job", "worker-2", 60, 1061))
+        self.assertFalse(SchedulerLeaseModel.try_acquire("job", "worker-1", 60, 1062))
+
+    @patch("run.application", side_effect=get_test_app)
+    def test_job_runs_only_on_leader(self, get_test_app_fn):
+        SchedulerLeaseModel.try_acquire("job", "another-worker", 60)
+        job = MagicMock()
+
+        run_on_leader("job", job)()
+        job.assert_not_called()
+
+        run_on_leader("free_job", job)()
+        job.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,11 +5,13 @@ from http import HTTPStatus
 
 from flask_restx import marshal
 
+from app import messages
 from app.api.models.mentorship_relation import mentorship_request_response_body
 from app.database.models.tasks_list import TasksListModel
 from app.database.sqlalchemy_extension import db
 from app.database.models.mentorship_relation import MentorshipRelationModel
 from app.utils.enum_utils import MentorshipRelationState
+from app.utils.pagination_utils import NEXT_CURSOR_HEADER, encode_cursor
 from tests.mentorship_relation.relation_base_setup import MentorshipRelationBaseTestCase
 from tests.test_utils import get_test_request_header
 
@@ -245,6 +247,83 @@ class TestListMentorshipRelationsApi(MentorshipRelationBaseTestCase):
             self.assertEqual(HTTPStatus.BAD_REQUEST, response.status_code)
             self.assertEqual(expected_response, json.loads(response.data))
 
+    def list_relation_ids(self, query_string):
+        response = self.client.get(
+            f"/mentorship_relations?{query_string}",
+            headers=get_test_request_header(self.second_user.id),
+        )
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        ids = [relation["id"] for relation in json.loads(response.data)]
+        return ids, response.headers.get(NEXT_CURSOR_HEADER)
+
+    def test_list_mentorship_relations_with_cursor_pagination(self):
+        first_page, cursor = self.list_relation_ids("limit=2")
+        self.assertEqual(
+            [
+                self.past_mentorship_relation.id,
+                self.future_pending_mentorship_relation.id,
+            ],
+            first_page,
+        )
+        self.assertIsNotNone(cursor)
+
+        second_page, cursor = self.list_relation_ids(f"limit=2&cursor={cursor}")
+        self.assertEqual(
+            [
+                self.future_accepted_mentorship_relation.id,
+                self.admin_only_mentorship_relation.id,
+            ],
+            second_page,
+        )
+
+        last_page, cursor = self.list_relation_ids(f"limit=2&cursor={cursor}")
+        self.assertEqual([], last_page)
+        self.assertIsNone(cursor)
+
+    def test_list_mentorship_relations_by_creation_date_desc(self):
+        self.past_mentorship_relation.creation_date -= 20
+        self.future_pending_mentorship_relation.creation_date += 10
+        db.session.commit()
+
+        ids, cursor = self.list_relation_ids(
+            "relation_state=pending&order=creation_date_desc&limit=1"
+        )
+        self.assertEqual([self.future_pending_mentorship_relation.id], ids)
+
+        ids, _ = self.list_relation_ids(
+            f"relation_state=pending&order=creation_date_desc&limit=1&cursor={cursor}"
+        )
+        self.assertEqual([self.past_mentorship_relation.id], ids)
+
+    def test_list_mentorship_relations_invalid_order_and_cursor(self):
+        for query_string, message in (
+            ("order=invalid", messages.INVALID_RELATIONS_ORDER),
+            ("cursor=invalid", messages.INVALID_CURSOR),
+            ("limit=0", messages.INVALID_RELATIONS_LIMIT),
+            ("limit=-1", messages.INVALID_RELATIONS_LIMIT),
+        ):
+            response = self.client.get(
+                f"/mentorship_relations?{query_string}",
+                headers=get_test_request_header(self.second_user.id),
+            )
+            self.assertEqual(HTTPStatus.BAD_REQUEST, response.status_code)
+            self.assertEqual(message, json.loads(response.data))
+
+    def test_list_mentorship_relations_after_relation_of_other_user(self):
+        # the relation of the admin and the second user is not one of the first user
+        cursor = encode_cursor(self.admin_only_mentorship_relation.id)
+        query_string = f"order=creation_date_desc&limit=1&cursor={cursor}"
+
+        response = self.client.get(
+            f"/mentorship_relations?{query_string}",
+            headers=get_test_request_header(self.first_user.id),
+        )
+        self.assertEqual(HTTPStatus.BAD_REQUEST, response.status_code)
+        self.assertEqual(messages.INVALID_CURSOR, json.loads(response.data))
+
+        ids, _ = self.list_relation_ids(query_string)
+        self.assertEqual(1, len(ids))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,195 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from app.api.dao.mentorship_relation import MentorshipRelationDAO
+from app.database.models.mentorship_relation import MentorshipRelationModel
+from app.database.models.tasks_list import TasksListModel
+from app.database.models.user import UserModel
+from app.database.models.user_statistics import UserStatisticsModel
+from app.database.sqlalchemy_extension import db
+from app.database.user_statistics import STATE_COUNTERS, count_relations
+from app.utils.enum_utils import MentorshipRelationState
+from tests.base_test_case import BaseTestCase
+from tests.test_data import user1, user2, user3, user4, user5
+
+ROUNDS = 5
+
+
+class TestConcurrentMentorshipStateChanges(BaseTestCase):
+    @classmethod
+    def create_app(cls):
+        app = super().create_app()
+        # the threads need their own connections to a shared database
+        cls.database_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        cls.database_file.close()
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{cls.database_file.name}"
+        # the writers wait for each other instead of failing as locked
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"timeout": 30}}
+        return app
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.database_file.name)
+
+    def setUp(self):
+        super().setUp()
+
+        self.users = []
+        for user_data in (user1, user2, user3, user4, user5):
+            user = UserModel(
+                name=user_data["name"],
+                email=user_data["email"],
+                username=user_data["username"],
+                password=user_data["password"],
+                terms_and_conditions_checked=True,
+            )
+            user.need_mentoring = True
+            user.available_to_mentor = True
+            user.is_email_verified = True
+            self.users.append(user)
+        db.session.add_all(self.users)
+        db.session.commit()
+        self.end_date = (datetime.utcnow() + timedelta(weeks=5)).timestamp()
+
+    def create_requests(self, mentor, mentees):
+        """Returns the ids of PENDING requests sent to the mentor by the mentees."""
+        requests = [
+            MentorshipRelationModel(
+                action_user_id=mentee.id,
+                mentor_user=mentor,
+                mentee_user=mentee,
+                creation_date=datetime.utcnow().timestamp(),
+                end_date=self.end_date,
+                state=MentorshipRelationState.PENDING,
+                notes="",
+                tasks_list=TasksListModel(),
+            )
+            for mentee in mentees
+        ]
+        db.session.add_all(requests)
+        db.session.commit()
+        return [request.id for request in requests]
+
+    def run_concurrently(self, actions):
+        """Runs each (function, user id, relation id) in its own thread.
+
+        Returns the HTTP status of each action, in the order of the actions.
+        """
+        statuses = [None] * len(actions)
+        errors = []
+        start = threading.Barrier(len(actions))
+
+        def run(index, action, user_id, relation_id):
+            with self.app.test_request_context():
+                start.wait()
+                try:
+                    statuses[index] = action(user_id, relation_id)[1]
+                except Exception as error:
+                    errors.append(error)
+                finally:
+                    db.session.remove()
+
+        threads = [
+            threading.Thread(target=run, args=(index, *action))
+            for index, action in enumerate(actions)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        db.session.expire_all()
+        self.assertEqual([], errors)
+        return statuses
+
+    def assert_relations_are_consistent(self):
+        for user in self.users:
+            accepted_count = MentorshipRelationModel.query.filter(
+                (MentorshipRelationModel.mentor_id == user.id)
+                | (MentorshipRelationModel.mentee_id == user.id),
+                MentorshipRelationModel.state == MentorshipRelationState.ACCEPTED,
+            ).count()
+            self.assertLessEqual(accepted_count, 1)
+
+            statistics = UserStatisticsModel.query.get(user.id)
+            relations_count = count_relations(user.id)
+            for state, counter in STATE_COUNTERS.items():
+                self.assertEqual(
+                    relations_count.get(state, 0), getattr(statistics, counter)
+                )
+
+    def test_concurrent_accepts_of_same_mentor(self):
+        mentor, mentees = self.users[0], self.users[1:]
+        for _ in range(ROUNDS):
+            request_ids = self.create_requests(mentor, mentees)
+
+            statuses = self.run_concurrently(
+                [
+                    (MentorshipRelationDAO.accept_request, mentor.id, request_id)
+                    for request_id in request_ids
+                ]
+            )
+
+            # the mentor is in a relation once one request is accepted
+            self.assertEqual(1, statuses.count(HTTPStatus.OK))
+            for status in statuses:
+                self.assertIn(
+                    status,
+                    (HTTPStatus.OK, HTTPStatus.CONFLICT, HTTPStatus.FORBIDDEN),
+                )
+            self.assert_relations_are_consistent()
+
+            # ends the accepted relation so the next round can accept one again
+            for relation in MentorshipRelationModel.query.filter_by(
+                state=MentorshipRelationState.ACCEPTED
+            ):
+                relation.state = MentorshipRelationState.COMPLETED
+            db.session.commit()
+
+    def test_concurrent_accept_reject_and_cancel(self):
+        mentor, mentee = self.users[0], self.users[1]
+        for _ in range(ROUNDS):
+            request_id = self.create_requests(mentor, [mentee])[0]
+
+            accept_status, reject_status, cancel_status = self.run_concurrently(
+                [
+                    (MentorshipRelationDAO.accept_request, mentor.id, request_id),
+                    (MentorshipRelationDAO.reject_request, mentor.id, request_id),
+                    (MentorshipRelationDAO.cancel_relation, mentee.id, request_id),
+                ]
+            )
+
+            # exactly one of accepting and rejecting the pending request succeeds
+            self.assertEqual(1, [accept_status, reject_status].count(HTTPStatus.OK))
+            for status in (accept_status, reject_status):
+                self.assertIn(
+                    status,
+                    (HTTPStatus.OK, HTTPStatus.CONFLICT, HTTPStatus.FORBIDDEN),
+                )
+            # the relation can only be cancelled once accepted
+            if accept_status == HTTPStatus.OK:
+                self.assertIn(
+                    cancel_status,
+                    (HTTPStatus.OK, HTTPStatus.CONFLICT, HTTPStatus.FORBIDDEN),
+                )
+            else:
+                self.assertEqual(HTTPStatus.FORBIDDEN, cancel_status)
+            self.assert_relations_are_consistent()
+
+            relation = MentorshipRelationModel.find_by_id(request_id)
+            expected_state = MentorshipRelationState.REJECTED
+            if cancel_status == HTTPStatus.OK:
+                expected_state = MentorshipRelationState.CANCELLED
+            elif accept_status == HTTPStatus.OK:
+                expected_state = MentorshipRelationState.ACCEPTED
+            self.assertEqual(expected_state, relation.state)
+            if relation.state == MentorshipRelationState.ACCEPTED:
+                relation.state = MentorshipRelationState.COMPLETED
+                db.session.commit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -144,6 +144,20 @@ class TestMentorshipRelationModel(BaseTestCase):
         )
         self.assertEqual(query_mentorship_relation, find_by_id_result)
 
+    def test_find_current_relation(self):
+        self.assertIsNone(
+            MentorshipRelationModel.find_current_relation(self.first_user.id)
+        )
+
+        self.mentorship_relation.state = MentorshipRelationState.ACCEPTED
+        db.session.commit()
+
+        for user_id in (self.first_user.id, self.second_user.id):
+            self.assertEqual(
+                self.mentorship_relation,
+                MentorshipRelationModel.find_current_relation(user_id),
+            )
+
     def test_empty_table(self):
         self.assertFalse(MentorshipRelationModel.is_empty())
         db.session.delete(self.mentorship_relation)
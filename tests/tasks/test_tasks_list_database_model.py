@@ -4,6 +4,7 @@ from datetime import datetime
 from app.database.models.tasks_list import TasksListModel
 from app.database.sqlalchemy_extension import db
 from tests.base_test_case import BaseTestCase
+from tests.test_utils import count_queries
 
 
 class TestTasksListModel(BaseTestCase):
@@ -155,6 +156,65 @@ class TestTasksListModel(BaseTestCase):
         new_task_1 = tasks_list_one.find_task_by_id(task_id=1)
         self.assertTrue(new_task_1.get("is_done"))
 
+    def test_update_task_does_not_load_other_tasks(self):
+        for _ in range(5):
+            self.tasks_list_1.add_task(self.test_description_2, self.now_timestamp)
+        db.session.commit()
+        db.session.expire_all()
+
+        tasks_list_one = TasksListModel.query.filter_by(id=2).first()
+        with count_queries() as statements:
+            tasks_list_one.update_task(task_id=3, is_done=True)
+
+        selects = [s for s in statements if s.startswith("SELECT")]
+        self.assertEqual(1, len(selects))
+        self.assertIn("tasks.task_id = ?", selects[0])
+        self.assertTrue(TasksListModel.find_by_id(2).find_task_by_id(3)["is_done"])
+        self.assertFalse(TasksListModel.find_by_id(2).find_task_by_id(4)["is_done"])
+
+    def get_legacy_tasks(self, tasks_list_id):
+        db.session.expire_all()
+        return TasksListModel.find_by_id(tasks_list_id).legacy_tasks
+
+    def test_legacy_column_is_kept_in_sync(self):
+        db.session.commit()
+        self.app.config["TASKS_LEGACY_COLUMN_WRITES"] = True
+        self.assertEqual([], TasksListModel().legacy_tasks)
+
+        tasks_list_two = TasksListModel.find_by_id(2)
+        tasks_list_two.add_task(self.test_description_2, self.now_timestamp)
+        tasks_list_two.save_to_db()
+        self.assertEqual(
+            [task["id"] for task in tasks_list_two.tasks],
+            [task["id"] for task in self.get_legacy_tasks(2)],
+        )
+
+        TasksListModel.find_by_id(2).update_task(task_id=1, is_done=True)
+        self.assertTrue(self.get_legacy_tasks(2)[0]["is_done"])
+
+        TasksListModel.find_by_id(2).delete_task(task_id=1)
+        self.assertEqual(
+            [
+                dict(
+                    completed_at=None,
+                    created_at=self.now_timestamp,
+                    description=self.test_description_2,
+                    id=2,
+                    is_done=False,
+                )
+            ],
+            self.get_legacy_tasks(2),
+        )
+
+    def test_legacy_column_is_not_written_by_default(self):
+        TasksListModel.find_by_id(1).add_task(
+            self.test_description_2, self.now_timestamp
+        )
+        db.session.commit()
+
+        # stored as an empty object, not a list of tasks
+        self.assertEqual({}, self.get_legacy_tasks(1))
+
 
 if __name__ == "__main__":
     unittest.main()
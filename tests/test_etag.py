@@ -0,0 +1,107 @@
+import unittest
+from http import HTTPStatus
+
+from flask import json
+
+from app.database.models.user import UserModel
+from app.database.models.user_statistics import UserStatisticsModel
+from app.database.sqlalchemy_extension import db
+from tests.tasks.tasks_base_setup import TasksBaseTestCase
+from tests.test_utils import count_queries, get_test_request_header
+
+
+class TestConditionalGet(TasksBaseTestCase):
+    def get(self, url, user_id, etag=None):
+        headers = get_test_request_header(user_id)
+        if etag:
+            headers["If-None-Match"] = etag
+        return self.client.get(url, headers=headers)
+
+    def test_unchanged_response_is_not_modified(self):
+        user_id = self.first_user.id
+        response = self.get("/dashboard", user_id)
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        etag = response.headers["ETag"]
+
+        with count_queries() as statements:
+            response = self.get("/dashboard", user_id, etag)
+
+        self.assertEqual(HTTPStatus.NOT_MODIFIED, response.status_code)
+        self.assertEqual(b"", response.data)
+        self.assertEqual(etag, response.headers["ETag"])
+        # only the version of the user is read
+        self.assertEqual(1, len(statements))
+
+    def test_task_creation_changes_other_user_etag(self):
+        relation_id = self.mentorship_relation_w_second_user.id
+        url = f"/mentorship_relation/{relation_id}/tasks"
+        etag = self.get(url, self.second_user.id).headers["ETag"]
+
+        self.client.post(
+            f"/mentorship_relation/{relation_id}/task",
+            headers=get_test_request_header(self.first_user.id),
+            content_type="application/json",
+            data=json.dumps(dict(description="new task")),
+        )
+        response = self.get(url, self.second_user.id, etag)
+
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        self.assertNotEqual(etag, response.headers["ETag"])
+
+    def test_profile_update_changes_other_user_etag(self):
+        dashboard_etag = self.get("/dashboard", self.second_user.id).headers["ETag"]
+
+        self.client.put(
+            "/user",
+            headers=get_test_request_header(self.first_user.id),
+            content_type="application/json",
+            data=json.dumps(dict(name="new name")),
+        )
+
+        response = self.get("/dashboard", self.second_user.id, dashboard_etag)
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        self.assertNotEqual(dashboard_etag, response.headers["ETag"])
+
+    def test_write_of_other_process_is_not_served_with_new_etag(self):
+        user_id = self.fourth_user.id
+        url = f"/users/{user_id}"
+        etag = self.get(url, self.first_user.id).headers["ETag"]
+
+        # written without the session events, as another process would have
+        users, statistics = UserModel.__table__, UserStatisticsModel.__table__
+        db.session.execute(
+            users.update().where(users.c.id == user_id).values(name="new name")
+        )
+        db.session.execute(
+            statistics.update()
+            .where(statistics.c.user_id == user_id)
+            .values(version=statistics.c.version + 1)
+        )
+        db.session.commit()
+
+        response = self.get(url, self.first_user.id, etag)
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        self.assertEqual("new name", json.loads(response.data)["name"])
+        new_etag = response.headers["ETag"]
+
+        response = self.get(url, self.first_user.id, new_etag)
+        self.assertEqual(HTTPStatus.NOT_MODIFIED, response.status_code)
+
+    def test_etag_depends_on_requesting_user(self):
+        url = f"/users/{self.fourth_user.id}"
+        first_etag = self.get(url, self.first_user.id).headers["ETag"]
+
+        response = self.get(url, self.second_user.id, first_etag)
+
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        self.assertNotEqual(first_etag, response.headers["ETag"])
+
+    def test_error_response_has_no_etag(self):
+        response = self.get("/mentorship_relation/100/tasks", self.first_user.id)
+
+        self.assertEqual(HTTPStatus.NOT_FOUND, response.status_code)
+        self.assertNotIn("ETag", response.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import time
+import unittest
+from http import HTTPStatus
+from unittest.mock import patch
+
+from flask import json
+from flask_jwt_extended import view_decorators
+from flask_jwt_extended.utils import decode_token
+
+from app import messages
+from app.api.jwt_cache import (
+    BloomFilter,
+    ClaimsCache,
+    decode_token_with_cache,
+    get_claims_cache,
+    revoke_user_tokens,
+)
+from app.database.models.revoked_user_tokens import RevokedUserTokensModel
+from app.database.models.user import UserModel
+from app.database.sqlalchemy_extension import db
+from tests.base_test_case import BaseTestCase
+from tests.test_data import user1, user2
+from tests.test_utils import get_test_request_header
+
+
+class TestClaimsCache(unittest.TestCase):
+    def test_claims_expire_with_token(self):
+        cache = ClaimsCache(max_entries=2)
+        cache.set("token", {"identity": 1, "exp": 1000})
+
+        with patch("app.api.jwt_cache.time.time", return_value=999):
+            self.assertEqual({"identity": 1, "exp": 1000}, cache.get("token"))
+        with patch("app.api.jwt_cache.time.time", return_value=1000):
+            self.assertIsNone(cache.get("token"))
+
+    def test_least_recently_used_claims_are_evicted(self):
+        cache = ClaimsCache(max_entries=2)
+        with patch("app.api.jwt_cache.time.time", return_value=0):
+            cache.set("a", {"exp": 1000})
+            cache.set("b", {"exp": 1000})
+            cache.get("a")
+            cache.set("c", {"exp": 1000})
+
+            self.assertIsNotNone(cache.get("a"))
+            self.assertIsNone(cache.get("b"))
+            self.assertIsNotNone(cache.get("c"))
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_added_values_are_contained(self):
+        bloom_filter = BloomFilter(size=1024, hashes=3)
+        for value in range(0, 100, 2):
+            bloom_filter.add(value)
+
+        self.assertTrue(all(value in bloom_filter for value in range(0, 100, 2)))
+        self.assertLess(sum(value in bloom_filter for value in range(1, 100, 2)), 10)
+
+
+class TestTokenRevocation(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.first_user = UserModel(
+            name=user1["name"],
+            email=user1["email"],
+            username=user1["username"],
+            password=user1["password"],
+            terms_and_conditions_checked=user1["terms_and_conditions_checked"],
+        )
+        self.second_user = UserModel(
+            name=user2["name"],
+            email=user2["email"],
+            username=user2["username"],
+            password=user2["password"],
+            terms_and_conditions_checked=user2["terms_and_conditions_checked"],
+        )
+        self.first_user.is_email_verified = True
+        self.second_user.is_email_verified = True
+        db.session.add_all([self.first_user, self.second_user])
+        db.session.commit()
+
+    def test_protected_views_decode_tokens_through_cache(self):
+        # fails if an upgrade of flask-jwt-extended bypasses the cache
+        self.assertIs(decode_token_with_cache, view_decorators.decode_token)
+        for url, method, refresh in (
+            ("/user", "get", False),
+            ("/refresh", "post", True),
+        ):
+            header = get_test_request_header(self.first_user.id, refresh=refresh)
+            with patch(
+                "app.api.jwt_cache.get_claims_cache", wraps=get_claims_cache
+            ) as get_cache:
+                response = getattr(self.client, method)(url, headers=header)
+
+            self.assertEqual(HTTPStatus.OK, response.status_code)
+            self.assertEqual(1, get_cache.call_count)
+
+    def test_token_is_verified_once(self):
+        header = get_test_request_header(self.first_user.id)
+
+        with patch("app.api.jwt_cache.decode_token", wraps=decode_token) as decode:
+            for _ in range(2):
+                response = self.client.get("/user", headers=header)
+                self.assertEqual(HTTPStatus.OK, response.status_code)
+
+        self.assertEqual(1, decode.call_count)
+
+    def test_tokens_of_deleted_user_are_revoked(self):
+        user_id = self.first_user.id
+        header = get_test_request_header(user_id)
+        refresh_header = get_test_request_header(user_id, refresh=True)
+        self.client.get("/user", headers=header)
+
+        response = self.client.delete("/user", headers=header)
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+        response = self.client.get("/user", headers=header)
+        self.assertEqual(HTTPStatus.UNAUTHORIZED, response.status_code)
+        self.assertEqual(messages.TOKEN_HAS_BEEN_REVOKED, json.loads(response.data))
+        response = self.client.post("/refresh", headers=refresh_header)
+        self.assertEqual(HTTPStatus.UNAUTHORIZED, response.status_code)
+
+        response = self.client.get(
+            "/user", headers=get_test_request_header(self.second_user.id)
+        )
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+    @staticmethod
+    def insert_revocation_of_other_process(**values):
+        """Commits a revocation without applying it to this process."""
+        db.session.execute(RevokedUserTokensModel.__table__.insert().values(**values))
+        db.session.commit()
+
+    def test_revocation_of_other_process_is_loaded_on_refresh(self):
+        header = get_test_request_header(self.first_user.id)
+        self.insert_revocation_of_other_process(
+            user_id=self.first_user.id, revoked_at=time.time()
+        )
+
+        response = self.client.get("/user", headers=header)
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+        self.app.config["JWT_REVOCATION_REFRESH_INTERVAL"] = 0
+        response = self.client.get("/user", headers=header)
+        self.assertEqual(HTTPStatus.UNAUTHORIZED, response.status_code)
+
+    def test_revocation_committed_out_of_order_is_loaded(self):
+        header = get_test_request_header(self.first_user.id)
+        self.app.config["JWT_REVOCATION_REFRESH_INTERVAL"] = 0
+        now = time.time()
+        self.insert_revocation_of_other_process(
+            id=10, user_id=self.second_user.id, revoked_at=now + 20
+        )
+        self.client.get("/user", headers=header)
+
+        # made before the loaded one, but committed after it with a lower id
+        self.insert_revocation_of_other_process(
+            id=5, user_id=self.first_user.id, revoked_at=now + 10
+        )
+
+        response = self.client.get("/user", headers=header)
+        self.assertEqual(HTTPStatus.UNAUTHORIZED, response.status_code)
+
+    def test_revocation_is_rolled_back_with_its_transaction(self):
+        header = get_test_request_header(self.first_user.id)
+
+        revoke_user_tokens(self.first_user.id)
+        db.session.flush()
+        db.session.rollback()
+
+        self.assertEqual(0, RevokedUserTokensModel.query.count())
+        response = self.client.get("/user", headers=header)
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+
+from app.api.dao.user import UserDAO
+from app.database.models.mentorship_relation import MentorshipRelationModel
+from app.database.models.task_comment import TaskCommentModel
+from app.database.sqlalchemy_extension import db
+from app.database.user_statistics import query_achievements
+from app.schedulers.complete_mentorship_cron_job import (
+    COMPLETE_RELATIONS_CHUNK_SIZE,
+    query_overdue_mentorship_relations,
+)
+from app.schedulers.delete_unverified_users_cron_job import (
+    DELETE_USERS_BATCH_SIZE,
+    query_unverified_users,
+    query_unverified_users_batch,
+)
+from app.utils.enum_utils import MentorshipRelationState
+from tests.base_test_case import BaseTestCase
+
+
+def explain(query) -> str:
+    """Returns the plan chosen by the database for the passed ORM query."""
+    statement = query.statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    if db.engine.dialect.name == "postgresql":
+        # tests tables are tiny, force the planner to consider the indexes
+        db.session.execute("SET LOCAL enable_seqscan = off")
+        rows = db.session.execute(f"EXPLAIN {statement}")
+        return "\n".join(row[0] for row in rows)
+
+    rows = db.session.execute(f"EXPLAIN QUERY PLAN {statement}")
+    return "\n".join(row[-1] for row in rows)
+
+
+class TestQueryPlans(BaseTestCase):
+    """Checks that the hot queries of the DAOs are served by an index.
+
+    The plans are built from the queries of the models, DAOs and cron jobs,
+    so a change of these queries is checked too.
+    """
+
+    def assertUsesIndex(self, index_name, query):
+        plan = explain(query)
+        self.assertIn(index_name, plan, f"{index_name} is not used by:\n{plan}")
+
+    def assertUsesUserIndexes(self, query):
+        self.assertUsesIndex("ix_mentorship_relations_mentor_id_state", query)
+        self.assertUsesIndex("ix_mentorship_relations_mentee_id_state", query)
+
+    def test_relations_of_a_user_use_an_index(self):
+        # lazy loads of the mentor_relations and mentee_relations backrefs
+        self.assertUsesIndex(
+            "ix_mentorship_relations_mentor_id_state",
+            MentorshipRelationModel.query.with_parent(
+                self.admin_user, "mentor_relations"
+            ),
+        )
+        self.assertUsesIndex(
+            "ix_mentorship_relations_mentee_id_state",
+            MentorshipRelationModel.query.with_parent(
+                self.admin_user, "mentee_relations"
+            ),
+        )
+
+    def test_relations_of_a_user_by_state_use_both_user_indexes(self):
+        for state in (None, MentorshipRelationState.ACCEPTED):
+            self.assertUsesUserIndexes(MentorshipRelationModel.query_by_user(1, state))
+
+    def test_users_in_accepted_relation_use_both_user_indexes(self):
+        self.assertUsesUserIndexes(
+            MentorshipRelationModel.query_users_in_accepted_relation([1, 2])
+        )
+
+    def test_dashboard_relations_use_both_user_indexes(self):
+        self.assertUsesUserIndexes(UserDAO.query_dashboard_relations(1))
+
+    def test_achievements_use_both_user_indexes(self):
+        self.assertUsesUserIndexes(query_achievements(1))
+
+    def test_overdue_relations_use_an_index(self):
+        self.assertUsesIndex(
+            "ix_mentorship_relations_state_end_date",
+            query_overdue_mentorship_relations(
+                1000.0, 0, COMPLETE_RELATIONS_CHUNK_SIZE
+            ),
+        )
+
+    def test_task_comments_use_an_index(self):
+        self.assertUsesIndex(
+            "ix_tasks_comments_task_id_relation_id",
+            TaskCommentModel.query_by_task_id(1, 1),
+        )
+        self.assertUsesIndex(
+            "ix_tasks_comments_user_id", TaskCommentModel.query_by_user_id(1)
+        )
+
+    def test_unverified_users_purge_uses_an_index(self):
+        index_name = "ix_users_is_email_verified_registration_date"
+        self.assertUsesIndex(index_name, query_unverified_users(1000.0))
+        self.assertUsesIndex(
+            index_name,
+            query_unverified_users_batch(1000.0, 0, DELETE_USERS_BATCH_SIZE),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
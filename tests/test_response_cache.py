@@ -0,0 +1,139 @@
+import unittest
+from http import HTTPStatus
+from unittest.mock import patch
+
+from flask import json
+
+from app.api.response_cache import (
+    LocalResponseCacheBackend,
+    get_response_cache_stats,
+)
+from app.schedulers.complete_mentorship_cron_job import (
+    complete_overdue_mentorship_relations,
+)
+from tests.tasks.tasks_base_setup import TasksBaseTestCase
+from tests.test_utils import count_queries, get_test_request_header
+
+
+class TestLocalResponseCacheBackend(unittest.TestCase):
+    def test_least_recently_used_response_is_evicted(self):
+        backend = LocalResponseCacheBackend(max_entries=2, ttl=60)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+
+        self.assertEqual(1, backend.get("a"))
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(3, backend.get("c"))
+
+    def test_response_expires_after_ttl(self):
+        backend = LocalResponseCacheBackend(max_entries=2, ttl=60)
+        with patch("app.api.response_cache.time.monotonic", return_value=1000):
+            backend.set("a", 1)
+        with patch("app.api.response_cache.time.monotonic", return_value=1059):
+            self.assertEqual(1, backend.get("a"))
+        with patch("app.api.response_cache.time.monotonic", return_value=1061):
+            self.assertIsNone(backend.get("a"))
+
+
+class TestResponseCache(TasksBaseTestCase):
+    def get_json(self, url, user_id):
+        response = self.client.get(url, headers=get_test_request_header(user_id))
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        return json.loads(response.data)
+
+    def get_hits(self, resource):
+        return get_response_cache_stats()["resources"].get(resource, {}).get("hits", 0)
+
+    def test_second_get_is_served_without_building_the_response(self):
+        user_id = self.first_user.id
+        first_response = self.get_json("/home", user_id)
+        hits = self.get_hits("home")
+
+        with count_queries() as statements:
+            second_response = self.get_json("/home", user_id)
+
+        # only the version of the user is read, for the ETag
+        self.assertEqual(1, len(statements))
+        self.assertIn("users_statistics.version", statements[0])
+        self.assertEqual(first_response, second_response)
+        self.assertEqual(hits + 1, self.get_hits("home"))
+
+    def test_responses_are_kept_per_user(self):
+        first_user_home = self.get_json("/home", self.first_user.id)
+        second_user_home = self.get_json("/home", self.second_user.id)
+
+        self.assertEqual(first_user_home["name"], self.first_user.name)
+        self.assertEqual(second_user_home["name"], self.second_user.name)
+
+    def test_task_creation_invalidates_other_user_tasks(self):
+        relation_id = self.mentorship_relation_w_second_user.id
+        url = f"/mentorship_relation/{relation_id}/tasks"
+        tasks_count = len(self.get_json(url, self.second_user.id))
+
+        response = self.client.post(
+            f"/mentorship_relation/{relation_id}/task",
+            headers=get_test_request_header(self.first_user.id),
+            content_type="application/json",
+            data=json.dumps(dict(description="new task")),
+        )
+        self.assertEqual(HTTPStatus.CREATED, response.status_code)
+
+        self.assertEqual(tasks_count + 1, len(self.get_json(url, self.second_user.id)))
+
+    def test_state_change_invalidates_both_users_home(self):
+        accepted_count = self.get_json("/home", self.second_user.id)[
+            "accepted_requests"
+        ]
+
+        response = self.client.put(
+            f"/mentorship_relation/{self.mentorship_relation_w_second_user.id}/cancel",
+            headers=get_test_request_header(self.first_user.id),
+        )
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+        home = self.get_json("/home", self.second_user.id)
+        self.assertEqual(accepted_count - 1, home["accepted_requests"])
+
+    def test_profile_update_invalidates_other_user_dashboard(self):
+        self.get_json("/dashboard", self.second_user.id)
+
+        response = self.client.put(
+            "/user",
+            headers=get_test_request_header(self.first_user.id),
+            content_type="application/json",
+            data=json.dumps(dict(name="new name")),
+        )
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+        dashboard = self.get_json("/dashboard", self.second_user.id)
+        relation = dashboard["as_mentee"]["received"]["accepted"][0]
+        self.assertEqual("new name", relation["mentor"]["user_name"])
+
+    def test_write_of_other_process_invalidates_home(self):
+        home = self.get_json("/home", self.second_user.id)
+
+        # the job runs in the scheduler process, it only bumps the stored version
+        complete_overdue_mentorship_relations(
+            current_date_timestamp=self.mentorship_relation_w_second_user.end_date + 1
+        )
+
+        new_home = self.get_json("/home", self.second_user.id)
+        self.assertEqual(home["accepted_requests"] - 1, new_home["accepted_requests"])
+        self.assertEqual(
+            home["completed_relations"] + 1, new_home["completed_relations"]
+        )
+
+    def test_responses_are_not_cached_when_off(self):
+        self.app.config["RESPONSE_CACHE_BACKEND"] = "off"
+        self.get_json("/home", self.first_user.id)
+        hits = self.get_hits("home")
+
+        self.get_json("/home", self.first_user.id)
+
+        self.assertEqual(hits, self.get_hits("home"))
+
+
+if __name__ == "__main__":
+    unittest.main()
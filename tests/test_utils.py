@@ -1,4 +1,9 @@
+from contextlib import contextmanager
+
 from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy import event
+
+from app.database.sqlalchemy_extension import db
 
 
 def get_test_request_header(user_identity, token_expiration_delta=None, refresh=False):
@@ -20,3 +25,22 @@ def get_test_request_header(user_identity, token_expiration_delta=None, refresh=
         )
     header = {"Authorization": "Bearer {}".format(token)}
     return header
+
+
+@contextmanager
+def count_queries():
+    """
+    This context manager collects the SQL statements executed
+    inside its block
+    :return: list which is filled with the executed statements
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,73 @@
+import json
+import unittest
+from http import HTTPStatus
+
+from app import messages
+from app.database.models.task_comment import TaskCommentModel
+from app.database.sqlalchemy_extension import db
+from app.utils.enum_utils import MentorshipRelationState
+from tests.tasks.tasks_base_setup import TasksBaseTestCase
+from tests.test_utils import get_test_request_header
+
+
+class TestExportUserDataApi(TasksBaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.comment = TaskCommentModel(
+            user_id=self.second_user.id,
+            task_id=1,
+            relation_id=self.mentorship_relation_w_second_user.id,
+            comment="comment of the second user",
+        )
+        self.other_comment = TaskCommentModel(
+            user_id=self.fourth_user.id,
+            task_id=1,
+            relation_id=self.mentorship_relation_bw_fourth_fifth_user.id,
+            comment="comment of another relation",
+        )
+        db.session.add(self.comment)
+        db.session.add(self.other_comment)
+        db.session.commit()
+
+    def export(self, user_id):
+        return self.client.get("/user/export", headers=get_test_request_header(user_id))
+
+    def test_export_streams_records_of_the_user(self):
+        response = self.export(self.first_user.id)
+
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        self.assertEqual("application/x-ndjson", response.mimetype)
+        self.assertTrue(response.is_streamed)
+        records = [json.loads(line) for line in response.data.decode().splitlines()]
+
+        self.assertEqual(
+            ["user", "relation", "relation", "task", "task", "task", "comment"],
+            [record["type"] for record in records],
+        )
+        self.assertEqual(self.first_user.username, records[0]["data"]["username"])
+        self.assertNotIn("password_hash", records[0]["data"])
+        self.assertEqual(
+            [
+                self.mentorship_relation_w_second_user.id,
+                self.mentorship_relation_w_admin_user.id,
+            ],
+            [record["data"]["id"] for record in records[1:3]],
+        )
+        self.assertEqual(
+            MentorshipRelationState.ACCEPTED.value, records[1]["data"]["state"]
+        )
+        self.assertEqual(
+            self.mentorship_relation_w_second_user.id, records[3]["relation_id"]
+        )
+        self.assertEqual(self.comment.id, records[-1]["data"]["id"])
+
+    def test_export_of_unknown_user(self):
+        response = self.export(1234)
+
+        self.assertEqual(HTTPStatus.NOT_FOUND, response.status_code)
+        self.assertEqual(messages.USER_DOES_NOT_EXIST, json.loads(response.data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,7 +12,7 @@ from app.database.models.user import UserModel
 from app.database.sqlalchemy_extension import db
 from app.utils.enum_utils import MentorshipRelationState
 from tests.base_test_case import BaseTestCase
-from tests.test_utils import get_test_request_header
+from tests.test_utils import count_queries, get_test_request_header
 from tests.test_data import user1, user2, user3
 
 
@@ -240,6 +240,18 @@ class TestListUsersApi(BaseTestCase):
         self.assertEqual(HTTPStatus.OK, actual_response.status_code)
         self.assertEqual(expected_response, json.loads(actual_response.data))
 
+    def test_list_users_api_with_cursor_and_per_page_below_one(self):
+        auth_header = get_test_request_header(self.admin_user.id)
+        for url in ("/users?per_page=-1&cursor=", "/users?per_page=0&cursor="):
+            actual_response = self.client.get(
+                url, follow_redirects=True, headers=auth_header
+            )
+
+            self.assertEqual(HTTPStatus.BAD_REQUEST, actual_response.status_code)
+            self.assertDictEqual(
+                messages.INVALID_USERS_PER_PAGE, json.loads(actual_response.data)
+            )
+
     def test_list_users_api_relation(self):
         # Creates relationship between two users, which means that they are
         # not available
@@ -272,6 +284,82 @@ class TestListUsersApi(BaseTestCase):
         self.assertEqual(HTTPStatus.OK, actual_response.status_code)
         self.assertEqual(expected_response, json.loads(actual_response.data))
 
+    def test_list_users_api_with_cursor_pagination(self):
+        auth_header = get_test_request_header(self.admin_user.id)
+        expected_pages = [
+            [marshal(self.verified_user, public_user_api_model)],
+            [marshal(self.other_user, public_user_api_model)],
+            [marshal(self.second_user, public_user_api_model)],
+        ]
+
+        actual_pages = []
+        cursor = ""
+        while cursor is not None:
+            actual_response = self.client.get(
+                f"/users?per_page=1&cursor={cursor}",
+                follow_redirects=True,
+                headers=auth_header,
+            )
+            self.assertEqual(HTTPStatus.OK, actual_response.status_code)
+            page = json.loads(actual_response.data)
+            if page:
+                actual_pages += [page]
+            cursor = actual_response.headers.get("X-Next-Cursor")
+
+        self.assertEqual(expected_pages, actual_pages)
+
+    def test_list_users_api_with_cursor_pagination_last_page(self):
+        auth_header = get_test_request_header(self.admin_user.id)
+        expected_response = [
+            marshal(self.verified_user, public_user_api_model),
+            marshal(self.other_user, public_user_api_model),
+            marshal(self.second_user, public_user_api_model),
+        ]
+        actual_response = self.client.get(
+            "/users/verified?cursor=", follow_redirects=True, headers=auth_header
+        )
+
+        self.assertEqual(HTTPStatus.OK, actual_response.status_code)
+        self.assertEqual(
+            [marshal(self.verified_user, public_user_api_model)],
+            json.loads(actual_response.data),
+        )
+        self.assertNotIn("X-Next-Cursor", actual_response.headers)
+
+        actual_response = self.client.get(
+            "/users?cursor=", follow_redirects=True, headers=auth_header
+        )
+
+        self.assertEqual(HTTPStatus.OK, actual_response.status_code)
+        self.assertEqual(expected_response, json.loads(actual_response.data))
+        self.assertNotIn("X-Next-Cursor", actual_response.headers)
+
+    def test_list_users_api_with_invalid_cursor(self):
+        auth_header = get_test_request_header(self.admin_user.id)
+        actual_response = self.client.get(
+            "/users?cursor=not-a-cursor", follow_redirects=True, headers=auth_header
+        )
+
+        self.assertEqual(HTTPStatus.BAD_REQUEST, actual_response.status_code)
+        self.assertDictEqual(messages.INVALID_CURSOR, json.loads(actual_response.data))
+
+    def test_list_users_api_query_count_does_not_depend_on_page_size(self):
+        self.create_relationship()
+        auth_header = get_test_request_header(self.admin_user.id)
+
+        def count_list_users_queries(url):
+            with count_queries() as statements:
+                response = self.client.get(
+                    url, follow_redirects=True, headers=auth_header
+                )
+            self.assertEqual(HTTPStatus.OK, response.status_code)
+            return len(statements)
+
+        self.assertEqual(
+            count_list_users_queries("/users?per_page=1"),
+            count_list_users_queries("/users?per_page=3"),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
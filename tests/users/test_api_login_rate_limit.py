@@ -0,0 +1,115 @@
+import unittest
+from http import HTTPStatus
+from unittest.mock import patch
+
+from flask import json
+
+from app import messages
+from app.api.rate_limit import LocalRateLimitBackend, get_retry_after
+from app.database.models.user import UserModel
+from app.database.sqlalchemy_extension import db
+from tests.base_test_case import BaseTestCase
+from tests.test_data import user2
+from tests.test_utils import count_queries
+
+# a time at the start of a window of 300 seconds
+START_TIME = 3000000
+
+
+class TestSlidingWindow(unittest.TestCase):
+    def test_counts_slide_to_previous_window(self):
+        backend = LocalRateLimitBackend(max_keys=10)
+        backend.hit("key", 10)
+        backend.hit("key", 10)
+
+        self.assertEqual((0, 2), backend.get_counts("key", 10))
+        self.assertEqual((2, 0), backend.get_counts("key", 11))
+        self.assertEqual((0, 0), backend.get_counts("key", 12))
+
+    def test_retry_after(self):
+        self.assertEqual(0, get_retry_after(4, 1, 0.5, limit=5))
+        # the previous window weighs 2 until the middle of the current one
+        self.assertAlmostEqual(0.25, get_retry_after(4, 3, 0.25, limit=5))
+        # the 10 attempts of the current window weigh 5 in the middle of the next one
+        self.assertAlmostEqual(1.25, get_retry_after(0, 10, 0.25, limit=5))
+
+
+class TestLoginRateLimit(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.app.config["LOGIN_RATE_LIMIT_WINDOW"] = 300
+        self.app.config["LOGIN_RATE_LIMIT_PER_USERNAME"] = 3
+        self.app.config["LOGIN_RATE_LIMIT_PER_IP"] = 5
+
+        self.user = UserModel(
+            name=user2["name"],
+            email=user2["email"],
+            username=user2["username"],
+            password=user2["password"],
+            terms_and_conditions_checked=user2["terms_and_conditions_checked"],
+        )
+        self.user.is_email_verified = True
+        db.session.add(self.user)
+        db.session.commit()
+
+    def login(self, username, password="wrong password", ip="127.0.0.1"):
+        return self.client.post(
+            "/login",
+            data=json.dumps(dict(username=username, password=password)),
+            content_type="application/json",
+            environ_base={"REMOTE_ADDR": ip},
+        )
+
+    @patch("app.api.rate_limit.time.time", return_value=START_TIME)
+    def test_failed_logins_of_username_are_limited(self, _):
+        for _ in range(3):
+            response = self.login(user2["username"])
+            self.assertEqual(HTTPStatus.UNAUTHORIZED, response.status_code)
+
+        with count_queries() as statements:
+            response = self.login(user2["username"], user2["password"], ip="10.0.0.1")
+
+        self.assertEqual(HTTPStatus.TOO_MANY_REQUESTS, response.status_code)
+        self.assertEqual(messages.TOO_MANY_FAILED_LOGINS, json.loads(response.data))
+        self.assertEqual("300", response.headers["Retry-After"])
+        self.assertEqual([], statements)
+
+    @patch("app.api.rate_limit.time.time", return_value=START_TIME)
+    def test_failed_logins_of_ip_are_limited(self, _):
+        for index in range(5):
+            self.login(f"user{index}")
+
+        response = self.login(user2["username"], user2["password"])
+        self.assertEqual(HTTPStatus.TOO_MANY_REQUESTS, response.status_code)
+
+        response = self.login(user2["username"], user2["password"], ip="10.0.0.1")
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+    def test_login_is_allowed_once_window_has_slid(self):
+        with patch("app.api.rate_limit.time.time", return_value=START_TIME):
+            for _ in range(3):
+                self.login(user2["username"])
+
+        with patch("app.api.rate_limit.time.time", return_value=START_TIME + 299):
+            response = self.login(user2["username"], user2["password"])
+            self.assertEqual(HTTPStatus.TOO_MANY_REQUESTS, response.status_code)
+            self.assertEqual("1", response.headers["Retry-After"])
+
+        with patch("app.api.rate_limit.time.time", return_value=START_TIME + 301):
+            response = self.login(user2["username"], user2["password"])
+            self.assertEqual(HTTPStatus.OK, response.status_code)
+
+    def test_successful_logins_are_not_limited(self):
+        for _ in range(4):
+            response = self.login(user2["username"], user2["password"])
+            self.assertEqual(HTTPStatus.OK, response.status_code)
+
+    def test_logins_are_not_limited_when_off(self):
+        self.app.config["LOGIN_RATE_LIMIT_BACKEND"] = "off"
+        for _ in range(4):
+            response = self.login(user2["username"])
+            self.assertEqual(HTTPStatus.UNAUTHORIZED, response.status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
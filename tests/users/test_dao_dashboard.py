@@ -11,6 +11,7 @@ from app.database.sqlalchemy_extension import db
 from app.utils.enum_utils import MentorshipRelationState
 from tests.base_test_case import BaseTestCase
 from tests.test_data import user1, user2
+from tests.test_utils import count_queries
 
 
 class TestUserDao(BaseTestCase):
@@ -175,6 +176,40 @@ class TestUserDao(BaseTestCase):
         actual_response = UserDAO.get_user_dashboard(self.first_user.id)
         self.assertEqual(actual_response, expected_response)
 
+    def test_dao_get_user_dashboard_query_count_does_not_depend_on_relations(self):
+        first_user_id = self.first_user.id
+        db.session.expire_all()
+        # each dashboard is built in its own request, as the API does
+        with self.app.test_request_context():
+            with count_queries() as statements:
+                UserDAO.get_user_dashboard(first_user_id)
+        expected_query_count = len(statements)
+
+        for state in MentorshipRelationState:
+            if state == MentorshipRelationState.ACCEPTED:
+                continue
+            relation = MentorshipRelationModel(
+                action_user_id=self.second_user.id,
+                mentor_user=self.first_user,
+                mentee_user=self.second_user,
+                creation_date=self.now_datetime.timestamp(),
+                end_date=self.end_date_example.timestamp(),
+                state=state,
+                notes=self.notes_example,
+                tasks_list=TasksListModel(),
+            )
+            db.session.add(relation)
+        db.session.commit()
+        db.session.expire_all()
+
+        with self.app.test_request_context():
+            with count_queries() as statements:
+                dashboard = UserDAO.get_user_dashboard(first_user_id)
+
+        self.assertEqual(expected_query_count, len(statements))
+        self.assertEqual(1, len(dashboard["as_mentor"]["received"]["pending"]))
+        self.assertEqual(1, len(dashboard["as_mentor"]["received"]["rejected"]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from app.database.models.user import UserModel
+from app.database.models.user_search_gram import UserSearchGramModel
+from app.database.sqlalchemy_extension import db
+from app.database.user_search import (
+    LikeUserSearchBackend,
+    TrigramUserSearchBackend,
+    get_grams,
+    get_user_search_backend,
+)
+from tests.base_test_case import BaseTestCase
+from tests.test_data import user1, user2, user3
+
+
+class TestUserSearch(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.users = []
+        for user_data in (user1, user2, user3):
+            user = UserModel(
+                name=user_data["name"],
+                email=user_data["email"],
+                username=user_data["username"],
+                password=user_data["password"],
+                terms_and_conditions_checked=user_data["terms_and_conditions_checked"],
+            )
+            user.save_to_db()
+            self.users += [user]
+
+    def search(self, backend, search_query):
+        query = backend.filter(UserModel.query, search_query)
+        return [user.id for user in query.order_by(UserModel.id).all()]
+
+    def get_indexed_grams(self, user_id):
+        return {
+            entry.gram
+            for entry in UserSearchGramModel.query.filter_by(user_id=user_id).all()
+        }
+
+    def test_get_grams(self):
+        self.assertEqual({"use", "ser", "erb"}, get_grams("UserB"))
+        self.assertEqual(set(), get_grams("ab"))
+        self.assertEqual(set(), get_grams(None))
+
+    def test_testing_config_uses_trigram_backend(self):
+        self.assertIsInstance(get_user_search_backend(), TrigramUserSearchBackend)
+
+    def test_index_is_updated_on_save_and_delete(self):
+        user = self.users[1]
+        self.assertIn("erb", self.get_indexed_grams(user.id))
+
+        user.name = "Renamed"
+        user.save_to_db()
+        grams = self.get_indexed_grams(user.id)
+        self.assertNotIn("erb", grams)
+        self.assertIn("ren", grams)
+
+        user_id = user.id
+        user.delete_from_db()
+        self.assertEqual(set(), self.get_indexed_grams(user_id))
+
+    def test_trigram_backend_matches_like_backend(self):
+        like_backend = LikeUserSearchBackend()
+        trigram_backend = TrigramUserSearchBackend()
+
+        for search_query in ["", "u", "us", "user", "USERB", "s_t-r$a/n'ge", "zzz"]:
+            self.assertEqual(
+                self.search(like_backend, search_query),
+                self.search(trigram_backend, search_query),
+            )
+
+    def test_rebuild_index(self):
+        db.session.query(UserSearchGramModel).delete()
+        db.session.commit()
+        self.assertEqual([], self.search(TrigramUserSearchBackend(), "userb"))
+
+        TrigramUserSearchBackend().rebuild_index()
+
+        self.assertEqual(
+            [self.users[1].id], self.search(TrigramUserSearchBackend(), "userb")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
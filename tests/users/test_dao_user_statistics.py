@@ -0,0 +1,122 @@
+import unittest
+from datetime import datetime, timedelta
+
+from app.api.dao.mentorship_relation import MentorshipRelationDAO
+from app.api.dao.user import UserDAO
+from app.database.models.mentorship_relation import MentorshipRelationModel
+from app.database.models.tasks_list import TasksListModel
+from app.database.models.user import UserModel
+from app.database.models.user_statistics import UserStatisticsModel
+from app.database.sqlalchemy_extension import db
+from app.database.user_statistics import refresh_user_statistics
+from app.utils.enum_utils import MentorshipRelationState
+from tests.base_test_case import BaseTestCase
+from tests.test_data import user1, user2
+from tests.test_utils import count_queries
+
+
+class TestUserStatisticsDao(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mentor = UserModel(
+            name=user1["name"],
+            email=user1["email"],
+            username=user1["username"],
+            password=user1["password"],
+            terms_and_conditions_checked=user1["terms_and_conditions_checked"],
+        )
+        self.mentee = UserModel(
+            name=user2["name"],
+            email=user2["email"],
+            username=user2["username"],
+            password=user2["password"],
+            terms_and_conditions_checked=user2["terms_and_conditions_checked"],
+        )
+        self.mentor.is_email_verified = True
+        self.mentee.is_email_verified = True
+        db.session.add(self.mentor)
+        db.session.add(self.mentee)
+        db.session.commit()
+
+        now_datetime = datetime.utcnow()
+        self.relation = MentorshipRelationModel(
+            action_user_id=self.mentor.id,
+            mentor_user=self.mentor,
+            mentee_user=self.mentee,
+            creation_date=now_datetime.timestamp(),
+            end_date=(now_datetime + timedelta(weeks=5)).timestamp(),
+            state=MentorshipRelationState.PENDING,
+            notes="notes",
+            tasks_list=TasksListModel(),
+        )
+        db.session.add(self.relation)
+        db.session.commit()
+
+    def get_counters(self, user_id):
+        statistics = UserDAO.get_user_statistics(user_id)
+        del statistics["name"]
+        del statistics["achievements"]
+        return statistics
+
+    def test_statistics_follow_state_transitions(self):
+        expected_counters = {
+            "pending_requests": 1,
+            "accepted_requests": 0,
+            "rejected_requests": 0,
+            "completed_relations": 0,
+            "cancelled_relations": 0,
+        }
+        self.assertEqual(expected_counters, self.get_counters(self.mentor.id))
+        self.assertEqual(expected_counters, self.get_counters(self.mentee.id))
+
+        MentorshipRelationDAO.accept_request(self.mentee.id, self.relation.id)
+        expected_counters["pending_requests"] = 0
+        expected_counters["accepted_requests"] = 1
+        self.assertEqual(expected_counters, self.get_counters(self.mentor.id))
+
+        MentorshipRelationDAO.cancel_relation(self.mentee.id, self.relation.id)
+        expected_counters["accepted_requests"] = 0
+        expected_counters["cancelled_relations"] = 1
+        self.assertEqual(expected_counters, self.get_counters(self.mentee.id))
+
+    def test_statistics_follow_deleted_request(self):
+        MentorshipRelationDAO.delete_request(self.mentor.id, self.relation.id)
+
+        self.assertEqual(0, self.get_counters(self.mentee.id)["pending_requests"])
+
+    def test_missing_statistics_are_rebuilt(self):
+        UserStatisticsModel.query.delete()
+        db.session.commit()
+
+        self.assertEqual(1, self.get_counters(self.mentor.id)["pending_requests"])
+        self.assertIsNotNone(UserStatisticsModel.query.get(self.mentor.id))
+
+    def test_statistics_created_concurrently_are_read(self):
+        # read as missing by this request, then created by a concurrent one
+        statistics = refresh_user_statistics(self.mentor.id, None)
+
+        self.assertEqual(1, statistics.pending_requests)
+        self.assertIs(statistics, UserStatisticsModel.query.get(self.mentor.id))
+
+    def test_statistics_created_concurrently_keep_pending_changes(self):
+        self.mentor.bio = "pending change of the caller"
+
+        refresh_user_statistics(self.mentor.id, None)
+        db.session.commit()
+        db.session.expire_all()
+
+        self.assertEqual("pending change of the caller", self.mentor.bio)
+
+    def test_statistics_are_read_with_a_single_query(self):
+        mentor_id = self.mentor.id
+        UserDAO.get_user_statistics(mentor_id)
+
+        with count_queries() as statements:
+            UserDAO.get_user_statistics(mentor_id)
+
+        self.assertEqual(1, len(statements))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch
+
+from flask import json
+
+from app.database.models.user_statistics import UserStatisticsModel
+from app.database.sqlalchemy_extension import db
+from app.utils.json_codec_utils import (
+    CODECS,
+    OrjsonJsonCodec,
+    StdlibJsonCodec,
+    UjsonJsonCodec,
+    find_json_codec,
+    get_json_codec,
+)
+from tests.base_test_case import BaseTestCase
+from tests.test_utils import get_test_request_header
+
+
+class TestJsonCodec(BaseTestCase):
+    def test_available_codecs_round_trip(self):
+        value = {"tasks": [{"id": 1, "description": "é", "completed_at": None}]}
+        for codec in CODECS.values():
+            if codec.is_available:
+                self.assertEqual(value, codec.loads(codec.dumps(value)))
+
+    def test_auto_picks_fastest_available_codec(self):
+        with patch.object(OrjsonJsonCodec, "is_available", False):
+            with patch.object(UjsonJsonCodec, "is_available", True):
+                self.assertIs(UjsonJsonCodec, find_json_codec("auto"))
+            with patch.object(UjsonJsonCodec, "is_available", False):
+                self.assertIs(StdlibJsonCodec, find_json_codec("auto"))
+
+    def test_codec_not_installed(self):
+        with patch.object(OrjsonJsonCodec, "is_available", False):
+            self.assertRaises(ValueError, find_json_codec, "orjson")
+
+    def test_configured_codec_is_used(self):
+        self.app.config["JSON_CODEC"] = "json"
+        self.assertIs(StdlibJsonCodec, get_json_codec())
+
+    def test_unknown_codec(self):
+        self.assertRaises(ValueError, find_json_codec, "yaml")
+
+    def test_json_column_is_decoded(self):
+        statistics = UserStatisticsModel.query.get(self.admin_user.id)
+        statistics.achievements = [{"id": 1, "description": "first task"}]
+        db.session.commit()
+        db.session.expire_all()
+
+        statistics = UserStatisticsModel.query.get(self.admin_user.id)
+        self.assertEqual(
+            [{"id": 1, "description": "first task"}], statistics.achievements
+        )
+
+    def test_api_response_is_encoded(self):
+        response = self.client.get(
+            "/home", headers=get_test_request_header(self.admin_user.id)
+        )
+
+        self.assertEqual("application/json", response.mimetype)
+        self.assertEqual(self.admin_user.name, json.loads(response.data)["name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
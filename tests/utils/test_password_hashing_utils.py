@@ -0,0 +1,172 @@
+import unittest
+from http import HTTPStatus
+
+from flask import json
+
+from app import messages
+from app.api.dao.user import UserDAO
+from app.database.models.user import UserModel
+from app.database.sqlalchemy_extension import db
+from app.utils.password_hashing_utils import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    PasswordHashingPolicy,
+    get_password_hasher,
+    get_password_hashing_policy,
+    shutdown_password_hashers,
+)
+from tests.base_test_case import BaseTestCase
+from tests.test_data import user1, user2
+
+
+class TestPasswordHashingPolicy(unittest.TestCase):
+    def test_hash_is_verified(self):
+        policy = PasswordHashingPolicy(iterations=1000)
+        password_hash = policy.hash("password")
+
+        self.assertTrue(password_hash.startswith("pbkdf2:sha256:1000$"))
+        self.assertTrue(policy.verify(password_hash, "password"))
+        self.assertFalse(policy.verify(password_hash, "other password"))
+
+    def test_hash_of_other_policy_needs_rehash(self):
+        policy = PasswordHashingPolicy(iterations=1000)
+        other_policy = PasswordHashingPolicy(iterations=2000)
+        password_hash = other_policy.hash("password")
+
+        self.assertTrue(policy.verify(password_hash, "password"))
+        self.assertTrue(policy.needs_rehash(password_hash))
+        self.assertFalse(other_policy.needs_rehash(password_hash))
+
+    def test_invalid_policy(self):
+        self.assertRaises(ValueError, PasswordHashingPolicy, "unknown", 1000)
+        self.assertRaises(ValueError, PasswordHashingPolicy, "sha3_512", 1000)
+        self.assertRaises(ValueError, PasswordHashingPolicy, "sha256", 0)
+
+    def test_hash_length_fits_password_hash_column(self):
+        policy = PasswordHashingPolicy("sha512", 1000)
+        password_hash = policy.hash("password")
+
+        self.assertEqual(policy.hash_length, len(password_hash))
+        self.assertLessEqual(len(password_hash), UserModel.password_hash.type.length)
+        # the number of iterations is part of the hash
+        too_many_iterations = int("9" * 120)
+        self.assertRaises(
+            ValueError, PasswordHashingPolicy, "sha512", too_many_iterations
+        )
+
+
+class TestPasswordRehash(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.app.config["PASSWORD_HASH_ITERATIONS"] = 1000
+        self.user = UserModel(
+            name=user1["name"],
+            email=user1["email"],
+            username=user1["username"],
+            password=user1["password"],
+            terms_and_conditions_checked=user1["terms_and_conditions_checked"],
+        )
+        db.session.add(self.user)
+        db.session.commit()
+
+    def test_configured_policy_is_used(self):
+        self.assertEqual(1000, get_password_hashing_policy().iterations)
+        self.assertTrue(self.user.password_hash.startswith("pbkdf2:sha256:1000$"))
+
+    def test_login_upgrades_hash_of_other_policy(self):
+        self.app.config["PASSWORD_HASH_ITERATIONS"] = 2000
+
+        user = UserDAO.authenticate(user1["username"], user1["password"])
+
+        self.assertEqual(self.user, user)
+        self.assertTrue(user.password_hash.startswith("pbkdf2:sha256:2000$"))
+        self.assertTrue(user.check_password(user1["password"]))
+
+    def test_failed_login_keeps_hash(self):
+        password_hash = self.user.password_hash
+        self.app.config["PASSWORD_HASH_ITERATIONS"] = 2000
+
+        self.assertIsNone(UserDAO.authenticate(user1["username"], "wrong password"))
+        self.assertEqual(password_hash, self.user.password_hash)
+
+
+class TestPasswordHasher(unittest.TestCase):
+    def setUp(self):
+        self.hasher = PasswordHasher(workers=1, queue_size=1)
+        self.policy = PasswordHashingPolicy(iterations=1000)
+
+    def tearDown(self):
+        self.hasher.shutdown()
+
+    def test_hash_is_made_by_worker(self):
+        password_hash = self.hasher.run(self.policy.hash, "password")
+
+        self.assertTrue(self.hasher.run(self.policy.verify, password_hash, "password"))
+
+    def test_workers_are_not_forked_from_server_process(self):
+        start_method = self.hasher.executor._mp_context.get_start_method()
+
+        self.assertIn(start_method, ("forkserver", "spawn"))
+
+    def test_full_hasher_is_busy(self):
+        self.hasher.slots.acquire()
+        try:
+            self.assertRaises(
+                PasswordHasherBusyError, self.hasher.run, self.policy.hash, "password"
+            )
+        finally:
+            self.hasher.slots.release()
+
+        self.assertTrue(self.hasher.run(self.policy.hash, "password"))
+
+
+class TestLoginWithPasswordHasher(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = UserModel(
+            name=user2["name"],
+            email=user2["email"],
+            username=user2["username"],
+            password=user2["password"],
+            terms_and_conditions_checked=user2["terms_and_conditions_checked"],
+        )
+        self.user.is_email_verified = True
+        db.session.add(self.user)
+        db.session.commit()
+
+        self.app.config["PASSWORD_HASH_WORKERS"] = 1
+        self.app.config["PASSWORD_HASH_QUEUE_SIZE"] = 1
+        self.hasher = get_password_hasher()
+
+    def tearDown(self):
+        shutdown_password_hashers()
+        super().tearDown()
+
+    def login(self):
+        return self.client.post(
+            "/login",
+            data=json.dumps(
+                dict(username=user2["username"], password=user2["password"])
+            ),
+            content_type="application/json",
+        )
+
+    def test_login_through_hasher(self):
+        response = self.login()
+
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+    def test_login_while_hasher_is_busy(self):
+        self.hasher.slots.acquire()
+        try:
+            response = self.login()
+        finally:
+            self.hasher.slots.release()
+
+        self.assertEqual(HTTPStatus.SERVICE_UNAVAILABLE, response.status_code)
+        self.assertEqual("1", response.headers["Retry-After"])
+        self.assertEqual(messages.PASSWORD_HASHER_IS_BUSY, json.loads(response.data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from http import HTTPStatus
+
+from tests.base_test_case import BaseTestCase
+from tests.test_utils import get_test_request_header
+
+
+class TestQueryStats(BaseTestCase):
+    def get_home(self):
+        response = self.client.get(
+            "/home", headers=get_test_request_header(self.admin_user.id)
+        )
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        return response
+
+    def test_response_has_query_stats_headers(self):
+        response = self.get_home()
+        self.assertGreater(int(response.headers["X-DB-Queries"]), 0)
+        self.assertGreaterEqual(float(response.headers["X-DB-Time"]), 0)
+
+        # the cached response only reads the version of the user
+        response = self.get_home()
+        self.assertEqual("1", response.headers["X-DB-Queries"])
+
+    def test_response_has_no_query_stats_headers_when_disabled(self):
+        self.app.config["DB_QUERY_HEADERS"] = False
+
+        response = self.get_home()
+
+        self.assertNotIn("X-DB-Queries", response.headers)
+        self.assertNotIn("X-DB-Time", response.headers)
+
+    def test_slow_query_is_logged_with_its_endpoint(self):
+        self.app.config["SLOW_QUERY_THRESHOLD"] = 0
+        headers = get_test_request_header(self.admin_user.id)
+
+        with self.assertLogs(self.app.logger, "WARNING") as logs:
+            self.client.get("/home", headers=headers)
+
+        self.assertTrue(logs.output)
+        for output in logs.output:
+            self.assertIn("Slow query", output)
+            self.assertIn("in Users_user_home_statistics: ", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from app.api.dao.task import TaskDAO
+from app.database.sqlalchemy_extension import db
+from app.utils.request_user_utils import find_request_user, user_lookup_counts
+from tests.base_test_case import BaseTestCase
+from tests.test_utils import count_queries
+
+
+class TestFindRequestUser(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        db.session.commit()
+        self.user_id = self.admin_user.id
+
+    def test_user_is_loaded_once_per_request(self):
+        hits = user_lookup_counts["hits"]
+        misses = user_lookup_counts["misses"]
+
+        with self.app.test_request_context():
+            with count_queries() as statements:
+                user = find_request_user(self.user_id)
+                self.assertIs(user, find_request_user(self.user_id))
+            self.assertEqual(1, len(statements))
+
+        self.assertEqual(hits + 1, user_lookup_counts["hits"])
+        self.assertEqual(misses + 1, user_lookup_counts["misses"])
+
+        with self.app.test_request_context():
+            with count_queries() as statements:
+                find_request_user(self.user_id)
+            self.assertEqual(1, len(statements))
+
+    def test_deleted_user_is_not_returned(self):
+        with self.app.test_request_context():
+            user = find_request_user(self.user_id)
+            user.delete_from_db()
+
+            self.assertIsNone(find_request_user(self.user_id))
+
+    def test_verified_dao_call_loads_the_user_once(self):
+        with self.app.test_request_context():
+            with count_queries() as statements:
+                TaskDAO.list_tasks(user_id=self.user_id, mentorship_relation_id=1)
+
+        user_queries = [s for s in statements if "FROM users" in s]
+        self.assertEqual(1, len(user_queries))
+
+
+if __name__ == "__main__":
+    unittest.main()